@@ -1,7 +1,12 @@
 from PIL import Image, ImageDraw
 import os
+import sys
 import math
 
+sys.path.append('scripts')
+
+from sprite_engine import ProceduralSpriteEngine
+
 def create_grass_sprite():
     img = Image.new('RGBA', (16, 8), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
@@ -22,71 +27,8 @@ def create_flower_sprite():
     draw.ellipse([4, 4, 8, 8], fill=(255, 255, 0))
     return img
 
-def create_beetle_sprite():
-    img = Image.new('RGBA', (32, 32), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    draw.ellipse([8, 12, 24, 20], fill=(139, 69, 19))
-    draw.ellipse([10, 8, 14, 12], fill=(101, 67, 33))
-    draw.ellipse([18, 8, 22, 12], fill=(101, 67, 33))
-    draw.ellipse([11, 9, 13, 11], fill=(0, 0, 0))
-    draw.ellipse([19, 9, 21, 11], fill=(0, 0, 0))
-    
-    for i in range(3):
-        y_offset = 14 + i * 2
-        draw.line([(8, y_offset), (6, y_offset + 2)], fill=(0, 0, 0), width=1)
-        draw.line([(24, y_offset), (26, y_offset + 2)], fill=(0, 0, 0), width=1)
-    
-    return img
-
-def create_butterfly_sprite():
-    img = Image.new('RGBA', (32, 32), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    draw.ellipse([10, 8, 18, 12], fill=(255, 105, 180))
-    draw.ellipse([14, 8, 22, 12], fill=(255, 105, 180))
-    
-    draw.ellipse([12, 16, 16, 20], fill=(255, 182, 193))
-    draw.ellipse([16, 16, 20, 20], fill=(255, 182, 193))
-    
-    draw.line([(16, 6), (16, 22)], fill=(0, 0, 0), width=2)
-    
-    draw.ellipse([14, 6, 18, 8], fill=(0, 0, 0))
-    
-    return img
-
-def create_ladybug_sprite():
-    img = Image.new('RGBA', (32, 32), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    draw.ellipse([10, 12, 22, 20], fill=(255, 0, 0))
-    
-    draw.ellipse([13, 14, 15, 16], fill=(0, 0, 0))
-    draw.ellipse([17, 14, 19, 16], fill=(0, 0, 0))
-    draw.ellipse([16, 17, 18, 19], fill=(0, 0, 0))
-    
-    draw.ellipse([12, 8, 20, 12], fill=(0, 0, 0))
-    
-    draw.ellipse([14, 9, 16, 11], fill=(255, 255, 255))
-    draw.ellipse([16, 9, 18, 11], fill=(255, 255, 255))
-    
-    return img
-
-def create_caterpillar_sprite():
-    img = Image.new('RGBA', (32, 32), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    segments = [(8, 16), (12, 16), (16, 16), (20, 16), (24, 16)]
-    
-    for i, (x, y) in enumerate(segments):
-        color = (34, 139, 34) if i == 0 else (50, 205, 50)
-        size = 4 if i == 0 else 3
-        draw.ellipse([x-size, y-size, x+size, y+size], fill=color)
-    
-    draw.ellipse([6, 14, 8, 16], fill=(0, 0, 0))
-    draw.ellipse([6, 16, 8, 18], fill=(0, 0, 0))
-    
-    return img
+def create_insect_sprite(insect_type):
+    return ProceduralSpriteEngine().render(insect_type, 'idle', (32, 32))
 
 def create_ui_elements():
     settings_icon = Image.new('RGBA', (16, 16), (0, 0, 0, 0))
@@ -111,10 +53,8 @@ os.makedirs('assets/ui', exist_ok=True)
 create_grass_sprite().save('assets/environment/grass.png')
 create_flower_sprite().save('assets/environment/flower.png')
 
-create_beetle_sprite().save('assets/insects/beetle.png')
-create_butterfly_sprite().save('assets/insects/butterfly.png')
-create_ladybug_sprite().save('assets/insects/ladybug.png')
-create_caterpillar_sprite().save('assets/insects/caterpillar.png')
+for insect_type in ['beetle', 'butterfly', 'ladybug', 'caterpillar']:
+    create_insect_sprite(insect_type).save(f'assets/insects/{insect_type}.png')
 
 create_ui_elements().save('assets/ui/settings.png')
 
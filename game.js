@@ -5,6 +5,8 @@ class BugBuddies {
         this.insects = [];
         this.food = [];
         this.environment = [];
+        this.environmentStrip = null;
+        this.environmentLayer = null;
         this.lastTime = 0;
         
         this.initializeAssetManager();
@@ -20,14 +22,29 @@ class BugBuddies {
             window.assetManager = new AssetManager();
             await window.assetManager.initialize();
             console.log('✅ AssetManager initialized');
+            await this.loadEnvironmentStrip();
+            window.assetManager.onUpdate(update => this.applyAssetUpdate(update));
+            window.assetManager.watchForUpdates();
         } else {
             console.log('⚠️ AssetManager not available, using programmatic drawing');
         }
     }
     
     setupCanvas() {
-        this.canvas.width = window.innerWidth;
-        this.canvas.height = 100;
+        this.width = window.innerWidth;
+        this.height = 100;
+        
+        // Back the canvas with device pixels so HiDPI sprites are drawn 1:1
+        this.pixelRatio = window.devicePixelRatio || 1;
+        this.canvas.width = Math.round(this.width * this.pixelRatio);
+        this.canvas.height = Math.round(this.height * this.pixelRatio);
+        this.canvas.style.width = `${this.width}px`;
+        this.canvas.style.height = `${this.height}px`;
+        this.ctx.setTransform(this.pixelRatio, 0, 0, this.pixelRatio, 0, 0);
+        this.ctx.imageSmoothingEnabled = false;
+        
+        // The static layer is sized to the canvas, so rebuild it on the next frame
+        this.environmentLayer = null;
     }
     
     setupEventListeners() {
@@ -54,10 +71,10 @@ class BugBuddies {
     createInitialInsects() {
         const insectTypes = ['beetle', 'butterfly', 'ladybug', 'caterpillar'];
         const positions = [
-            { x: this.canvas.width * 0.2, y: 70 },
-            { x: this.canvas.width * 0.4, y: 50 },
-            { x: this.canvas.width * 0.6, y: 80 },
-            { x: this.canvas.width * 0.8, y: 60 }
+            { x: this.width * 0.2, y: 70 },
+            { x: this.width * 0.4, y: 50 },
+            { x: this.width * 0.6, y: 80 },
+            { x: this.width * 0.8, y: 60 }
         ];
         
         insectTypes.forEach((type, index) => {
@@ -66,11 +83,51 @@ class BugBuddies {
         });
     }
 
+    async applyAssetUpdate(update) {
+        // Swap new sprites into the running pet instead of restarting it
+        const swaps = this.insects
+            .filter(insect => update.insectTypes.has(insect.type))
+            .map(insect => insect.swapAssets());
+        if (update.environment) {
+            swaps.push(this.loadEnvironmentStrip());
+        }
+        await Promise.allSettled(swaps);
+    }
+
+    async loadEnvironmentStrip() {
+        const layout = window.assetManager.getEnvironmentLayout();
+        if (!layout) {
+            this.environmentStrip = null;
+            this.environmentLayer = null;
+            return;
+        }
+        
+        try {
+            this.environmentStrip = await window.assetManager.getEnvironmentStrip();
+            this.environmentStripWidth = layout.strip_width;
+            // Keep the programmatic fallback in the same layout as the prerendered strip
+            this.environment = this.tilePlacements(layout.placements, layout.strip_width);
+            this.environmentLayer = null;
+        } catch (error) {
+            console.warn('⚠️ Failed to load environment strip, drawing it programmatically:', error);
+        }
+    }
+    
+    tilePlacements(placements, stripWidth) {
+        const tiled = [];
+        for (let offset = 0; offset < this.width; offset += stripWidth) {
+            placements.forEach(placement => {
+                tiled.push({ type: placement.type, x: placement.x + offset, y: placement.y });
+            });
+        }
+        return tiled;
+    }
+    
     createEnvironment() {
         for (let i = 0; i < 8; i++) {
             this.environment.push({
                 type: 'grass',
-                x: Math.random() * this.canvas.width,
+                x: Math.random() * this.width,
                 y: 85 + Math.random() * 10
             });
         }
@@ -78,7 +135,7 @@ class BugBuddies {
         for (let i = 0; i < 3; i++) {
             this.environment.push({
                 type: 'flower',
-                x: Math.random() * this.canvas.width,
+                x: Math.random() * this.width,
                 y: 75 + Math.random() * 15
             });
         }
@@ -133,7 +190,7 @@ class BugBuddies {
     }
     
     render() {
-        this.ctx.clearRect(0, 0, this.canvas.width, this.canvas.height);
+        this.ctx.clearRect(0, 0, this.width, this.height);
         
         this.renderEnvironment();
         
@@ -147,13 +204,36 @@ class BugBuddies {
     }
 
     renderEnvironment() {
+        if (!this.environmentLayer) {
+            this.environmentLayer = this.buildEnvironmentLayer();
+        }
+        this.ctx.drawImage(this.environmentLayer, 0, 0, this.width, this.height);
+    }
+    
+    buildEnvironmentLayer() {
+        // Grass and flowers never move, so draw them once and blit the result every frame
+        const layer = typeof OffscreenCanvas !== 'undefined'
+            ? new OffscreenCanvas(this.canvas.width, this.canvas.height)
+            : Object.assign(document.createElement('canvas'), { width: this.canvas.width, height: this.canvas.height });
+        const ctx = layer.getContext('2d');
+        ctx.setTransform(this.pixelRatio, 0, 0, this.pixelRatio, 0, 0);
+        ctx.imageSmoothingEnabled = false;
+        
+        if (this.environmentStrip && this.environmentStrip.width > 0) {
+            for (let x = 0; x < this.width; x += this.environmentStripWidth) {
+                ctx.drawImage(this.environmentStrip, x, 0, this.environmentStripWidth, this.height);
+            }
+            return layer;
+        }
+        
         this.environment.forEach(element => {
             if (element.type === 'grass') {
-                this.drawGrass(this.ctx, element.x, element.y);
+                this.drawGrass(ctx, element.x, element.y);
             } else if (element.type === 'flower') {
-                this.drawFlower(this.ctx, element.x, element.y);
+                this.drawFlower(ctx, element.x, element.y);
             }
         });
+        return layer;
     }
 
     drawGrass(ctx, x, y) {
@@ -241,8 +321,10 @@ class Insect {
         
         this.colors = this.getColors();
         this.currentAsset = null;
+        this.currentAssetKey = null;
         this.currentAnimation = null;
         this.useAssets = false;
+        this.assetReload = null;
         
         if (window.assetManager) {
             this.loadAssets();
@@ -252,20 +334,41 @@ class Insect {
     async loadAssets() {
         try {
             if (window.assetManager.isAssetAvailable(this.type)) {
-                this.currentAsset = await window.assetManager.getCharacterAsset(this.type, 'idle');
+                const assetKey = window.assetManager.characterAssetKey(this.type, 'idle', this.size);
+                this.currentAsset = await window.assetManager.getCharacterAsset(this.type, 'idle', this.size);
+                this.currentAssetKey = assetKey;
                 this.useAssets = true;
                 console.log(`✅ Loaded assets for ${this.type}`);
+            } else {
+                this.currentAsset = null;
+                this.useAssets = false;
             }
             
-            if (window.assetManager.isAnimationAvailable(this.type)) {
-                this.currentAnimation = await window.assetManager.getAnimation(this.type, 'walking');
-            }
+            this.currentAnimation = window.assetManager.isAnimationAvailable(this.type)
+                ? await window.assetManager.getAnimation(this.type, 'walking')
+                : null;
         } catch (error) {
             console.warn(`⚠️ Failed to load assets for ${this.type}:`, error);
             this.useAssets = false;
         }
     }
     
+    reloadAssets() {
+        if (!this.assetReload) {
+            this.assetReload = this.loadAssets().finally(() => {
+                this.assetReload = null;
+            });
+        }
+        return this.assetReload;
+    }
+    
+    async swapAssets() {
+        // A reload started before the update could still land old sprites, so let it finish first;
+        // the current sprites keep drawing until the new ones are decoded
+        await this.assetReload;
+        await this.loadAssets();
+    }
+    
     getColors() {
         switch(this.type) {
             case 'beetle':
@@ -373,6 +476,11 @@ class Insect {
         this.experience = 0;
         this.size = Math.min(48, 32 + this.level * 2);
         console.log(`${this.type} leveled up to ${this.level}!`);
+        
+        if (this.useAssets) {
+            // A larger sprite may now need the next HiDPI rendition
+            this.loadAssets();
+        }
     }
     
     feed() {
@@ -403,6 +511,16 @@ class Insect {
         const size = this.size;
         const halfSize = size / 2;
         
+        if (this.currentAsset.width === 0) {
+            // The asset cache closed this bitmap to stay in budget; draw by hand until it is decoded again
+            this.reloadAssets();
+            this.drawInsect(ctx);
+            return;
+        }
+        
+        // Keep the drawn sprite at the recent end of the cache's LRU order
+        window.assetManager.touchAsset(this.currentAssetKey);
+        
         try {
             ctx.drawImage(
                 this.currentAsset,
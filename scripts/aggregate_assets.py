@@ -1,8 +1,121 @@
 import os
+import re
+import sys
 import json
+import time
 import shutil
-from typing import Dict, List, Any
+import hashlib
+from typing import Dict, List, Any, Optional, Tuple, Union, BinaryIO
 from PIL import Image
+from png_optimizer import encode_png, optimize_png, parse_size
+from environment_layer import environment_layout
+from asset_bundle import AssetBundle, BundleMember, BUNDLE_SUFFIX
+
+INSECT_TYPES = ["beetle", "butterfly", "ladybug", "caterpillar", "ui_elements"]
+REPORT_FILES = ("generation_report.json", "asset_report.json")
+# Matches both downloaded artifacts (agent-3-assets) and local agent output (agent_3)
+AGENT_DIR_PATTERN = re.compile(r"^agent[-_](\d+)(?:-.*assets)?$")
+AGENT_BUNDLE_PATTERN = re.compile(rf"^agent[-_](\d+){re.escape(BUNDLE_SUFFIX)}$")
+# Agent output files are paths on disk or members of a packed bundle
+Source = Union[str, BundleMember]
+
+def source_name(source: Source) -> str:
+    """File name of an agent output file."""
+    return os.path.basename(source.name if isinstance(source, BundleMember) else source)
+
+def open_source(source: Source) -> BinaryIO:
+    """Open an agent output file for binary reading."""
+    return source.open() if isinstance(source, BundleMember) else open(source, 'rb')
+
+def source_size(source: Source) -> int:
+    """Size in bytes of an agent output file."""
+    return source.length if isinstance(source, BundleMember) else os.path.getsize(source)
+
+def copy_source(source: Source, dst_path: str):
+    """Copy an agent output file into the asset library."""
+    if isinstance(source, BundleMember):
+        source.copy_to(dst_path)
+    else:
+        shutil.copy2(source, dst_path)
+
+def insect_type_for_file(filename: str, default: str) -> str:
+    """Get the insect a sprite belongs to from its '<insect>_<variant>' filename."""
+    for insect_type in INSECT_TYPES:
+        if filename.startswith(f"{insect_type}_"):
+            return insect_type
+    return default
+
+def variant_name_for_file(filename: str, insect_type: str) -> str:
+    """Get the variant key of '<insect>_<variant>.<ext>' (e.g. 'walk_1' from 'beetle_walk_1.png')."""
+    stem = os.path.splitext(filename)[0]
+    prefix = f"{insect_type}_"
+    return stem[len(prefix):] if stem.startswith(prefix) else stem
+
+def split_scale_suffix(variant: str) -> Tuple[str, Optional[str]]:
+    """Split a HiDPI suffix off a variant name ('idle@2x' -> ('idle', '2x'), 'idle' -> ('idle', None))."""
+    base, _, scale = variant.partition("@")
+    return base, scale or None
+
+def add_sprite_entry(group: Dict[str, Any], variant: str, dst_path: str):
+    """Index a sprite under its variant, nesting scaled copies in the entry's 'scales'."""
+    variant, scale = split_scale_suffix(variant)
+    entry = group.setdefault(variant, {})
+    if scale:
+        entry.setdefault("scales", {})[scale] = describe_asset(dst_path)
+    else:
+        entry.update(describe_asset(dst_path))
+
+def describe_asset(path: str) -> Dict[str, Any]:
+    """Build the manifest index entry for an output file."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    with Image.open(path) as img:
+        width, height = img.size
+        frames = getattr(img, "n_frames", 1)
+        image_format = (img.format or os.path.splitext(path)[1][1:]).lower()
+    return {
+        "path": path.replace(os.sep, "/"),
+        "width": width,
+        "height": height,
+        "bytes": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "frames": frames,
+        "format": image_format
+    }
+
+def entry_digest(entry: Dict[str, Any]) -> str:
+    """Hash identifying an entry's content, covering its scaled renditions and the environment strip."""
+    hashes = [entry.get("sha256") or entry.get("strip", {}).get("sha256", "")]
+    hashes += [scaled["sha256"] for _, scaled in sorted(entry.get("scales", {}).items())]
+    return hashes[0] if len(hashes) == 1 else hashlib.sha256("|".join(hashes).encode()).hexdigest()
+
+def manifest_records(manifest: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Flatten a manifest into delta records keyed by '<group>/<name>...'."""
+    records = {}
+    for group in ("characters", "animations"):
+        for insect_type, variants in (manifest.get(group) or {}).items():
+            for variant, entry in variants.items():
+                records[f"{group}/{insect_type}/{variant}"] = {"group": group, "path": [insect_type, variant],
+                                                               "entry": entry}
+    for name, entry in (manifest.get("ui_elements") or {}).items():
+        records[f"ui_elements/{name}"] = {"group": "ui_elements", "path": [name], "entry": entry}
+    if manifest.get("environment"):
+        records["environment"] = {"group": "environment", "path": [], "entry": manifest["environment"]}
+    for record in records.values():
+        record["sha256"] = entry_digest(record["entry"])
+    return records
+
+def manifest_delta(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """List the entries added, changed and removed between two manifests."""
+    old, new = manifest_records(previous or {}), manifest_records(current)
+    return {
+        "added": [{"key": key, **new[key]} for key in sorted(new.keys() - old.keys())],
+        "changed": [{"key": key, "previous_sha256": old[key]["sha256"], **new[key]}
+                    for key in sorted(new.keys() & old.keys()) if new[key]["sha256"] != old[key]["sha256"]],
+        # Removed entries carry no file, so clients only need to know what to drop
+        "removed": [{"key": key, "group": old[key]["group"], "path": old[key]["path"], "sha256": old[key]["sha256"]}
+                    for key in sorted(old.keys() - new.keys())]
+    }
 
 class AssetAggregator:
     """Aggregate and organize assets from all parallel agents."""
@@ -10,7 +123,15 @@ class AssetAggregator:
     def __init__(self):
         self.temp_dir = "temp_assets"
         self.output_dir = "assets"
-        self.agent_count = 5
+        self.agent_count = self.load_agent_count()
+        self.require_animations = os.environ.get("ENABLE_ANIMATIONS", "true").lower() == "true"
+        size_budget = os.environ.get("ASSET_SIZE_BUDGET", "")
+        self.size_budget = parse_size(size_budget) if size_budget else None
+        self.environment_width = int(os.environ.get("ENVIRONMENT_STRIP_WIDTH", "960"))
+        self.environment_seed = int(os.environ.get("ENVIRONMENT_SEED", "0"))
+        # Prerender the environment at the largest sprite scale so it stays crisp on HiDPI screens
+        self.environment_scale = max(int(scale) for scale in os.environ.get("HIDPI_SCALES", "1,2,3").split(",")
+                                     if scale.strip())
         
         os.makedirs(self.output_dir, exist_ok=True)
         os.makedirs(f"{self.output_dir}/characters", exist_ok=True)
@@ -18,179 +139,405 @@ class AssetAggregator:
         os.makedirs(f"{self.output_dir}/ui", exist_ok=True)
         
         self.manifest = {
-            "version": "1.0.0",
+            "version": "2.0.0",
             "generated_at": "",
             "characters": {},
             "animations": {},
             "ui_elements": {},
-            "total_assets": 0
+            "environment": None,
+            "total_assets": 0,
+            "revision": 0
         }
+        # Revisions and deltas continue from the manifest the game last shipped; watch mode's
+        # intermediate writes never move this base, so a run publishes one revision step
+        self.base_manifest = self.load_previous_manifest(
+            os.environ.get("PREVIOUS_MANIFEST") or f"{self.output_dir}/manifest.json")
+        self.delta_summary = {}
+        # Reproducible builds pin generated_at (https://reproducible-builds.org/specs/source-date-epoch/)
+        self.source_date_epoch = os.environ.get("SOURCE_DATE_EPOCH")
+        # Open bundles by path, with the (mtime, size) they were indexed at; watch mode rescans every poll
+        self.bundle_indexes = {}
     
-    def collect_agent_assets(self) -> Dict[str, Any]:
-        """Collect assets from all agent directories."""
-        collected_assets = {
+    def load_previous_manifest(self, path: str) -> Optional[Dict[str, Any]]:
+        """Read the manifest this run's revision follows, if there is one."""
+        if not os.path.exists(path):
+            print("📋 No previous manifest; starting at revision 1")
+            return None
+        try:
+            with open(path, 'r') as f:
+                manifest = json.load(f)
+            print(f"📋 Previous manifest: revision {manifest.get('revision', 0)} from {path}")
+            return manifest
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable previous manifest {path}: {e}")
+            return None
+    
+    def load_agent_count(self) -> int:
+        """Read the planned agent count from the matrix generation config."""
+        config_path = f"{self.temp_dir}/config/generation_config.json"
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                return json.load(f).get("agent_count", 5)
+        return 5
+    
+    def new_collection(self) -> Dict[str, Any]:
+        """Create an empty collection of aggregated assets."""
+        return {
             "characters": {},
             "animations": {},
             "ui_elements": {},
-            "reports": []
+            "reports": [],
+            "compression": {},
+            "environment": None
         }
+    
+    def scan_agent_outputs(self) -> Dict[int, Dict[str, Any]]:
+        """Index every agent output with one header read per bundle or one scandir pass per directory."""
+        index = {}
+        if not os.path.isdir(self.temp_dir):
+            return index
+        
+        with os.scandir(self.temp_dir) as entries:
+            entries = sorted(entries, key=lambda entry: entry.name)
+        
+        for entry in entries:
+            match = AGENT_BUNDLE_PATTERN.match(entry.name)
+            if match and entry.is_file():
+                try:
+                    index[int(match.group(1))] = self.index_agent_bundle(entry.path)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️  Ignoring unreadable bundle {entry.path}: {e}")
+        
+        for entry in entries:
+            match = AGENT_DIR_PATTERN.match(entry.name)
+            # A bundle is the agent's packed final output, so it wins over a directory of the same agent
+            if not match or not entry.is_dir() or int(match.group(1)) in index:
+                continue
+            agent_id = int(match.group(1))
+            base_dir = entry.path
+            nested_dir = os.path.join(entry.path, f"agent_{agent_id}")
+            if os.path.isdir(nested_dir):
+                base_dir = nested_dir
+            index[agent_id] = self.index_agent_directory(base_dir)
+        
+        return index
+    
+    def index_agent_bundle(self, bundle_path: str) -> Dict[str, Any]:
+        """Classify one agent's bundle members from the bundle index, without touching the payloads.
+        
+        Each bundle is opened once and its index reused on later scans, until the file is replaced.
+        """
+        stat = os.stat(bundle_path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self.bundle_indexes.get(bundle_path)
+        if cached and cached[0] == version:
+            return cached[1]
+        if cached:
+            cached[1]["bundle"].close()
+        
+        bundle = AssetBundle(bundle_path)
+        agent_index = {"dir": bundle_path, "bundle": bundle, "sprites": bundle.of_kind("sprite"),
+                       "ui": bundle.of_kind("ui"), "animations": bundle.of_kind("animation"),
+                       "report": None, "animation_report": None}
+        for kind in ("report", "animation_report"):
+            members = bundle.of_kind(kind)
+            agent_index[kind] = members[0] if members else None
+        self.bundle_indexes[bundle_path] = (version, agent_index)
+        return agent_index
+    
+    def close_bundles(self):
+        """Release every bundle indexed by this run, including agents that never completed."""
+        for _, agent_index in self.bundle_indexes.values():
+            agent_index["bundle"].close()
+        self.bundle_indexes.clear()
+    
+    def index_agent_directory(self, agent_dir: str) -> Dict[str, Any]:
+        """Classify one agent's files into sprites, UI sprites, animations and reports."""
+        agent_index = {"dir": agent_dir, "sprites": [], "ui": [], "animations": [], "report": None, "animation_report": None}
+        
+        with os.scandir(agent_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.png'):
+                    agent_index["ui" if entry.name.startswith('ui_') else "sprites"].append(entry.path)
+                elif entry.name in REPORT_FILES:
+                    agent_index["report"] = entry.path
+                elif entry.name == "animations" and entry.is_dir():
+                    with os.scandir(entry.path) as animation_entries:
+                        for animation_entry in animation_entries:
+                            if animation_entry.name.endswith('.gif'):
+                                agent_index["animations"].append(animation_entry.path)
+                            elif animation_entry.name == "animation_report.json":
+                                agent_index["animation_report"] = animation_entry.path
+        
+        return agent_index
+    
+    def is_agent_complete(self, agent_index: Dict[str, Any]) -> bool:
+        """An agent is complete once its generation report (and animation report, if expected) exist."""
+        if agent_index["report"] is None:
+            return False
+        return agent_index["animation_report"] is not None or not self.require_animations
+    
+    def collect_agent_assets(self) -> Dict[str, Any]:
+        """Collect assets from all agent directories."""
+        collected_assets = self.new_collection()
         
         print("📦 Collecting assets from all agents...")
         
+        self.build_environment_layer(collected_assets)
+        agent_outputs = self.scan_agent_outputs()
         for agent_id in range(1, self.agent_count + 1):
-            agent_dir = f"{self.temp_dir}/agent-{agent_id}-assets"
-            if not os.path.exists(agent_dir):
-                print(f"⚠️  Agent {agent_id} assets not found: {agent_dir}")
-                continue
+            if agent_id not in agent_outputs:
+                print(f"⚠️  Agent {agent_id} assets not found in {self.temp_dir}")
+        
+        for agent_id in sorted(agent_outputs):
+            self.process_agent_index(agent_id, agent_outputs[agent_id], collected_assets)
+        self.close_bundles()
+        
+        return collected_assets
+    
+    def watch_agent_outputs(self, timeout: float, poll_interval: float) -> Dict[str, Any]:
+        """Aggregate each agent as soon as its output is complete, updating the manifest incrementally."""
+        collected_assets = self.new_collection()
+        processed = set()
+        deadline = time.time() + timeout
+        self.build_environment_layer(collected_assets)
+        
+        print(f"👀 Watching {self.temp_dir} for {self.agent_count} agents (timeout {timeout:.0f}s)...")
+        
+        while len(processed) < self.agent_count:
+            for agent_id, agent_index in sorted(self.scan_agent_outputs().items()):
+                if agent_id in processed or not self.is_agent_complete(agent_index):
+                    continue
+                self.process_agent_index(agent_id, agent_index, collected_assets)
+                self.generate_manifest(collected_assets)
+                processed.add(agent_id)
+                print(f"📥 Agent {agent_id} aggregated ({len(processed)}/{self.agent_count})")
             
-            self.process_agent_directory(agent_id, agent_dir, collected_assets)
+            if len(processed) >= self.agent_count:
+                break
+            if time.time() >= deadline:
+                print(f"⏰ Timed out waiting for agents: {sorted(set(range(1, self.agent_count + 1)) - processed)}")
+                break
+            time.sleep(poll_interval)
         
+        self.close_bundles()
         return collected_assets
     
-    def process_agent_directory(self, agent_id: int, agent_dir: str, collected_assets: Dict):
-        """Process assets from a single agent directory."""
+    def process_agent_index(self, agent_id: int, agent_index: Dict[str, Any], collected_assets: Dict):
+        """Process sprites, UI elements and animations of one indexed agent directory."""
         print(f"🤖 Processing Agent {agent_id} assets...")
         
-        agent_base_dir = f"{agent_dir}/agent_{agent_id}"
-        if not os.path.exists(agent_base_dir):
-            print(f"⚠️  Agent base directory not found: {agent_base_dir}")
-            return
+        bundle = agent_index.get("bundle")
+        if bundle:
+            corrupt = set(bundle.verify())
+            if corrupt:
+                print(f"⚠️  Skipping {len(corrupt)} corrupt files in {agent_index['dir']}: {sorted(corrupt)}")
+            for kind in ("sprites", "ui", "animations"):
+                agent_index[kind] = [member for member in agent_index[kind] if member.name not in corrupt]
         
-        report_path = f"{agent_base_dir}/asset_report.json"
-        if os.path.exists(report_path):
-            with open(report_path, 'r') as f:
+        insect_type = f"unknown_{agent_id}"
+        if agent_index["report"]:
+            with open_source(agent_index["report"]) as f:
                 report = json.load(f)
                 collected_assets["reports"].append(report)
-                insect_type = report.get("insect_type", f"unknown_{agent_id}")
-        else:
-            insect_type = f"unknown_{agent_id}"
-        
-        self.collect_character_assets(agent_base_dir, insect_type, collected_assets)
+                insect_type = report.get("insect_type", insect_type)
         
-        animations_dir = f"{agent_base_dir}/animations"
-        if os.path.exists(animations_dir):
-            self.collect_animation_assets(animations_dir, insect_type, collected_assets)
+        self.collect_character_assets(agent_index["sprites"], insect_type, collected_assets)
+        self.collect_ui_assets(agent_index["ui"], collected_assets)
+        self.collect_animation_assets(agent_index["animations"], insect_type, collected_assets)
+        if bundle:
+            bundle.close()
     
-    def collect_character_assets(self, agent_dir: str, insect_type: str, collected_assets: Dict):
+    def collect_character_assets(self, sprite_paths: List[Source], insect_type: str, collected_assets: Dict):
         """Collect character sprite assets."""
-        character_dir = f"{self.output_dir}/characters/{insect_type}"
-        os.makedirs(character_dir, exist_ok=True)
-        
-        collected_assets["characters"][insect_type] = []
-        
-        for file in os.listdir(agent_dir):
-            if file.endswith('.png') and not file.startswith('ui_'):
-                src_path = os.path.join(agent_dir, file)
-                dst_path = os.path.join(character_dir, file)
-                
-                try:
-                    self.optimize_and_copy_image(src_path, dst_path)
-                    collected_assets["characters"][insect_type].append(file)
-                    print(f"✅ Collected character asset: {file}")
-                except Exception as e:
-                    print(f"❌ Failed to process {file}: {e}")
+        for src_path in sprite_paths:
+            file = source_name(src_path)
+            # Scheduled agents can hold several insects, so group by filename
+            file_insect_type = insect_type_for_file(file, insect_type)
+            character_dir = f"{self.output_dir}/characters/{file_insect_type}"
+            os.makedirs(character_dir, exist_ok=True)
+            
+            dst_path = os.path.join(character_dir, file)
+            
+            try:
+                collected_assets["compression"][dst_path] = self.optimize_and_copy_image(src_path, dst_path)
+                variant = variant_name_for_file(file, file_insect_type)
+                add_sprite_entry(collected_assets["characters"].setdefault(file_insect_type, {}), variant, dst_path)
+                print(f"✅ Collected character asset: {file}")
+            except Exception as e:
+                print(f"❌ Failed to process {file}: {e}")
     
-    def collect_animation_assets(self, animations_dir: str, insect_type: str, collected_assets: Dict):
+    def collect_animation_assets(self, animation_paths: List[Source], insect_type: str, collected_assets: Dict):
         """Collect animation GIF assets."""
-        animation_output_dir = f"{self.output_dir}/animations/{insect_type}"
-        os.makedirs(animation_output_dir, exist_ok=True)
-        
-        collected_assets["animations"][insect_type] = []
-        
-        for file in os.listdir(animations_dir):
-            if file.endswith('.gif'):
-                src_path = os.path.join(animations_dir, file)
-                dst_path = os.path.join(animation_output_dir, file)
-                
-                try:
-                    shutil.copy2(src_path, dst_path)
-                    collected_assets["animations"][insect_type].append(file)
-                    print(f"✅ Collected animation: {file}")
-                except Exception as e:
-                    print(f"❌ Failed to process animation {file}: {e}")
-    
-    def optimize_and_copy_image(self, src_path: str, dst_path: str):
-        """Optimize image and ensure proper format."""
-        with Image.open(src_path) as img:
-            if img.mode != 'RGBA':
-                img = img.convert('RGBA')
+        for src_path in animation_paths:
+            file = source_name(src_path)
+            file_insect_type = insect_type_for_file(file, insect_type)
+            animation_output_dir = f"{self.output_dir}/animations/{file_insect_type}"
+            os.makedirs(animation_output_dir, exist_ok=True)
             
-            if img.size != (32, 32):
-                img = img.resize((32, 32), Image.NEAREST)
+            dst_path = os.path.join(animation_output_dir, file)
             
-            img.save(dst_path, 'PNG', optimize=True)
+            try:
+                copy_source(src_path, dst_path)
+                animation_type = variant_name_for_file(file, file_insect_type)
+                collected_assets["animations"].setdefault(file_insect_type, {})[animation_type] = describe_asset(dst_path)
+                print(f"✅ Collected animation: {file}")
+            except Exception as e:
+                print(f"❌ Failed to process animation {file}: {e}")
+    
+    def optimize_and_copy_image(self, src_path: Source, dst_path: str) -> Dict[str, Any]:
+        """Write the smallest lossless PNG of a sprite at its native size and return the savings."""
+        with open_source(src_path) as src:
+            stats = optimize_png(src, dst_path, original_bytes=source_size(src_path))
+        if stats["saved_bytes"] > 0:
+            print(f"🗜️  {os.path.basename(dst_path)}: {stats['original_bytes']} -> {stats['optimized_bytes']} bytes "
+                  f"({stats['color_type']}, {stats['bit_depth']}-bit, {stats['filter']}/{stats['zlib_strategy']})")
+        return stats
+    
+    def build_environment_layer(self, collected_assets: Dict):
+        """Prerender the static grass and flower layer so the game blits one image instead of drawing paths."""
+        # Same density the game used to scatter per window: 8 tufts and 3 flowers per 960px
+        strip, layout = environment_layout(
+            width=self.environment_width,
+            grass_count=round(self.environment_width / 120),
+            flower_count=round(self.environment_width / 320),
+            seed=self.environment_seed,
+            scale=self.environment_scale
+        )
+        environment_dir = f"{self.output_dir}/environment"
+        os.makedirs(environment_dir, exist_ok=True)
+        dst_path = os.path.join(environment_dir, "environment_strip.png")
+        data, _ = encode_png(strip)
+        with open(f"{dst_path}.tmp", "wb") as f:
+            f.write(data)
+        os.replace(f"{dst_path}.tmp", dst_path)
+        
+        collected_assets["environment"] = {"strip": describe_asset(dst_path), **layout}
+        print(f"🌿 Prerendered environment strip: {len(layout['placements'])} elements, {len(data)} bytes")
+    
+    def check_size_budget(self, collected_assets: Dict) -> Dict[str, Any]:
+        """Compare the shipped library size against ASSET_SIZE_BUDGET."""
+        entries = [entry for group in ("characters", "animations") for assets in collected_assets[group].values()
+                   for entry in assets.values()]
+        entries.extend(collected_assets.get("ui_elements", {}).values())
+        if collected_assets.get("environment"):
+            entries.append(collected_assets["environment"]["strip"])
+        total_bytes = sum(entry.get("bytes", 0) + sum(scaled["bytes"] for scaled in entry.get("scales", {}).values())
+                          for entry in entries)
+        return {
+            "budget_bytes": self.size_budget,
+            "total_bytes": total_bytes,
+            "within_budget": self.size_budget is None or total_bytes <= self.size_budget
+        }
     
-    def collect_ui_assets(self, collected_assets: Dict):
+    def collect_ui_assets(self, ui_paths: List[Source], collected_assets: Dict):
         """Collect UI element assets."""
         ui_dir = f"{self.output_dir}/ui"
         
-        for agent_id in range(1, self.agent_count + 1):
-            agent_dir = f"{self.temp_dir}/agent-{agent_id}-assets/agent_{agent_id}"
-            if not os.path.exists(agent_dir):
-                continue
+        for src_path in ui_paths:
+            file = source_name(src_path)
+            dst_path = os.path.join(ui_dir, file)
             
-            for file in os.listdir(agent_dir):
-                if file.startswith('ui_') and file.endswith('.png'):
-                    src_path = os.path.join(agent_dir, file)
-                    dst_path = os.path.join(ui_dir, file)
-                    
-                    try:
-                        self.optimize_and_copy_image(src_path, dst_path)
-                        if "ui_elements" not in collected_assets:
-                            collected_assets["ui_elements"] = []
-                        collected_assets["ui_elements"].append(file)
-                        print(f"✅ Collected UI asset: {file}")
-                    except Exception as e:
-                        print(f"❌ Failed to process UI asset {file}: {e}")
+            try:
+                collected_assets["compression"][dst_path] = self.optimize_and_copy_image(src_path, dst_path)
+                element_name = variant_name_for_file(file, "ui_elements")
+                add_sprite_entry(collected_assets["ui_elements"], element_name, dst_path)
+                print(f"✅ Collected UI asset: {file}")
+            except Exception as e:
+                print(f"❌ Failed to process UI asset {file}: {e}")
     
     def generate_manifest(self, collected_assets: Dict):
         """Generate asset manifest for dynamic loading."""
-        import datetime
-        
-        self.manifest["generated_at"] = datetime.datetime.utcnow().isoformat()
         self.manifest["characters"] = collected_assets["characters"]
         self.manifest["animations"] = collected_assets["animations"]
-        self.manifest["ui_elements"] = collected_assets.get("ui_elements", [])
+        self.manifest["ui_elements"] = collected_assets.get("ui_elements", {})
+        self.manifest["environment"] = collected_assets.get("environment")
         
         total_assets = (
             sum(len(assets) for assets in collected_assets["characters"].values()) +
             sum(len(assets) for assets in collected_assets["animations"].values()) +
-            len(collected_assets.get("ui_elements", []))
+            len(collected_assets.get("ui_elements", {}))
         )
         self.manifest["total_assets"] = total_assets
         
-        manifest_path = f"{self.output_dir}/manifest.json"
-        with open(manifest_path, 'w') as f:
-            json.dump(self.manifest, f, indent=2)
+        delta = manifest_delta(self.base_manifest, self.manifest)
+        previous_revision = (self.base_manifest or {}).get("revision", 0)
+        changed = any(delta.values()) or self.base_manifest is None
+        self.manifest["revision"] = previous_revision + 1 if changed else previous_revision
+        self.manifest["generated_at"] = self.manifest_timestamp(changed)
+        
+        # Write then rename so readers never see a half-written manifest during watch mode.
+        # The manifest goes first: a client reading a new delta can always fall back to it.
+        self.write_json_atomic(f"{self.output_dir}/manifest.json", self.manifest)
+        self.write_json_atomic(f"{self.output_dir}/manifest_delta.json", {
+            "from_revision": previous_revision,
+            "revision": self.manifest["revision"],
+            "generated_at": self.manifest["generated_at"],
+            **delta
+        })
+        self.delta_summary = {"revision": self.manifest["revision"], "from_revision": previous_revision,
+                              **{kind: len(records) for kind, records in delta.items()}}
+        
+        print(f"📋 Generated manifest revision {self.manifest['revision']} with {total_assets} total assets "
+              f"(+{len(delta['added'])} ~{len(delta['changed'])} -{len(delta['removed'])})")
+    
+    def manifest_timestamp(self, changed: bool) -> str:
+        """Pick generated_at so that the same inputs always produce the same manifest bytes.
+
+        SOURCE_DATE_EPOCH wins when set; otherwise an unchanged revision keeps the
+        timestamp it was first published with, and only a new revision gets the clock.
+        """
+        import datetime
         
-        print(f"📋 Generated manifest with {total_assets} total assets")
+        if self.source_date_epoch:
+            moment = datetime.datetime.fromtimestamp(int(self.source_date_epoch), datetime.timezone.utc)
+        elif not changed and (self.base_manifest or {}).get("generated_at"):
+            return self.base_manifest["generated_at"]
+        else:
+            moment = datetime.datetime.now(datetime.timezone.utc)
+        return moment.replace(tzinfo=None).isoformat()
+    
+    def write_json_atomic(self, path: str, data: Dict[str, Any]):
+        """Replace a JSON file in one rename, with sorted keys so identical inputs give identical bytes."""
+        with open(f"{path}.tmp", 'w') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(f"{path}.tmp", path)
     
     def generate_summary_report(self, collected_assets: Dict):
         """Generate comprehensive summary report."""
+        compression = collected_assets.get("compression", {})
         report = {
             "aggregation_summary": {
                 "total_agents": self.agent_count,
                 "successful_agents": len(collected_assets["reports"]),
                 "total_characters": len(collected_assets["characters"]),
                 "total_animations": sum(len(anims) for anims in collected_assets["animations"].values()),
-                "total_ui_elements": len(collected_assets.get("ui_elements", [])),
+                "total_ui_elements": len(collected_assets.get("ui_elements", {})),
                 "total_assets": self.manifest["total_assets"]
             },
             "character_breakdown": {},
             "animation_breakdown": {},
+            "compression": {
+                "original_bytes": sum(stats["original_bytes"] for stats in compression.values()),
+                "optimized_bytes": sum(stats["optimized_bytes"] for stats in compression.values()),
+                "saved_bytes": sum(stats["saved_bytes"] for stats in compression.values()),
+                "assets": compression
+            },
+            "size_budget": self.check_size_budget(collected_assets),
+            "manifest_delta": self.delta_summary,
             "agent_reports": collected_assets["reports"]
         }
         
         for insect_type, assets in collected_assets["characters"].items():
             report["character_breakdown"][insect_type] = {
                 "asset_count": len(assets),
-                "assets": assets
+                "assets": sorted(assets)
             }
         
         for insect_type, animations in collected_assets["animations"].items():
             report["animation_breakdown"][insect_type] = {
                 "animation_count": len(animations),
-                "animations": animations
+                "animations": sorted(animations)
             }
         
         report_path = "asset_summary.json"
@@ -205,9 +552,13 @@ def main():
     try:
         aggregator = AssetAggregator()
         
-        collected_assets = aggregator.collect_agent_assets()
-        
-        aggregator.collect_ui_assets(collected_assets)
+        if "--watch" in sys.argv or os.environ.get("AGGREGATE_WATCH", "false").lower() == "true":
+            collected_assets = aggregator.watch_agent_outputs(
+                timeout=float(os.environ.get("AGGREGATE_TIMEOUT", "3600")),
+                poll_interval=float(os.environ.get("AGGREGATE_POLL_INTERVAL", "5"))
+            )
+        else:
+            collected_assets = aggregator.collect_agent_assets()
         
         aggregator.generate_manifest(collected_assets)
         
@@ -219,6 +570,14 @@ def main():
         print(f"   - Characters: {summary_report['aggregation_summary']['total_characters']} types")
         print(f"   - Animations: {summary_report['aggregation_summary']['total_animations']} files")
         print(f"   - UI elements: {summary_report['aggregation_summary']['total_ui_elements']} files")
+        print(f"   - PNG bytes saved: {summary_report['compression']['saved_bytes']}")
+        print(f"   - Manifest revision: {summary_report['manifest_delta']['revision']}")
+        
+        size_budget = summary_report["size_budget"]
+        if not size_budget["within_budget"]:
+            print(f"❌ Asset library is {size_budget['total_bytes']} bytes, over the "
+                  f"{size_budget['budget_bytes']} byte ASSET_SIZE_BUDGET")
+            sys.exit(1)
         
     except Exception as e:
         print(f"💥 Asset aggregation failed: {e}")
@@ -0,0 +1,239 @@
+import io
+import os
+import sys
+import json
+import mmap
+import time
+import struct
+import shutil
+import ntpath
+import hashlib
+import posixpath
+from typing import Dict, List, Any, Optional
+
+# Layout: header (magic, format version, index length), UTF-8 JSON index, then the raw payloads.
+# Index entries point at their payload with absolute file offsets.
+BUNDLE_MAGIC = b"BBBUNDLE"
+BUNDLE_VERSION = 1
+BUNDLE_HEADER = struct.Struct("<8sII")
+BUNDLE_SUFFIX = ".bbundle"
+# Raw renders stay out of the bundle just as they stay out of the agent artifact
+EXCLUDED_DIRS = ("raw",)
+REPORT_FILES = ("generation_report.json", "asset_report.json")
+
+
+def member_kind(name: str) -> str:
+    """Classify an agent output file by its path inside the agent directory."""
+    parent, base = posixpath.split(name)
+    if not parent and base.endswith(".png"):
+        return "ui" if base.startswith("ui_") else "sprite"
+    if not parent and base in REPORT_FILES:
+        return "report"
+    if parent == "animations" and base.endswith(".gif"):
+        return "animation"
+    if name == "animations/animation_report.json":
+        return "animation_report"
+    return "other"
+
+
+def is_safe_member_name(name: str) -> bool:
+    """Whether an index name is a relative path that cannot escape the directory it is extracted to."""
+    if not name or posixpath.isabs(name) or ntpath.isabs(name) or ntpath.splitdrive(name)[0]:
+        return False
+    return all(part not in ("", ".", "..") for part in name.replace("\\", "/").split("/"))
+
+
+def write_bundle(agent_dir: str, bundle_path: str) -> Dict[str, Any]:
+    """Pack every file of an agent directory into one bundle and return its statistics."""
+    names = []
+    for root, dirs, files in os.walk(agent_dir):
+        dirs[:] = sorted(d for d in dirs if not (root == agent_dir and d in EXCLUDED_DIRS))
+        names.extend(os.path.relpath(os.path.join(root, file), agent_dir).replace(os.sep, "/") for file in sorted(files))
+
+    entries = []
+    for name in names:
+        digest = hashlib.sha256()
+        with open(os.path.join(agent_dir, name), "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        entries.append({"name": name, "kind": member_kind(name), "length": os.path.getsize(os.path.join(agent_dir, name)),
+                        "sha256": digest.hexdigest()})
+
+    # Offsets depend on the index length, which depends on the offsets' digits; converge on a fixed point
+    index_length = 0
+    while True:
+        offset = BUNDLE_HEADER.size + index_length
+        for entry in entries:
+            entry["offset"] = offset
+            offset += entry["length"]
+        index = json.dumps({"created_at": time.time(), "source": os.path.basename(os.path.abspath(agent_dir)),
+                            "entries": entries}, separators=(",", ":")).encode("utf-8")
+        if len(index) <= index_length:
+            index = index.ljust(index_length)
+            break
+        index_length = len(index)
+
+    tmp_path = f"{bundle_path}.tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(index)))
+        out.write(index)
+        for entry in entries:
+            with open(os.path.join(agent_dir, entry["name"]), "rb") as f:
+                shutil.copyfileobj(f, out)
+    os.replace(tmp_path, bundle_path)
+
+    return {"bundle": bundle_path, "files": len(entries), "payload_bytes": sum(entry["length"] for entry in entries),
+            "bundle_bytes": os.path.getsize(bundle_path)}
+
+
+class MemberReader(io.RawIOBase):
+    """Seekable read-only file over a member's bytes in the bundle's memory map."""
+
+    def __init__(self, view: memoryview):
+        super().__init__()
+        self.view = view
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = max(0, min(len(buffer), len(self.view) - self.position))
+        memoryview(buffer).cast("B")[:count] = self.view[self.position:self.position + count]
+        self.position += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: len(self.view)}[whence]
+        self.position = max(0, base + offset)
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def close(self):
+        if not self.closed:
+            self.view.release()
+        super().close()
+
+
+class BundleMember:
+    """One file packed in a bundle; its bytes are read straight from the memory map."""
+
+    def __init__(self, bundle: "AssetBundle", name: str, kind: str, offset: int, length: int, sha256: str):
+        self.bundle = bundle
+        self.name = name
+        self.kind = kind
+        self.offset = offset
+        self.length = length
+        self.sha256 = sha256
+
+    def view(self) -> memoryview:
+        """Zero-copy view of the payload; release it (or use it as a context manager) when done."""
+        return self.bundle.view[self.offset:self.offset + self.length]
+
+    def open(self) -> io.BufferedReader:
+        """Open the payload as a read-only binary file, e.g. for Image.open or json.load."""
+        return io.BufferedReader(MemberReader(self.view()))
+
+    def copy_to(self, dst_path: str):
+        """Write the payload to a file without an intermediate copy."""
+        with self.view() as view, open(f"{dst_path}.tmp", "wb") as f:
+            f.write(view)
+        os.replace(f"{dst_path}.tmp", dst_path)
+
+    def verify(self) -> bool:
+        """Check the payload against the hash recorded when it was packed."""
+        with self.view() as view:
+            return hashlib.sha256(view).hexdigest() == self.sha256
+
+
+class AssetBundle:
+    """Memory-mapped reader of a packed agent output bundle."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < BUNDLE_HEADER.size:
+                raise ValueError(f"{path} is too short to be an asset bundle")
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.map)
+
+        magic, version, index_length = BUNDLE_HEADER.unpack_from(self.map, 0)
+        if magic != BUNDLE_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an asset bundle")
+        if version != BUNDLE_VERSION:
+            self.close()
+            raise ValueError(f"{path} has unsupported bundle version {version}")
+
+        self.index = json.loads(bytes(self.view[BUNDLE_HEADER.size:BUNDLE_HEADER.size + index_length]))
+        self.members = {}
+        for entry in self.index["entries"]:
+            # Names come from the file itself, so a crafted index must not write outside extract()'s directory
+            if not is_safe_member_name(entry["name"]):
+                self.close()
+                raise ValueError(f"{path} has an unsafe member name: {entry['name']!r}")
+            if entry["offset"] + entry["length"] > len(self.map):
+                self.close()
+                raise ValueError(f"{path} is truncated: {entry['name']} runs past the end of the file")
+            self.members[entry["name"]] = BundleMember(self, **entry)
+
+    def __enter__(self) -> "AssetBundle":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get(self, name: str) -> Optional[BundleMember]:
+        """Look up a member by its path inside the agent directory."""
+        return self.members.get(name)
+
+    def of_kind(self, kind: str) -> List[BundleMember]:
+        """Members of one kind, in packing order."""
+        return [member for member in self.members.values() if member.kind == kind]
+
+    def verify(self) -> List[str]:
+        """Names of members whose payload no longer matches its hash."""
+        return [name for name, member in self.members.items() if not member.verify()]
+
+    def extract(self, out_dir: str):
+        """Recreate the packed agent directory."""
+        for member in self.members.values():
+            dst_path = os.path.join(out_dir, *member.name.split("/"))
+            os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+            member.copy_to(dst_path)
+
+    def close(self):
+        """Unmap the bundle; every member view and open member must be released first."""
+        self.view.release()
+        self.map.close()
+
+
+def main():
+    """Pack, list or unpack bundles: asset_bundle.py pack <agent_dir> <bundle> | list <bundle>... | unpack <bundle> <dir>."""
+    command, args = (sys.argv[1], sys.argv[2:]) if len(sys.argv) > 1 else ("", [])
+
+    if command == "pack" and len(args) == 2:
+        stats = write_bundle(*args)
+        print(f"📦 Packed {stats['files']} files ({stats['payload_bytes']} bytes) into {stats['bundle']}")
+    elif command == "list" and args:
+        for path in args:
+            with AssetBundle(path) as bundle:
+                print(f"📦 {path}: {len(bundle.members)} files")
+                for member in bundle.members.values():
+                    print(f"   {member.kind:<17} {member.length:>9}  {member.name}")
+    elif command == "unpack" and len(args) == 2:
+        with AssetBundle(args[0]) as bundle:
+            bundle.extract(args[1])
+            print(f"📂 Unpacked {len(bundle.members)} files into {args[1]}")
+    else:
+        print(main.__doc__)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+# Successful calls a backend needs before its own latency percentile drives hedging;
+# until then a secondary is launched once half the variant deadline has passed.
+MIN_HEDGE_SAMPLES = 5
+INITIAL_HEDGE_FRACTION = 0.5
+
+# A backend receives (cancel_event, timeout_seconds) and returns an image or None
+Backend = Tuple[str, Callable[[threading.Event, float], Any]]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of latencies."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class BackendExecutor:
+    """Run image backends under a per-variant deadline and hedge slow primaries.
+
+    Backends are tried in priority order. A backend that fails or returns an
+    unacceptable result hands over to the next one immediately; a backend that
+    runs past the hedge threshold (a percentile of its own observed latency)
+    gets a secondary launched alongside it. The first acceptable result wins
+    and every other call is told to stop through its cancel event.
+    """
+
+    def __init__(self, deadline: float = 300.0, hedge_percentile: Optional[float] = 90.0):
+        self.deadline = deadline
+        self.hedge_percentile = hedge_percentile
+        self.latencies = {}
+        self.stats = {}
+
+    def backend_stats(self, name: str) -> Dict[str, int]:
+        """Get the call counters of one backend."""
+        return self.stats.setdefault(name, {"calls": 0, "successes": 0, "failures": 0,
+                                            "timeouts": 0, "cancelled": 0, "hedges": 0})
+
+    def hedge_delay(self, name: str) -> Optional[float]:
+        """Seconds to wait on a backend before launching a secondary, or None to never hedge."""
+        if self.hedge_percentile is None:
+            return None
+        observed = self.latencies.get(name, [])
+        if len(observed) < MIN_HEDGE_SAMPLES:
+            return self.deadline * INITIAL_HEDGE_FRACTION
+        return percentile(observed, self.hedge_percentile)
+
+    def run(self, backends: List[Backend], accept: Callable[[Any], bool] = None) -> Tuple[Any, Optional[str]]:
+        """Return (result, backend name) of the first acceptable result, or (None, None)."""
+        accept = accept or (lambda result: result is not None)
+        if not backends:
+            return None, None
+
+        started_at = time.time()
+        deadline_at = started_at + self.deadline
+        cancel_event = threading.Event()
+        pool = ThreadPoolExecutor(max_workers=len(backends), thread_name_prefix="backend")
+        running = {}
+        queue = list(backends)
+        hedge_at = None
+
+        def launch(hedged: bool = False):
+            nonlocal hedge_at
+            name, call = queue.pop(0)
+            stats = self.backend_stats(name)
+            stats["calls"] += 1
+            if hedged:
+                stats["hedges"] += 1
+                print(f"🏁 Hedging with {name} after {time.time() - started_at:.1f}s")
+            remaining = max(0.0, deadline_at - time.time())
+            running[pool.submit(call, cancel_event, remaining)] = (name, time.time())
+            delay = self.hedge_delay(name)
+            hedge_at = time.time() + delay if delay is not None and queue else None
+
+        try:
+            launch()
+            while running:
+                now = time.time()
+                if now >= deadline_at:
+                    break
+                wake_at = min(deadline_at, hedge_at) if hedge_at else deadline_at
+                done, _ = wait(list(running), timeout=max(0.0, wake_at - now), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name, launched_at = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"❌ Backend {name} raised: {e}")
+                        result = None
+                    if accept(result):
+                        self.latencies.setdefault(name, []).append(round(time.time() - launched_at, 3))
+                        self.backend_stats(name)["successes"] += 1
+                        return result, name
+                    # Backends give up by themselves once the timeout they were handed runs out
+                    self.backend_stats(name)["timeouts" if time.time() >= deadline_at else "failures"] += 1
+
+                if done:
+                    # A failed call hands over without waiting for the hedge threshold
+                    if queue and len(running) == 0:
+                        launch()
+                elif hedge_at and time.time() >= hedge_at and queue:
+                    launch(hedged=True)
+
+            if running:
+                print(f"⏰ Variant deadline of {self.deadline:.0f}s exceeded")
+            for name, _ in running.values():
+                self.backend_stats(name)["timeouts"] += 1
+            running.clear()
+            return None, None
+
+        finally:
+            cancel_event.set()
+            for future, (name, _) in running.items():
+                future.cancel()
+                self.backend_stats(name)["cancelled"] += 1
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def latency_report(self) -> Dict[str, Any]:
+        """Summarize per-backend latency and outcome counters for the generation report."""
+        report = {}
+        for name, stats in self.stats.items():
+            observed = self.latencies.get(name, [])
+            report[name] = dict(stats)
+            if observed:
+                report[name].update({
+                    "p50_seconds": percentile(observed, 50),
+                    "p90_seconds": percentile(observed, 90),
+                    "max_seconds": max(observed)
+                })
+        return report
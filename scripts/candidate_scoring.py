@@ -0,0 +1,55 @@
+from typing import Dict
+import numpy as np
+from palette_remap import anchor_colors
+
+# Share of the sprite a well-framed subject covers; scores fall off linearly around it
+IDEAL_COVERAGE = 0.4
+# Opaque pixels this close (RGB distance) to a matrix anchor color count as on-palette
+PALETTE_FIT_RADIUS = 96.0
+# Luminance steps between neighbours: below the floor is flat, at or above the edge threshold is a crisp edge
+GRADIENT_FLOOR = 4
+CRISP_EDGE = 48
+
+METRIC_WEIGHTS = {
+    "coverage": 1.0,
+    "palette_fit": 1.0,
+    "crispness": 1.0
+}
+
+
+def score_candidates(batch: np.ndarray, colors: Dict[str, str] = None) -> Dict[str, np.ndarray]:
+    """Score a (K, H, W, 4) batch of processed candidate sprites; higher is better.
+
+    coverage rewards a silhouette that fills a sensible share of the frame,
+    palette_fit is the share of opaque pixels near the matrix colors, and
+    crispness is the share of luminance changes that are hard edges rather than
+    the soft ramps of an under-denoised render.
+    """
+    opaque = batch[..., 3] > 0
+    opaque_count = np.maximum(opaque.sum(axis=(1, 2)), 1)
+
+    coverage = opaque.mean(axis=(1, 2))
+    coverage_score = np.clip(1.0 - np.abs(coverage - IDEAL_COVERAGE) / IDEAL_COVERAGE, 0.0, 1.0)
+
+    anchors = np.array(anchor_colors(colors or {}), dtype=np.float32)
+    if len(anchors):
+        rgb = batch[..., :3].astype(np.float32)
+        nearest = np.linalg.norm(rgb[..., None, :] - anchors, axis=-1).min(axis=-1)
+        palette_fit = ((nearest < PALETTE_FIT_RADIUS) & opaque).sum(axis=(1, 2)) / opaque_count
+    else:
+        palette_fit = np.zeros(len(batch))
+
+    luminance = batch[..., :3].astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    steps = []
+    for axis in (1, 2):
+        both_opaque = np.logical_and(np.take(opaque, range(1, opaque.shape[axis]), axis=axis),
+                                     np.take(opaque, range(opaque.shape[axis] - 1), axis=axis))
+        steps.append(np.where(both_opaque, np.abs(np.diff(luminance, axis=axis)), 0.0).reshape(len(batch), -1))
+    steps = np.concatenate(steps, axis=1)
+    crispness = (steps >= CRISP_EDGE).sum(axis=1) / np.maximum((steps >= GRADIENT_FLOOR).sum(axis=1), 1)
+
+    metrics = {"coverage": coverage_score, "palette_fit": palette_fit, "crispness": crispness}
+    weights = dict(METRIC_WEIGHTS, palette_fit=METRIC_WEIGHTS["palette_fit"] if len(anchors) else 0.0)
+    metrics["score"] = sum(weights[name] * metrics[name] for name in weights) / sum(weights.values())
+    metrics["raw_coverage"] = coverage
+    return metrics
@@ -1,9 +1,72 @@
 import os
 import json
 import sys
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from PIL import Image
-import imageio
+from gif_encoder import write_gif
+
+ANIMATION_CONFIGS = {
+    "beetle": {
+        "walking": {
+            "frames": ["beetle_walk_1.png", "beetle_idle.png", "beetle_walk_2.png", "beetle_idle.png"],
+            "duration": 0.5,
+            "loop": True
+        },
+        "idle": {
+            "frames": ["beetle_idle.png", "beetle_idle.png"],
+            "duration": 1.0,
+            "loop": True
+        }
+    },
+    "butterfly": {
+        "flying": {
+            "frames": ["butterfly_fly_1.png", "butterfly_fly_2.png", "butterfly_fly_3.png", "butterfly_fly_4.png"],
+            "duration": 0.3,
+            "loop": True
+        },
+        "idle": {
+            "frames": ["butterfly_idle.png", "butterfly_idle.png"],
+            "duration": 1.5,
+            "loop": True
+        }
+    },
+    "ladybug": {
+        "walking": {
+            "frames": ["ladybug_walk_1.png", "ladybug_idle.png", "ladybug_walk_2.png", "ladybug_idle.png"],
+            "duration": 0.5,
+            "loop": True
+        },
+        "idle": {
+            "frames": ["ladybug_idle.png", "ladybug_idle.png"],
+            "duration": 1.0,
+            "loop": True
+        }
+    },
+    "caterpillar": {
+        "crawling": {
+            "frames": ["caterpillar_crawl_1.png", "caterpillar_crawl_2.png", "caterpillar_crawl_3.png"],
+            "duration": 0.6,
+            "loop": True
+        },
+        "idle": {
+            "frames": ["caterpillar_idle.png", "caterpillar_idle.png"],
+            "duration": 1.2,
+            "loop": True
+        }
+    },
+    "ui_elements": {
+        "sparkle": {
+            "frames": ["ui_elements_sparkle_effect.png"],
+            "duration": 0.2,
+            "loop": False
+        },
+        "pulse": {
+            "frames": ["ui_elements_heart_icon.png", "ui_elements_heart_icon.png"],
+            "duration": 0.8,
+            "loop": True
+        }
+    }
+}
 
 class BugBuddiesAnimationCreator:
     """Create GIF animations from generated static assets."""
@@ -12,78 +75,31 @@ class BugBuddiesAnimationCreator:
         self.agent_id = int(os.environ.get("AGENT_ID", "1"))
         self.insect_type = os.environ.get("INSECT_TYPE", "beetle")
         self.animation_types = json.loads(os.environ.get("ANIMATION_TYPES", "[]"))
+        self.work_items = json.loads(os.environ.get("WORK_ITEMS") or "[]") or []
         
         self.input_dir = f"temp_assets/agent_{self.agent_id}"
         self.output_dir = f"{self.input_dir}/animations"
         os.makedirs(self.output_dir, exist_ok=True)
         
         self.animation_configs = self.get_animation_configs()
+        self.gif_stats = {}
     
     def get_animation_configs(self) -> Dict[str, Dict[str, Any]]:
         """Get animation configuration for each insect type."""
-        configs = {
-            "beetle": {
-                "walking": {
-                    "frames": ["beetle_walk_1.png", "beetle_idle.png", "beetle_walk_2.png", "beetle_idle.png"],
-                    "duration": 0.5,
-                    "loop": True
-                },
-                "idle": {
-                    "frames": ["beetle_idle.png", "beetle_idle.png"],
-                    "duration": 1.0,
-                    "loop": True
-                }
-            },
-            "butterfly": {
-                "flying": {
-                    "frames": ["butterfly_fly_1.png", "butterfly_fly_2.png", "butterfly_fly_3.png", "butterfly_fly_4.png"],
-                    "duration": 0.3,
-                    "loop": True
-                },
-                "idle": {
-                    "frames": ["butterfly_idle.png", "butterfly_idle.png"],
-                    "duration": 1.5,
-                    "loop": True
-                }
-            },
-            "ladybug": {
-                "walking": {
-                    "frames": ["ladybug_walk_1.png", "ladybug_idle.png", "ladybug_walk_2.png", "ladybug_idle.png"],
-                    "duration": 0.5,
-                    "loop": True
-                },
-                "idle": {
-                    "frames": ["ladybug_idle.png", "ladybug_idle.png"],
-                    "duration": 1.0,
-                    "loop": True
-                }
-            },
-            "caterpillar": {
-                "crawling": {
-                    "frames": ["caterpillar_crawl_1.png", "caterpillar_crawl_2.png", "caterpillar_crawl_3.png"],
-                    "duration": 0.6,
-                    "loop": True
-                },
-                "idle": {
-                    "frames": ["caterpillar_idle.png", "caterpillar_idle.png"],
-                    "duration": 1.2,
-                    "loop": True
-                }
-            },
-            "ui_elements": {
-                "sparkle": {
-                    "frames": ["ui_elements_sparkle_effect.png"],
-                    "duration": 0.2,
-                    "loop": False
-                },
-                "pulse": {
-                    "frames": ["ui_elements_heart_icon.png", "ui_elements_heart_icon.png"],
-                    "duration": 0.8,
-                    "loop": True
-                }
-            }
-        }
-        return configs.get(self.insect_type, {})
+        return ANIMATION_CONFIGS.get(self.insect_type, {})
+    
+    def get_animation_jobs(self) -> List[Tuple[str, str]]:
+        """List (insect_type, animation_type) pairs from the scheduled work items or the single insect config."""
+        if self.work_items:
+            return [(item["insect_type"], animation_type)
+                    for item in self.work_items
+                    for animation_type in item.get("animation_types", [])]
+        return [(self.insect_type, animation_type) for animation_type in self.animation_types]
+    
+    def set_insect_type(self, insect_type: str):
+        """Switch the insect whose frames and animation configs are used."""
+        self.insect_type = insect_type
+        self.animation_configs = self.get_animation_configs()
     
     def create_animation(self, animation_type: str) -> bool:
         """Create a single animation GIF."""
@@ -100,91 +116,68 @@ class BugBuddiesAnimationCreator:
             for frame_file in config["frames"]:
                 frame_path = os.path.join(self.input_dir, frame_file)
                 if os.path.exists(frame_path):
-                    frame = Image.open(frame_path)
-                    frames.append(frame)
+                    with Image.open(frame_path) as frame:
+                        frames.append(frame.convert('RGBA'))
                 else:
                     print(f"⚠️  Frame not found: {frame_path}")
-                    placeholder = self.create_placeholder_frame()
-                    frames.append(placeholder)
+                    frames.append(None)
             
             if not frames:
                 print(f"❌ No frames available for {animation_type}")
                 return False
             
-            output_path = os.path.join(self.output_dir, f"{self.insect_type}_{animation_type}.gif")
-            
-            frame_arrays = []
-            for frame in frames:
-                if frame.mode != 'RGBA':
-                    frame = frame.convert('RGBA')
-                frame_arrays.append(frame)
-            
-            frame_duration = config["duration"]
+            # Placeholders take the size of the real frames, since every GIF frame shares one canvas
+            size = next((frame.size for frame in frames if frame is not None), None)
+            frames = [frame if frame is not None else self.create_placeholder_frame(size) for frame in frames]
             
-            imageio.mimsave(
-                output_path,
-                frame_arrays,
-                duration=frame_duration,
-                loop=0 if config["loop"] else 1,
-                disposal=2  # Clear frame before next
-            )
+            output_path = os.path.join(self.output_dir, f"{self.insect_type}_{animation_type}.gif")
+            stats = write_gif(output_path, frames, config["duration"], loop=config["loop"])
+            self.gif_stats[f"{self.insect_type}_{animation_type}"] = stats
             
-            print(f"✅ Created animation: {output_path}")
+            print(f"✅ Created animation: {output_path} ({stats['bytes']} bytes, {stats['stored_frames']}/"
+                  f"{stats['input_frames']} frames stored, {stats['palette_colors']} colors)")
             return True
             
         except Exception as e:
             print(f"❌ Failed to create {animation_type} animation: {e}")
             return False
     
-    def create_placeholder_frame(self) -> Image.Image:
+    def create_placeholder_frame(self, size: Tuple[int, int] = None) -> Image.Image:
         """Create a placeholder frame when assets are missing."""
-        size = (32, 32)
-        if self.insect_type == "ui_elements":
-            size = (16, 16)
+        if size is None:
+            size = (16, 16) if self.insect_type == "ui_elements" else (32, 32)
         
         image = Image.new('RGBA', size, (255, 0, 255, 128))  # Magenta placeholder
         return image
     
-    def optimize_gif(self, gif_path: str) -> None:
-        """Optimize GIF file size while maintaining quality."""
-        try:
-            frames = imageio.mimread(gif_path)
-            
-            imageio.mimsave(
-                gif_path,
-                frames,
-                duration=0.5,
-                optimize=True,
-                loop=0
-            )
-            
-            print(f"🔧 Optimized: {gif_path}")
-            
-        except Exception as e:
-            print(f"⚠️  Failed to optimize {gif_path}: {e}")
-    
     def create_all_animations(self) -> Dict[str, Any]:
         """Create all animations for this agent."""
+        jobs = self.get_animation_jobs()
+        insect_types = sorted({insect_type for insect_type, _ in jobs}) or [self.insect_type]
+        
         results = {
             "agent_id": self.agent_id,
-            "insect_type": self.insect_type,
+            "insect_type": "+".join(insect_types),
             "created_animations": [],
             "failed_animations": [],
-            "total_animations": len(self.animation_types)
+            "total_animations": len(jobs)
         }
         
-        print(f"🎬 Agent {self.agent_id} starting animation creation for {self.insect_type}")
-        print(f"📋 Animation types: {self.animation_types}")
+        print(f"🎬 Agent {self.agent_id} starting animation creation for {results['insect_type']}")
+        print(f"📋 Animation types: {[animation_type for _, animation_type in jobs]}")
         
-        for animation_type in self.animation_types:
+        for insect_type, animation_type in jobs:
+            self.set_insect_type(insect_type)
+            # Scheduled agents can hold several insects, so qualify names to keep them unique
+            label = f"{insect_type}_{animation_type}" if self.work_items else animation_type
+            
             success = self.create_animation(animation_type)
             if success:
-                results["created_animations"].append(animation_type)
-                gif_path = os.path.join(self.output_dir, f"{self.insect_type}_{animation_type}.gif")
-                self.optimize_gif(gif_path)
+                results["created_animations"].append(label)
             else:
-                results["failed_animations"].append(animation_type)
+                results["failed_animations"].append(label)
         
+        results["gif_encoding"] = self.gif_stats
         report_path = os.path.join(self.output_dir, "animation_report.json")
         with open(report_path, "w") as f:
             json.dump(results, f, indent=2)
@@ -0,0 +1,69 @@
+from collections import Counter
+from typing import Dict, List, Any, Tuple
+import numpy as np
+import torch
+from PIL import Image
+from latent_decoder import linear_decode
+
+# Bits kept per channel in previews: coarse enough that residual noise does not read as change
+PREVIEW_BITS = 3
+TRANSPARENT = -1
+
+
+def preview_sprites(latents: torch.Tensor, size: Tuple[int, int]) -> np.ndarray:
+    """Reduce (B, 4, h, w) latents to (B, H, W) posterized color codes at sprite resolution.
+
+    A cheap stand-in for process_to_pixel_art: linear decode, box downscale,
+    posterize, and key out the most common corner color as the background.
+    """
+    sprites = []
+    for image in linear_decode(latents):
+        pixels = np.asarray(image.resize(size, Image.Resampling.BOX), dtype=np.int32) >> (8 - PREVIEW_BITS)
+        codes = (pixels[..., 0] << (2 * PREVIEW_BITS)) | (pixels[..., 1] << PREVIEW_BITS) | pixels[..., 2]
+        corners = [codes[0, 0], codes[0, -1], codes[-1, 0], codes[-1, -1]]
+        codes[codes == Counter(corners).most_common(1)[0][0]] = TRANSPARENT
+        sprites.append(codes)
+    return np.stack(sprites)
+
+
+class EarlyExitMonitor:
+    """Watch one diffusion run and ask it to stop once the previewed sprites stop changing."""
+
+    def __init__(self, preview_size: Tuple[int, int], steps: int, interval: int = 2,
+                 tolerance: float = 0.01, stable_checks: int = 2):
+        self.preview_size = preview_size
+        self.steps = steps
+        self.interval = max(1, interval)
+        self.tolerance = tolerance
+        self.stable_checks = stable_checks
+        self.previous = None
+        self.stable = 0
+        self.changes: List[float] = []
+        self.stopped_at = None
+
+    def check(self, step: int, latents: torch.Tensor) -> bool:
+        """Preview after a (0-based) step; True once every image has held still for enough checks."""
+        # Stopping at the last step saves nothing
+        if (step + 1) % self.interval or step + 1 >= self.steps:
+            return False
+        sprites = preview_sprites(latents, self.preview_size)
+        if self.previous is not None:
+            # The least settled image of a batch decides
+            changed = float((sprites != self.previous).mean(axis=(1, 2)).max())
+            self.changes.append(round(changed, 4))
+            self.stable = self.stable + 1 if changed <= self.tolerance else 0
+        self.previous = sprites
+        if self.stable >= self.stable_checks:
+            self.stopped_at = step + 1
+            return True
+        return False
+
+    def report(self) -> Dict[str, Any]:
+        """Steps run and saved, with the changed-pixel fraction seen at each check."""
+        steps_run = self.stopped_at or self.steps
+        return {
+            "steps": self.steps,
+            "steps_run": steps_run,
+            "steps_saved": self.steps - steps_run,
+            "changes": self.changes
+        }
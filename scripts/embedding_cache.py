@@ -0,0 +1,69 @@
+import os
+import hashlib
+import threading
+from typing import Dict, Any
+import torch
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "bugbuddies", "embeddings")
+
+
+def encoder_fingerprint(pipeline) -> str:
+    """Identify the tokenizer and text encoder, so embeddings never leak across models or weights."""
+    tokenizer, encoder = pipeline.tokenizer, pipeline.text_encoder
+    digest = hashlib.sha256()
+    digest.update(f"{tokenizer.name_or_path}|{len(tokenizer)}|{tokenizer.model_max_length}".encode())
+    digest.update(encoder.config.to_json_string().encode())
+    # A slice of the token embedding table tells fine-tuned weights with identical configs apart
+    token_embedding = encoder.get_input_embeddings().weight
+    digest.update(token_embedding[:8].detach().to("cpu", torch.float32).numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+class PromptEmbeddingCache:
+    """Memoize text-encoder outputs in memory and on disk, keyed by encoder identity and text."""
+
+    def __init__(self, pipeline, cache_dir: str = None):
+        self.pipeline = pipeline
+        self.fingerprint = encoder_fingerprint(pipeline)
+        self.cache_dir = os.path.join(cache_dir or DEFAULT_CACHE_DIR, self.fingerprint)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.memory = {}
+        self.lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "encodes": 0}
+
+    def entry_path(self, text: str) -> str:
+        """Cache file of one text."""
+        return os.path.join(self.cache_dir, f"{hashlib.sha256(text.encode()).hexdigest()}.pt")
+
+    def get(self, text: str) -> torch.Tensor:
+        """Return the (1, tokens, hidden) embedding of a text on the pipeline's device and dtype."""
+        with self.lock:
+            if text in self.memory:
+                self.stats["memory_hits"] += 1
+                return self.memory[text]
+
+            path = self.entry_path(text)
+            embedding = None
+            if os.path.exists(path):
+                try:
+                    embedding = torch.load(path, map_location="cpu", weights_only=True)
+                    self.stats["disk_hits"] += 1
+                except Exception as e:
+                    print(f"⚠️  Ignoring unreadable embedding cache entry {path}: {e}")
+
+            if embedding is None:
+                with torch.no_grad():
+                    embedding, _ = self.pipeline.encode_prompt(text, self.pipeline.device, 1, False)
+                embedding = embedding.detach().to("cpu")
+                tmp_path = f"{path}.tmp"
+                torch.save(embedding, tmp_path)
+                os.replace(tmp_path, path)
+                self.stats["encodes"] += 1
+
+            embedding = embedding.to(self.pipeline.device, self.pipeline.text_encoder.dtype)
+            self.memory[text] = embedding
+            return embedding
+
+    def report(self) -> Dict[str, Any]:
+        """Summarize cache use for the generation report."""
+        return {"fingerprint": self.fingerprint, "cache_dir": self.cache_dir, **self.stats}
@@ -0,0 +1,81 @@
+import math
+import random
+from typing import Dict, List, Any, Tuple
+from PIL import Image, ImageDraw
+
+# The game canvas is a 100px tall strip along the bottom of the screen
+STRIP_HEIGHT = 100
+
+GRASS_DARK = (34, 139, 34)
+GRASS_LIGHT = (50, 205, 50)
+PETAL = (255, 182, 193)
+FLOWER_CENTER = (255, 215, 0)
+
+# Blades of a grass tuft as triangles relative to its base point, matching BugBuddies.drawGrass
+GRASS_BLADES = [
+    ([(-2, 0), (-1, -6), (0, 0)], GRASS_DARK),
+    ([(0, 0), (1, -7), (2, 0)], GRASS_LIGHT),
+    ([(2, 0), (3, -5), (4, 0)], GRASS_DARK)
+]
+
+def draw_grass(draw: ImageDraw.ImageDraw, x: float, y: float, scale: int = 1):
+    """Draw a grass tuft whose base sits at (x, y)."""
+    for points, color in GRASS_BLADES:
+        draw.polygon([((x + px) * scale, (y + py) * scale) for px, py in points], fill=color)
+
+
+def draw_flower(draw: ImageDraw.ImageDraw, x: float, y: float, scale: int = 1):
+    """Draw a five-petal flower centered on (x, y), matching BugBuddies.drawFlower."""
+    for petal in range(5):
+        angle = petal * 2 * math.pi / 5
+        cx, cy = x + math.cos(angle) * 4, y + math.sin(angle) * 4
+        # PIL has no rotated ellipse, so trace the petal outline
+        outline = []
+        for step in range(16):
+            t = step * 2 * math.pi / 16
+            ex, ey = math.cos(t) * 3, math.sin(t) * 1.8
+            outline.append(((cx + ex * math.cos(angle) - ey * math.sin(angle)) * scale,
+                            (cy + ex * math.sin(angle) + ey * math.cos(angle)) * scale))
+        draw.polygon(outline, fill=PETAL)
+    draw.ellipse([(x - 2) * scale, (y - 2) * scale, (x + 2) * scale, (y + 2) * scale], fill=FLOWER_CENTER)
+
+
+ELEMENT_DRAWERS = {
+    "grass": draw_grass,
+    "flower": draw_flower
+}
+
+
+def environment_placements(width: int, grass_count: int, flower_count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Scatter grass and flowers over a strip with the same vertical bands the game used to randomize."""
+    rng = random.Random(seed)
+    placements = [{"type": "grass", "x": round(rng.uniform(0, width), 1), "y": round(85 + rng.uniform(0, 10), 1)}
+                  for _ in range(grass_count)]
+    placements += [{"type": "flower", "x": round(rng.uniform(0, width), 1), "y": round(75 + rng.uniform(0, 15), 1)}
+                   for _ in range(flower_count)]
+    return placements
+
+
+def render_environment_strip(placements: List[Dict[str, Any]], width: int, scale: int = 1) -> Image.Image:
+    """Composite all placements into one transparent strip that tiles seamlessly left to right."""
+    strip = Image.new("RGBA", (width * scale, STRIP_HEIGHT * scale), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(strip)
+    for placement in placements:
+        # Elements overlapping an edge are drawn again on the opposite side so repeats line up
+        for offset in (-width, 0, width):
+            ELEMENT_DRAWERS[placement["type"]](draw, placement["x"] + offset, placement["y"], scale)
+    return strip
+
+
+def environment_layout(width: int, grass_count: int, flower_count: int, seed: int,
+                       scale: int) -> Tuple[Image.Image, Dict[str, Any]]:
+    """Build the prerendered strip and the manifest data describing how it was laid out."""
+    placements = environment_placements(width, grass_count, flower_count, seed)
+    layout = {
+        "strip_width": width,
+        "strip_height": STRIP_HEIGHT,
+        "scale": scale,
+        "seed": seed,
+        "placements": placements
+    }
+    return render_environment_strip(placements, width, scale), layout
@@ -0,0 +1,291 @@
+import os
+import sys
+import json
+import time
+import base64
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from typing import Dict, List, Any, Tuple
+from backend_executor import percentile
+from stub_backend import parse_latency
+
+
+def blob_sha(content: bytes) -> str:
+    """Git blob SHA of file content, as the contents API reports it."""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+class FakeGitHubState:
+    """In-memory repositories holding the refs, files and pull requests the asset scripts touch."""
+
+    def __init__(self, default_branch: str = "main", check_polls: int = 0, latency: str = "fixed:0"):
+        self.default_branch = default_branch
+        # Check runs report in_progress for this many polls of a PR before succeeding
+        self.check_polls = check_polls
+        self.sample_latency = parse_latency(latency)
+        self.lock = threading.Lock()
+        self.refs = {}
+        self.files = {}
+        self.pulls = {}
+        self.check_requests = {}
+        self.last_check_runs = []
+        self.request_latencies = {}
+
+    def repo_refs(self, repo: str) -> Dict[str, str]:
+        """Get a repository's branches, creating it with its default branch on first use."""
+        if repo not in self.refs:
+            self.refs[repo] = {self.default_branch: hashlib.sha1(repo.encode()).hexdigest()}
+        return self.refs[repo]
+
+    def record(self, endpoint: str, seconds: float):
+        """Store the service time of one request."""
+        with self.lock:
+            self.request_latencies.setdefault(endpoint, []).append(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Summarize request counts and latencies per endpoint, plus repository sizes."""
+        with self.lock:
+            endpoints = {
+                endpoint: {
+                    "requests": len(latencies),
+                    "p50_seconds": round(percentile(latencies, 50), 4),
+                    "p90_seconds": round(percentile(latencies, 90), 4),
+                    "max_seconds": round(max(latencies), 4)
+                }
+                for endpoint, latencies in self.request_latencies.items()
+            }
+            return {
+                "endpoints": endpoints,
+                "total_requests": sum(len(latencies) for latencies in self.request_latencies.values()),
+                "files": sum(len(branch_files) for branch_files in self.files.values()),
+                "pulls": sum(len(pulls) for pulls in self.pulls.values())
+            }
+
+    def handle(self, method: str, path: str, query: Dict[str, str], body: Dict[str, Any]) -> Tuple[str, int, Any]:
+        """Route one REST or GraphQL call; returns (endpoint name, status, JSON payload)."""
+        if path.rstrip("/") == "/graphql" and method == "POST":
+            with self.lock:
+                return self.handle_graphql(body)
+
+        parts = path.strip("/").split("/")
+        if len(parts) < 3 or parts[0] != "repos":
+            return "unknown", 404, {"message": "Not Found"}
+        repo, rest = f"{parts[1]}/{parts[2]}", parts[3:]
+
+        with self.lock:
+            refs = self.repo_refs(repo)
+
+            if rest[:3] == ["git", "refs", "heads"] and method == "GET":
+                branch = "/".join(rest[3:])
+                if branch not in refs:
+                    return "get_ref", 404, {"message": "Not Found"}
+                return "get_ref", 200, {"ref": f"refs/heads/{branch}", "object": {"sha": refs[branch]}}
+
+            if rest == ["git", "refs"] and method == "POST":
+                branch = body["ref"][len("refs/heads/"):]
+                if branch in refs:
+                    return "create_ref", 422, {"message": "Reference already exists"}
+                refs[branch] = body["sha"]
+                return "create_ref", 201, {"ref": body["ref"], "object": {"sha": body["sha"]}}
+
+            if rest[:1] == ["contents"]:
+                file_path = "/".join(rest[1:])
+                branch = body.get("branch") or query.get("ref") or self.default_branch
+                branch_files = self.files.setdefault((repo, branch), {})
+                if method == "GET":
+                    if file_path not in branch_files:
+                        return "get_contents", 404, {"message": "Not Found"}
+                    return "get_contents", 200, {"path": file_path, "sha": branch_files[file_path]}
+                if method == "PUT":
+                    if branch not in refs:
+                        return "put_contents", 404, {"message": f"Branch {branch} not found"}
+                    existing = branch_files.get(file_path)
+                    if existing and body.get("sha") != existing:
+                        return "put_contents", 409, {"message": f"{file_path} does not match {body.get('sha')}"}
+                    sha = blob_sha(base64.b64decode(body["content"]))
+                    branch_files[file_path] = sha
+                    refs[branch] = hashlib.sha1(f"{refs[branch]}{file_path}{sha}".encode()).hexdigest()
+                    return "put_contents", 200 if existing else 201, {"content": {"path": file_path, "sha": sha},
+                                                                        "commit": {"sha": refs[branch]}}
+
+            if rest == ["pulls"] and method == "POST":
+                if body["head"] not in refs:
+                    return "create_pull", 422, {"message": f"Head {body['head']} not found"}
+                pulls = self.pulls.setdefault(repo, {})
+                number = len(pulls) + 1
+                pulls[number] = {
+                    "number": number,
+                    "title": body["title"],
+                    "body": body.get("body", ""),
+                    "state": "open",
+                    "merged": False,
+                    "head": {"ref": body["head"]},
+                    "base": {"ref": body["base"]},
+                    "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    "html_url": f"https://github.com/{repo}/pull/{number}"
+                }
+                return "create_pull", 201, self.pull_payload(repo, number)
+
+            if rest == ["pulls"] and method == "GET":
+                pulls = [self.pull_payload(repo, number) for number in sorted(self.pulls.get(repo, {}), reverse=True)]
+                state = query.get("state", "open")
+                pulls = [pull for pull in pulls if state == "all" or pull["state"] == state]
+                per_page = int(query.get("per_page", "30"))
+                page = int(query.get("page", "1"))
+                return "list_pulls", 200, pulls[(page - 1) * per_page:page * per_page]
+
+            if len(rest) >= 2 and rest[0] == "pulls":
+                number = int(rest[1])
+                if number not in self.pulls.get(repo, {}):
+                    return "get_pull", 404, {"message": "Not Found"}
+                if len(rest) == 2 and method == "GET":
+                    return "get_pull", 200, self.pull_payload(repo, number)
+                if rest[2:] == ["merge"] and method == "PUT":
+                    pull = self.pulls[repo][number]
+                    if pull["state"] != "open":
+                        return "merge_pull", 405, {"message": "Pull Request is not mergeable"}
+                    pull.update({"state": "closed", "merged": True})
+                    return "merge_pull", 200, {"sha": self.pull_payload(repo, number)["head"]["sha"], "merged": True}
+
+            if len(rest) == 3 and rest[0] == "commits" and rest[2] == "check-runs" and method == "GET":
+                check_runs = self.poll_check_runs(rest[1])
+                return "check_runs", 200, {"total_count": len(check_runs), "check_runs": check_runs}
+
+        return "unknown", 404, {"message": "Not Found"}
+
+    def poll_check_runs(self, sha: str) -> List[Dict[str, Any]]:
+        """Report the fake CI run of a commit, which passes after check_polls polls."""
+        polls = self.check_requests[sha] = self.check_requests.get(sha, 0) + 1
+        done = polls > self.check_polls
+        return [{"name": "build", "status": "completed" if done else "in_progress",
+                 "conclusion": "success" if done else None}]
+
+    def handle_graphql(self, body: Dict[str, Any]) -> Tuple[str, int, Any]:
+        """Answer the named GraphQL operations of github_graphql.PRStatusClient."""
+        operation = body.get("operationName")
+        variables = body.get("variables", {})
+        repo = f"{variables.get('owner')}/{variables.get('name')}"
+        endpoint = f"graphql:{operation}"
+        self.repo_refs(repo)
+
+        def page(items: List[Any]) -> Dict[str, Any]:
+            # Cursors are plain offsets; real ones are opaque, which clients must not rely on anyway
+            start = int(variables.get("after") or 0)
+            end = start + int(variables.get("first", 100))
+            return {"pageInfo": {"hasNextPage": end < len(items), "endCursor": str(min(end, len(items)))},
+                    "nodes": items[start:end]}
+
+        if operation == "FindAssetPullRequests":
+            pulls = [self.pulls[repo][number] for number in sorted(self.pulls.get(repo, {}), reverse=True)]
+            nodes = [{"number": pull["number"], "title": pull["title"], "headRefName": pull["head"]["ref"],
+                      "createdAt": pull["created_at"]} for pull in pulls if pull["state"] == "open"]
+            return endpoint, 200, {"data": {"repository": {"pullRequests": page(nodes)}}}
+
+        if operation == "PullRequestStatus":
+            number = int(variables["number"])
+            if number not in self.pulls.get(repo, {}):
+                return endpoint, 200, {"data": {"repository": {"pullRequest": None}}}
+            pull = self.pull_payload(repo, number)
+            # Checks are polled once per query, not once per page of the same query
+            if not variables.get("after"):
+                self.last_check_runs = self.poll_check_runs(pull["head"]["sha"])
+            contexts = [{"__typename": "CheckRun", "name": run["name"], "status": run["status"].upper(),
+                         "conclusion": run["conclusion"].upper() if run["conclusion"] else None}
+                        for run in self.last_check_runs]
+            state = "MERGED" if pull["merged"] else pull["state"].upper()
+            return endpoint, 200, {"data": {"repository": {"pullRequest": {
+                "number": number,
+                "title": pull["title"],
+                "state": state,
+                "merged": pull["merged"],
+                "mergeable": "MERGEABLE" if pull["mergeable"] else "UNKNOWN",
+                "mergeStateStatus": pull["mergeable_state"].upper(),
+                "headRefName": pull["head"]["ref"],
+                "headRefOid": pull["head"]["sha"],
+                "commits": {"nodes": [{"commit": {"statusCheckRollup": {"contexts": page(contexts)}}}]}
+            }}}}
+
+        return endpoint, 200, {"errors": [{"message": f"Unsupported operation {operation}"}]}
+
+    def pull_payload(self, repo: str, number: int) -> Dict[str, Any]:
+        """Render a stored pull request the way the REST API returns it."""
+        pull = self.pulls[repo][number]
+        head_sha = self.refs[repo].get(pull["head"]["ref"])
+        return {
+            **pull,
+            "head": {**pull["head"], "sha": head_sha},
+            "mergeable": pull["state"] == "open",
+            "mergeable_state": "clean" if pull["state"] == "open" else "unknown"
+        }
+
+
+def make_handler(state: FakeGitHubState):
+    """Build a request handler class bound to one fake GitHub state."""
+
+    class FakeGitHubHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def respond(self, status: int, payload: Any):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def dispatch(self):
+            start_time = time.time()
+            url = urlparse(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length)) if length else {}
+
+            if url.path == "/_stats":
+                self.respond(200, state.stats())
+                return
+
+            # Simulated network and server time, before the request is served
+            time.sleep(state.sample_latency())
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            endpoint, status, payload = state.handle(self.command, url.path, query, body)
+            self.respond(status, payload)
+            state.record(endpoint, time.time() - start_time)
+
+        do_GET = do_POST = do_PUT = dispatch
+
+    return FakeGitHubHandler
+
+
+def start_fake_github(port: int = 0, **state_options) -> Tuple[ThreadingHTTPServer, FakeGitHubState, str]:
+    """Serve a fake GitHub API on a background thread; returns (server, state, base URL)."""
+    state = FakeGitHubState(**state_options)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    """Run the fake GitHub API in the foreground for manual runs against GITHUB_API_URL."""
+    parser = argparse.ArgumentParser(description="Serve a local fake of the GitHub API endpoints the asset scripts use")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("FAKE_GITHUB_PORT", "8765")))
+    parser.add_argument("--latency", default=os.environ.get("FAKE_GITHUB_LATENCY", "fixed:0"),
+                        help="per-request latency distribution, e.g. lognormal:0.05:0.5")
+    parser.add_argument("--check-polls", type=int, default=0,
+                        help="check-run polls that report in_progress before succeeding")
+    args = parser.parse_args()
+
+    server, _, url = start_fake_github(args.port, latency=args.latency, check_polls=args.check_polls)
+    print(f"🧪 Fake GitHub API listening on {url} (export GITHUB_API_URL={url})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 import os
-import requests
-import json
+from github_graphql import PRStatusClient
 
 def find_latest_asset_pr():
     """Find the latest asset generation PR."""
@@ -13,31 +12,15 @@ def find_latest_asset_pr():
         print(f"::set-output name=pr_number::{pr_number}")
         return
     
-    headers = {
-        "Authorization": f"token {github_token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-    
     try:
-        url = f"https://api.github.com/repos/{target_repo}/pulls"
-        params = {
-            "state": "open",
-            "sort": "created",
-            "direction": "desc",
-            "per_page": 10
-        }
-        
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        
-        pulls = response.json()
+        client = PRStatusClient(github_token, target_repo)
+        pr = client.find_open_pr(lambda pull: "generated-assets" in pull["headRefName"] or "AI-Generated" in pull["title"])
         
-        for pr in pulls:
-            if "generated-assets" in pr["head"]["ref"] or "AI-Generated" in pr["title"]:
-                pr_number = pr["number"]
-                print(f"Found asset generation PR: #{pr_number} - {pr['title']}")
-                print(f"::set-output name=pr_number::{pr_number}")
-                return
+        if pr:
+            pr_number = pr["number"]
+            print(f"Found asset generation PR: #{pr_number} - {pr['title']}")
+            print(f"::set-output name=pr_number::{pr_number}")
+            return
         
         print("No asset generation PR found")
         print("::set-output name=pr_number::")
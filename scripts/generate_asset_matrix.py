@@ -1,19 +1,26 @@
 import os
 import json
 import sys
+from create_animations import ANIMATION_CONFIGS
+from work_scheduler import WorkScheduler
 
 def generate_asset_matrix():
-    """Generate matrix for 5 parallel agents with specific insect assignments."""
+    """Generate a cost-balanced matrix of parallel agents from the insect catalog."""
     
     asset_type = os.environ.get("ASSET_TYPE", "all")
     quality_level = os.environ.get("QUALITY_LEVEL", "standard")
+    agent_count = int(os.environ.get("AGENT_COUNT", "5"))
     
     agent_assignments = [
         {
             "agent_id": 1,
             "insect_type": "beetle",
             "description": "Brown beetle, 32x32px, walking animation",
-            "asset_variants": ["idle", "walk_1", "walk_2", "level_2", "level_3"],
+            "asset_variants": ["idle", "walk_1", "walk_2"],
+            "derived_variants": {
+                "level_2": {"base": "idle", "colors": {"primary": "#A0522D", "secondary": "#8B5A2B"}},
+                "level_3": {"base": "idle", "colors": {"primary": "#B8860B", "secondary": "#DAA520"}}
+            },
             "animation_types": ["walking", "idle"],
             "colors": {"primary": "#8B4513", "secondary": "#654321"}
         },
@@ -29,7 +36,11 @@ def generate_asset_matrix():
             "agent_id": 3,
             "insect_type": "ladybug",
             "description": "Red and black ladybug, 32x32px, walking animation",
-            "asset_variants": ["idle", "walk_1", "walk_2", "level_2", "level_3"],
+            "asset_variants": ["idle", "walk_1", "walk_2"],
+            "derived_variants": {
+                "level_2": {"base": "idle", "colors": {"primary": "#FF2400", "secondary": "#2B1B17"}},
+                "level_3": {"base": "idle", "colors": {"primary": "#FF0000", "secondary": "#FFD700"}}
+            },
             "animation_types": ["walking", "idle"],
             "colors": {"primary": "#FF0000", "secondary": "#000000"}
         },
@@ -57,28 +68,36 @@ def generate_asset_matrix():
         elif asset_type == "ui":
             agent_assignments = [a for a in agent_assignments if a["insect_type"] == "ui_elements"]
     
-    for assignment in agent_assignments:
-        assignment["quality_level"] = quality_level
+    scheduler = WorkScheduler()
+    plan = scheduler.plan(agent_assignments, ANIMATION_CONFIGS, agent_count)
     
-    matrix = {"include": agent_assignments}
+    for unit in plan:
+        unit["quality_level"] = quality_level
+        print(f"🗓️  Agent {unit['agent_id']}: ~{unit['estimated_seconds']:.0f}s - {unit['description']}", file=sys.stderr)
+    
+    matrix = {"include": plan}
     
     matrix_string = json.dumps(matrix)
     
     if "GITHUB_OUTPUT" in os.environ:
         with open(os.environ["GITHUB_OUTPUT"], "a") as f:
             f.write(f"matrix={matrix_string}\n")
-            f.write(f"total-agents={len(agent_assignments)}\n")
+            f.write(f"total-agents={len(plan)}\n")
     else:
         print(f"matrix={matrix_string}")
-        print(f"total-agents={len(agent_assignments)}")
+        print(f"total-agents={len(plan)}")
     
     os.makedirs("temp_assets/config", exist_ok=True)
     with open("temp_assets/config/generation_config.json", "w") as f:
         json.dump({
             "asset_type": asset_type,
             "quality_level": quality_level,
-            "agent_count": len(agent_assignments),
-            "total_variants": sum(len(a["asset_variants"]) for a in agent_assignments)
+            "agent_count": len(plan),
+            "learned_variant_costs": len(scheduler.cost_table),
+            "estimated_makespan_seconds": max((unit["estimated_seconds"] for unit in plan), default=0),
+            "agent_estimates": {unit["agent_id"]: unit["estimated_seconds"] for unit in plan},
+            "total_variants": sum(len(a["asset_variants"]) + len(a.get("derived_variants", {})) for a in agent_assignments),
+            "inference_variants": sum(len(a["asset_variants"]) for a in agent_assignments)
         }, f, indent=2)
 
 if __name__ == "__main__":
@@ -2,10 +2,23 @@ import os
 import json
 import sys
 import time
-from typing import Dict, List, Any
+import random
+import threading
+from typing import Dict, List, Any, Tuple
 import torch
+import numpy as np
 from PIL import Image, ImageDraw
 import io
+from palette_remap import remap_palette
+from backend_executor import BackendExecutor
+from candidate_scoring import score_candidates
+from early_exit import EarlyExitMonitor
+from embedding_cache import PromptEmbeddingCache
+from latent_decoder import LatentDecoder, DECODERS, TINY_DECODER_ID, choose_decoder
+from generation_journal import GenerationJournal, file_sha256, save_image_atomic
+from shared_weights import load_shared_pipeline, process_memory
+from sprite_engine import ProceduralSpriteEngine, target_size_for
+from stub_backend import StubBackend
 
 try:
     from diffusers import StableDiffusionPipeline
@@ -14,30 +27,101 @@ except ImportError:
     DIFFUSERS_AVAILABLE = False
     print("⚠️ diffusers not available, falling back to alternative methods")
 
+# Seconds between status checks of a running Replicate prediction
+REPLICATE_POLL_INTERVAL = 1.0
+
 class BugBuddiesAssetGenerator:
     """Free AI-powered pixel art generator for Bug Buddies insects using Hugging Face Diffusers."""
     
     def __init__(self):
-        self.use_huggingface = DIFFUSERS_AVAILABLE and os.environ.get("USE_HUGGINGFACE", "true").lower() == "true"
-        self.leonardo_api_key = os.environ.get("LEONARDO_API_KEY")  # Optional
-        self.replicate_api_key = os.environ.get("REPLICATE_API_KEY")  # Optional
+        self.procedural_only = os.environ.get("PROCEDURAL_ONLY", "false").lower() == "true"
+        # Stub backends replace every real one so load runs need neither weights nor network
+        self.use_stub_backend = (not self.procedural_only
+                                 and os.environ.get("USE_STUB_BACKEND", "false").lower() == "true")
+        offline = self.procedural_only or self.use_stub_backend
+        self.use_huggingface = (DIFFUSERS_AVAILABLE and not offline
+                                and os.environ.get("USE_HUGGINGFACE", "true").lower() == "true")
+        self.leonardo_api_key = None if offline else os.environ.get("LEONARDO_API_KEY")  # Optional
+        self.replicate_api_key = None if offline else os.environ.get("REPLICATE_API_KEY")  # Optional
         
         self.agent_id = int(os.environ.get("AGENT_ID", "1"))
         self.insect_type = os.environ.get("INSECT_TYPE", "beetle")
         self.asset_variants = json.loads(os.environ.get("ASSET_VARIANTS", "[]"))
+        self.derived_variants = json.loads(os.environ.get("DERIVED_VARIANTS") or "{}") or {}
+        self.colors = json.loads(os.environ.get("ASSET_COLORS") or "{}") or {}
+        self.work_items = json.loads(os.environ.get("WORK_ITEMS") or "[]") or []
+        self.variant_timings = {}
         self.quality_level = os.environ.get("QUALITY_LEVEL", "standard")
+        self.native_resolution = os.environ.get("NATIVE_RESOLUTION", "true").lower() == "true"
+        self.render_scale = int(os.environ.get("RENDER_SCALE", "16"))
+        self.tile_grid = self.parse_tile_grid(os.environ.get("TILED_GENERATION", ""))
+        self.shared_weights = os.environ.get("SHARED_WEIGHTS", "false").lower() == "true"
+        self.output_scales = sorted({int(scale) for scale in os.environ.get("HIDPI_SCALES", "1,2,3").split(",")
+                                     if scale.strip()} - {1})
+        self.large_size = int(os.environ.get("HIDPI_LARGE_SIZE", "0") or 0)
+        self.inference_steps = 15
+        # CANDIDATE_SEARCH=K renders K low-step candidates per variant and refines only the best one
+        self.candidate_search = int(os.environ.get("CANDIDATE_SEARCH", "0") or 0)
+        self.candidate_steps = int(os.environ.get("CANDIDATE_STEPS", "4"))
+        self.candidate_reports = {}
+        # DECODER picks how latents become pixels: vae, tiny, linear, or auto per sprite size class
+        self.decoder = os.environ.get("DECODER", "vae").lower()
+        if self.decoder not in DECODERS + ("auto",):
+            print(f"⚠️  Unknown DECODER '{self.decoder}', decoding with the full VAE")
+            self.decoder = "vae"
+        self.variant_decoders = {}
+        # EARLY_EXIT stops denoising once the sprite previewed every EARLY_EXIT_INTERVAL steps holds still
+        self.early_exit = os.environ.get("EARLY_EXIT", "false").lower() == "true"
+        self.early_exit_interval = int(os.environ.get("EARLY_EXIT_INTERVAL", "2"))
+        self.early_exit_tolerance = float(os.environ.get("EARLY_EXIT_TOLERANCE", "0.01"))
+        self.early_exit_reports = {}
+        self.weights_loading = None
+        hedge_percentile = os.environ.get("HEDGE_PERCENTILE", "90")
+        self.backend_executor = BackendExecutor(
+            deadline=self.variant_deadline(float(os.environ.get("VARIANT_DEADLINE", "300"))),
+            hedge_percentile=None if hedge_percentile.lower() in ("", "off", "false", "0") else float(hedge_percentile)
+        )
+        self.variant_backends = {}
+        self.stub_backends = []
+        if self.use_stub_backend:
+            self.stub_backends = [
+                StubBackend(latency=os.environ.get("STUB_LATENCY", "fixed:0"),
+                            failure_rate=float(os.environ.get("STUB_FAILURE_RATE", "0")),
+                            seed=self.agent_id * 1000 + index)
+                for index in range(int(os.environ.get("STUB_BACKENDS", "1")))
+            ]
+        # Pause between single-variant renders, to stay under hosted API rate limits
+        self.variant_pause = float(os.environ.get("VARIANT_PAUSE", "2"))
+        # Only one diffusion call may drive the shared pipeline at a time
+        self.pipeline_lock = threading.Lock()
         
         self.output_dir = f"temp_assets/agent_{self.agent_id}"
         os.makedirs(self.output_dir, exist_ok=True)
+        # Raw renders are kept so new output sizes never need another inference pass
+        self.raw_dir = os.path.join(self.output_dir, "raw")
+        self.journal = GenerationJournal(self.output_dir)
         
         self.base_prompt_templates = self.get_prompt_templates()
+        self.sprite_engine = ProceduralSpriteEngine()
+        if self.work_items:
+            self.configure_work_item(self.work_items[0])
         
         self.pipeline = None
+        self.embedding_cache = None
+        self.latent_decoder = None
         if self.use_huggingface:
             self.init_huggingface_pipeline()
         
         print(f"🎨 Agent {self.agent_id} initialized for {self.insect_type}")
-        print(f"🔧 Generation method: {'Hugging Face Diffusers' if self.use_huggingface else 'Alternative APIs'}")
+        if self.procedural_only:
+            print("🔧 Generation method: Procedural sprite engine (no inference)")
+        elif self.use_stub_backend:
+            print(f"🔧 Generation method: {len(self.stub_backends)} stub backend(s), "
+                  f"latency {os.environ.get('STUB_LATENCY', 'fixed:0')}")
+        else:
+            print(f"🔧 Generation method: {'Hugging Face Diffusers' if self.use_huggingface else 'Alternative APIs'}")
+        if self.tile_grid:
+            print(f"🧩 Tiled generation: {self.tile_grid[0]}x{self.tile_grid[1]} sprite sheets")
     
     def init_huggingface_pipeline(self):
         """Initialize Hugging Face Stable Diffusion pipeline."""
@@ -49,21 +133,36 @@ class BugBuddiesAssetGenerator:
             device = "cuda" if torch.cuda.is_available() else "cpu"
             torch_dtype = torch.float16 if device == "cuda" else torch.float32
             
-            self.pipeline = StableDiffusionPipeline.from_pretrained(
-                model_id,
-                torch_dtype=torch_dtype,
-                use_safetensors=True,
-                safety_checker=None,  # Disable for faster generation
-                requires_safety_checker=False
-            )
+            if self.shared_weights and device == "cpu":
+                # Weights stay in the page cache and are shared by every generator process on the host
+                self.pipeline = load_shared_pipeline(model_id)
+                self.weights_loading = "mmap"
+            else:
+                if self.shared_weights:
+                    print("⚠️  SHARED_WEIGHTS only applies to CPU inference, loading a private copy")
+                self.pipeline = StableDiffusionPipeline.from_pretrained(
+                    model_id,
+                    torch_dtype=torch_dtype,
+                    use_safetensors=True,
+                    safety_checker=None,  # Disable for faster generation
+                    requires_safety_checker=False
+                )
+                self.weights_loading = "private"
             
             self.pipeline = self.pipeline.to(device)
             
+            if os.environ.get("EMBEDDING_CACHE", "true").lower() == "true":
+                # Prompts and the negative prompt repeat across variants, agents and runs
+                self.embedding_cache = PromptEmbeddingCache(self.pipeline, os.environ.get("EMBEDDING_CACHE_DIR"))
+            
+            self.latent_decoder = LatentDecoder(self.pipeline, os.environ.get("TINY_DECODER_ID", TINY_DECODER_ID))
+            
             if device == "cuda":
                 self.pipeline.enable_memory_efficient_attention()
                 self.pipeline.enable_xformers_memory_efficient_attention()
             
-            print(f"✅ Pipeline loaded on {device}")
+            print(f"✅ Pipeline loaded on {device} ({self.weights_loading} weights, "
+                  f"RSS {process_memory().get('rss_mb', 'n/a')} MB)")
             
         except Exception as e:
             print(f"❌ Failed to initialize Hugging Face pipeline: {e}")
@@ -115,73 +214,413 @@ class BugBuddiesAssetGenerator:
         }
         return templates.get(self.insect_type, templates["beetle"])
     
+    def generate_prompt(self, variant: str) -> str:
+        """Build the full prompt for a variant, including the quality level suffix."""
+        prompt = self.base_prompt_templates.get(variant, self.base_prompt_templates["base"])
+        
+        if self.quality_level == "high":
+            prompt += ", highly detailed pixel art, professional game sprite quality, sharp pixels"
+        elif self.quality_level == "draft":
+            prompt += ", simple pixel art, basic game sprite"
+        else:
+            prompt += ", clean pixel art, game ready sprite"
+        
+        return prompt
+    
+    def has_ai_backend(self) -> bool:
+        """Check whether any diffusion backend is configured."""
+        return bool((self.use_huggingface and self.pipeline) or self.leonardo_api_key or self.replicate_api_key
+                    or self.stub_backends)
+    
+    def variant_deadline(self, deadline: float) -> float:
+        """Stretch the per-variant deadline by the extra denoising steps candidate search runs."""
+        if self.candidate_search <= 1:
+            return deadline
+        search_steps = self.candidate_search * self.candidate_steps
+        return deadline * (self.inference_steps + search_steps) / self.inference_steps
+    
+    def get_backends(self, prompt: str, width: int, height: int, variant: str = None, decoder: str = "vae",
+                     monitor: EarlyExitMonitor = None) -> List[Tuple[str, Any]]:
+        """List the configured diffusion backends in priority order; a variant enables candidate search."""
+        backends = []
+        if self.use_huggingface and self.pipeline:
+            backends.append(("huggingface", lambda cancel_event, timeout:
+                             self.generate_with_huggingface(prompt, width, height, cancel_event=cancel_event,
+                                                            variant=variant, decoder=decoder, monitor=monitor)))
+        if self.leonardo_api_key:
+            backends.append(("leonardo", lambda cancel_event, timeout:
+                             self.generate_with_leonardo(prompt, width, height, timeout=timeout)))
+        if self.replicate_api_key:
+            backends.append(("replicate", lambda cancel_event, timeout:
+                             self.generate_with_replicate(prompt, width, height, timeout=timeout,
+                                                          cancel_event=cancel_event)))
+        for index, stub in enumerate(self.stub_backends):
+            backends.append((f"stub_{index + 1}", lambda cancel_event, timeout, stub=stub:
+                             stub.generate(prompt, width, height, cancel_event, timeout)))
+        return backends
+    
+    def render_with_backends(self, prompt: str, width: int, height: int, variant: str,
+                             search_candidates: bool = True, cell_size: Tuple[int, int] = None) -> Image.Image:
+        """Render an image within the variant deadline, hedging slow backends, with a programmatic fallback.
+        
+        cell_size is the part of the render one sprite occupies, for sprite sheets.
+        """
+        cell_size = cell_size or (width, height)
+        decoder = self.decoder_for(variant, cell_size)
+        monitor = self.early_exit_monitor(variant, (width // cell_size[0], height // cell_size[1]))
+        backends = self.get_backends(prompt, width, height, variant if search_candidates else None, decoder, monitor)
+        image, backend = self.backend_executor.run(backends)
+        if image is None:
+            image, backend = self.generate_programmatic_fallback(variant), "programmatic"
+        self.variant_backends[f"{self.insect_type}_{variant}"] = backend
+        if backend == "huggingface":
+            self.variant_decoders[f"{self.insect_type}_{variant}"] = self.latent_decoder.resolve(decoder)
+            if monitor:
+                report = monitor.report()
+                self.early_exit_reports[f"{self.insect_type}_{variant}"] = report
+                print(f"⏩ {variant}: {report['steps_run']}/{report['steps']} denoising steps "
+                      f"({report['steps_saved']} saved)")
+        return image
+    
+    def is_fallback_render(self, variant: str) -> bool:
+        """Whether a variant's render came from the programmatic fallback although AI backends are configured."""
+        return self.has_ai_backend() and self.variant_backends.get(f"{self.insect_type}_{variant}") == "programmatic"
+    
+    def decoder_for(self, variant: str, cell_size: Tuple[int, int]) -> str:
+        """Pick the latent decoder for a variant's size class; the large sprite is cut from the same render."""
+        sprite_size = max(max(self.get_target_size(variant)), self.large_size)
+        return choose_decoder(self.decoder, sprite_size, min(cell_size) // 8)
+    
+    def early_exit_monitor(self, variant: str, grid: Tuple[int, int]) -> EarlyExitMonitor:
+        """Build the convergence check of one render, previewing every cell of a grid at sprite size."""
+        if not (self.early_exit and self.use_huggingface):
+            return None
+        width, height = self.get_target_size(variant)
+        if self.large_size:
+            # The large sprite is cut from the same render, so it must have settled too
+            width, height = max(width, self.large_size), max(height, self.large_size)
+        return EarlyExitMonitor((width * grid[0], height * grid[1]), self.inference_steps,
+                                self.early_exit_interval, self.early_exit_tolerance)
+    
     def generate_single_asset(self, variant: str) -> bool:
         """Generate a single asset variant using free AI methods."""
         try:
-            prompt = self.base_prompt_templates.get(variant, self.base_prompt_templates["base"])
-            
-            if self.quality_level == "high":
-                prompt += ", highly detailed pixel art, professional game sprite quality, sharp pixels"
-            elif self.quality_level == "draft":
-                prompt += ", simple pixel art, basic game sprite"
-            else:
-                prompt += ", clean pixel art, game ready sprite"
+            prompt = self.generate_prompt(variant)
             
             print(f"🎨 Agent {self.agent_id}: Generating {self.insect_type} - {variant}")
             print(f"📝 Prompt: {prompt[:100]}...")
             
-            original_image = None
+            width, height = self.get_generation_size(variant)
+            print(f"📐 Render size: {width}x{height} for {self.get_target_size(variant)[0]}px sprite")
             
-            if self.use_huggingface and self.pipeline:
-                original_image = self.generate_with_huggingface(prompt)
-            elif self.leonardo_api_key:
-                original_image = self.generate_with_leonardo(prompt)
-            elif self.replicate_api_key:
-                original_image = self.generate_with_replicate(prompt)
-            else:
-                original_image = self.generate_programmatic_fallback(variant)
+            original_image = self.render_with_backends(prompt, width, height, variant)
             
             if original_image is None:
                 print(f"❌ All generation methods failed for {variant}")
                 return False
             
+            return self.save_processed_asset(original_image, variant)
+            
+        except Exception as e:
+            print(f"❌ Agent {self.agent_id}: Failed to generate {variant}: {e}")
+            return False
+    
+    def save_processed_asset(self, original_image: Image.Image, variant: str) -> bool:
+        """Convert a raw render to pixel art and write it, with its HiDPI sizes, to the agent output directory."""
+        # A fallback only stands in for a failed render; journaling it would make resumed runs skip inference
+        journal = not self.is_fallback_render(variant)
+        if original_image.mode == 'RGBA' and original_image.size == self.get_target_size(variant):
+            # Procedural sprites are drawn at target size and need no quantize/downscale pass
+            processed_image = original_image
+            raw_image = None
+        else:
+            self.save_raw_render(original_image, variant, journal)
             processed_image = self.process_to_pixel_art(original_image, variant)
+            raw_image = original_image
+        
+        output_path = self.sprite_path(variant)
+        save_image_atomic(processed_image, output_path)
+        self.save_scaled_outputs(processed_image, variant, raw_image)
+        if journal:
+            self.journal.record(self.insect_type, variant, output_path, self.variant_spec(variant))
+        else:
+            print(f"⚠️  {variant} used the programmatic fallback; it will be rendered again on the next run")
+        
+        print(f"✅ Agent {self.agent_id}: Generated {variant} -> {output_path}")
+        return True
+    
+    def sprite_path(self, variant: str, suffix: str = "") -> str:
+        """Get the output path of a sprite, e.g. suffix '@2x' for a scaled copy."""
+        return os.path.join(self.output_dir, f"{self.insect_type}_{variant}{suffix}.png")
+    
+    def save_raw_render(self, image: Image.Image, variant: str, journal: bool = True):
+        """Cache the full-size render and journal it so later runs can re-derive outputs without inference."""
+        os.makedirs(self.raw_dir, exist_ok=True)
+        raw_path = os.path.join(self.raw_dir, f"{self.insect_type}_{variant}.png")
+        save_image_atomic(image.convert("RGB") if image.mode not in ("RGB", "RGBA") else image, raw_path)
+        if journal:
+            self.journal.record(self.insect_type, f"{variant}@raw", raw_path, self.raw_spec(variant))
+    
+    def save_scaled_outputs(self, sprite: Image.Image, variant: str, raw_image: Image.Image = None):
+        """Write integer-scaled copies and the optional large re-quantized sprite of a variant.
+        
+        Scaled copies repeat each pixel so they stay crisp; the large sprite is
+        re-quantized from the raw render (or redrawn by the procedural engine)
+        to add real detail instead of bigger pixels.
+        """
+        width, height = sprite.size
+        suffixes = [f"@{scale}x" for scale in self.output_scales] + ([f"@{self.large_size}px"] if self.large_size else [])
+        # Sizes dropped from the configuration must not linger for the aggregator
+        prefix = f"{self.insect_type}_{variant}@"
+        for file in os.listdir(self.output_dir):
+            if file.startswith(prefix) and file.endswith(".png") and file[len(prefix) - 1:-len(".png")] not in suffixes:
+                os.remove(os.path.join(self.output_dir, file))
+        
+        for scale in self.output_scales:
+            scaled = sprite.resize((width * scale, height * scale), Image.Resampling.NEAREST)
+            save_image_atomic(scaled, self.sprite_path(variant, f"@{scale}x"))
+        
+        if self.large_size:
+            size = (self.large_size, self.large_size)
+            if raw_image is not None:
+                large = self.process_to_pixel_art(raw_image, variant, size)
+            else:
+                large = self.sprite_engine.render(self.insect_type, variant, size)
+            save_image_atomic(large, self.sprite_path(variant, f"@{self.large_size}px"))
+    
+    def reprocess_from_raw(self, variants: List[str]) -> List[str]:
+        """Rebuild sprites from cached raw renders whose prompt and render settings are unchanged."""
+        reprocessed = []
+        for variant in variants:
+            entry = self.journal.completed_entry(self.insect_type, f"{variant}@raw", self.raw_spec(variant))
+            if entry is None:
+                continue
+            try:
+                with Image.open(entry["output"]) as raw_image:
+                    raw_image.load()
+                    if self.save_processed_asset(raw_image, variant):
+                        reprocessed.append(variant)
+            except Exception as e:
+                print(f"⚠️  Agent {self.agent_id}: Could not reprocess {variant} from raw render: {e}")
+        return reprocessed
+    
+    def parse_tile_grid(self, value: str) -> Tuple[int, int]:
+        """Parse a TILED_GENERATION value such as '2x2' into (columns, rows)."""
+        if not value or value.lower() in ("false", "off", "0"):
+            return None
+        try:
+            columns, rows = (int(part) for part in value.lower().split("x"))
+        except ValueError:
+            print(f"⚠️  Invalid TILED_GENERATION value '{value}', tiled mode disabled")
+            return None
+        if columns < 1 or rows < 1 or columns * rows < 2:
+            return None
+        return (columns, rows)
+    
+    def get_sheet_size(self, variant: str) -> Tuple[int, int]:
+        """Get the render size of a sprite sheet whose cells each hold one variant."""
+        columns, rows = self.tile_grid
+        cell_width, cell_height = self.get_generation_size(variant)
+        # One render stays within the 512px budget; cells are cut on an 8px grid
+        cell_width = min(cell_width, 512 // columns) // 8 * 8
+        cell_height = min(cell_height, 512 // rows) // 8 * 8
+        return (cell_width * columns, cell_height * rows)
+    
+    def generate_sheet_prompt(self, variants: List[str]) -> str:
+        """Build a sprite sheet prompt that lists one pose per grid cell."""
+        columns, rows = self.tile_grid
+        poses = ", ".join(f"cell {index + 1}: {variant.replace('_', ' ')}" for index, variant in enumerate(variants))
+        return (
+            f"sprite sheet, {columns}x{rows} grid of {len(variants)} separate sprites of the same character, "
+            f"evenly spaced, each centered in its own cell on a plain white background, consistent style, "
+            f"{self.generate_prompt('base')}, poses in reading order: {poses}"
+        )
+    
+    def generate_tiled_assets(self, variants: List[str]) -> Dict[str, bool]:
+        """Generate several variants from one sprite sheet render and slice it into cells."""
+        columns, rows = self.tile_grid
+        cells_per_sheet = columns * rows
+        results = {}
+        
+        # Cells of one sheet share a render size, so group by target size class first
+        size_groups = {}
+        for variant in variants:
+            size_groups.setdefault(self.get_target_size(variant), []).append(variant)
+        
+        for group in size_groups.values():
+            for start in range(0, len(group), cells_per_sheet):
+                sheet_variants = group[start:start + cells_per_sheet]
+                
+                if len(sheet_variants) == 1:
+                    results[sheet_variants[0]] = self.generate_single_asset(sheet_variants[0])
+                    continue
+                
+                results.update(self.generate_sprite_sheet(sheet_variants))
+                time.sleep(2)
+        
+        return results
+    
+    def generate_sprite_sheet(self, variants: List[str]) -> Dict[str, bool]:
+        """Render one sprite sheet and map its cells back to variant names."""
+        columns, rows = self.tile_grid
+        try:
+            prompt = self.generate_sheet_prompt(variants)
+            width, height = self.get_sheet_size(variants[0])
             
-            output_path = os.path.join(self.output_dir, f"{self.insect_type}_{variant}.png")
-            processed_image.save(output_path, "PNG")
+            print(f"🧩 Agent {self.agent_id}: Generating {columns}x{rows} sheet for {self.insect_type} - {variants}")
+            print(f"📐 Sheet size: {width}x{height}")
             
-            print(f"✅ Agent {self.agent_id}: Generated {variant} -> {output_path}")
-            return True
+            # A sheet holds several sprites, so its candidates cannot be scored as one
+            sheet = self.render_with_backends(prompt, width, height, variants[0], search_candidates=False,
+                                              cell_size=(width // columns, height // rows))
+            if sheet is None:
+                print(f"❌ Sheet generation failed for {variants}")
+                return {variant: False for variant in variants}
+            
+            cell_width, cell_height = sheet.size[0] // columns, sheet.size[1] // rows
+            # Every cell comes from the same render, whichever backend produced it
+            backend = self.variant_backends[f"{self.insect_type}_{variants[0]}"]
+            self.variant_backends.update({f"{self.insect_type}_{variant}": backend for variant in variants})
+            if self.is_fallback_render(variants[0]):
+                # The fallback is one sprite, not a sheet; draw each cell's own variant instead of cropping it
+                print(f"🎨 Agent {self.agent_id}: Sheet fell back, rendering {variants} procedurally")
+                return {variant: self.save_processed_asset(
+                            self.generate_programmatic_sprite(self.insect_type, variant), variant)
+                        for variant in variants}
+
+            results = {}
+            for index, variant in enumerate(variants):
+                column, row = index % columns, index // columns
+                box = (column * cell_width, row * cell_height, (column + 1) * cell_width, (row + 1) * cell_height)
+                try:
+                    results[variant] = self.save_processed_asset(sheet.crop(box), variant)
+                except Exception as e:
+                    print(f"❌ Agent {self.agent_id}: Failed to process cell {index + 1} ({variant}): {e}")
+                    results[variant] = False
+            
+            return results
             
         except Exception as e:
-            print(f"❌ Agent {self.agent_id}: Failed to generate {variant}: {e}")
-            return False
+            print(f"❌ Agent {self.agent_id}: Failed to generate sheet {variants}: {e}")
+            return {variant: False for variant in variants}
     
-    def generate_with_huggingface(self, prompt: str) -> Image.Image:
+    def generate_with_huggingface(self, prompt: str, width: int = 512, height: int = 512,
+                                  cancel_event: threading.Event = None, variant: str = None,
+                                  decoder: str = "vae", monitor: EarlyExitMonitor = None) -> Image.Image:
         """Generate image using Hugging Face Diffusers (completely free)."""
         try:
-            print("🤖 Generating with Hugging Face Diffusers...")
-            
-            negative_prompt = "blurry, low quality, distorted, realistic, photographic, 3d render, smooth, antialiased"
+            print(f"🤖 Generating with Hugging Face Diffusers ({decoder} decoder)...")
             
-            with torch.no_grad():
-                result = self.pipeline(
-                    prompt=prompt,
-                    negative_prompt=negative_prompt,
-                    num_inference_steps=15,  # Reduced for faster generation (was 25)
-                    guidance_scale=6.0,      # Slightly reduced for speed
-                    width=512,
-                    height=512,
-                    num_images_per_prompt=1
-                )
+            if variant and self.candidate_search > 1:
+                return self.search_candidates(prompt, width, height, variant, cancel_event, decoder, monitor)
             
-            return result.images[0]
+            images = self.run_diffusion(prompt, width, height, self.inference_steps, cancel_event=cancel_event,
+                                        decoder=decoder, monitor=monitor)
+            return images[0] if images else None
             
         except Exception as e:
             print(f"❌ Hugging Face generation failed: {e}")
             return None
     
-    def generate_with_leonardo(self, prompt: str) -> Image.Image:
+    def run_diffusion(self, prompt: str, width: int, height: int, steps: int, seeds: List[int] = None,
+                      cancel_event: threading.Event = None, decoder: str = "vae",
+                      monitor: EarlyExitMonitor = None) -> List[Image.Image]:
+        """Run the local pipeline once; one image per seed (or a single unseeded image), None if cancelled.
+        
+        The pipeline stops at latents so the chosen decoder turns them into pixels; the
+        linear decoder yields one pixel per latent cell (an eighth of the render size).
+        A monitor ends denoising early once the sprite it previews has converged; it
+        watches the scheduler's predicted clean latents (x0), and those are what get
+        decoded, since the latents of an interrupted step still carry that step's noise.
+        """
+        negative_prompt = "blurry, low quality, distorted, realistic, photographic, 3d render, smooth, antialiased"
+        scheduler = self.pipeline.scheduler
+        predicted = {}
+        
+        def step_recording_prediction(*args, **kwargs):
+            output = type(scheduler).step(scheduler, *args, **kwargs)
+            # return_dict=False gives (prev_sample, pred_original_sample); multistep solvers omit the prediction
+            if isinstance(output, tuple):
+                predicted["x0"] = output[1] if len(output) > 1 else None
+            else:
+                predicted["x0"] = getattr(output, "pred_original_sample", None)
+            return output
+        
+        def on_step_end(pipe, step, timestep, callback_kwargs):
+            x0 = predicted.get("x0")
+            callback_kwargs["pred_original_sample"] = x0 if x0 is not None else callback_kwargs["latents"]
+            # Another backend won the race or the deadline passed; stop denoising
+            if cancel_event is not None and cancel_event.is_set():
+                pipe._interrupt = True
+            # The remaining steps would only refine detail the sprite's pixels cannot show
+            elif monitor is not None and monitor.check(step, callback_kwargs["pred_original_sample"]):
+                predicted["stopped"] = callback_kwargs["pred_original_sample"]
+                pipe._interrupt = True
+            return callback_kwargs
+        
+        # One generator per image pins each candidate's starting latents to its seed
+        generators = [torch.Generator("cpu").manual_seed(seed) for seed in seeds] if seeds else None
+        
+        with self.pipeline_lock, torch.no_grad():
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            if self.embedding_cache:
+                text_inputs = {"prompt_embeds": self.embedding_cache.get(prompt),
+                               "negative_prompt_embeds": self.embedding_cache.get(negative_prompt)}
+            else:
+                text_inputs = {"prompt": prompt, "negative_prompt": negative_prompt}
+            # Shadow the scheduler's step for this call to see each step's predicted x0
+            scheduler.step = step_recording_prediction
+            try:
+                result = self.pipeline(
+                    **text_inputs,
+                    num_inference_steps=steps,
+                    guidance_scale=6.0,      # Slightly reduced for speed
+                    width=width,
+                    height=height,
+                    num_images_per_prompt=len(seeds) if seeds else 1,
+                    generator=generators,
+                    output_type="latent",
+                    callback_on_step_end=on_step_end
+                )
+            finally:
+                del scheduler.step
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            return self.latent_decoder.decode(predicted.get("stopped", result.images), decoder)
+    
+    def search_candidates(self, prompt: str, width: int, height: int, variant: str,
+                          cancel_event: threading.Event = None, decoder: str = "vae",
+                          monitor: EarlyExitMonitor = None) -> Image.Image:
+        """Render low-step candidates in one batch, score their pixel-art output and refine the best seed."""
+        start_time = time.time()
+        seeds = [random.randrange(2 ** 31) for _ in range(self.candidate_search)]
+        candidates = self.run_diffusion(prompt, width, height, self.candidate_steps, seeds, cancel_event, decoder)
+        if not candidates:
+            return None
+        search_seconds = time.time() - start_time
+        
+        sprites = np.stack([np.array(self.process_to_pixel_art(candidate, variant), dtype=np.uint8)
+                            for candidate in candidates])
+        metrics = score_candidates(sprites, self.colors)
+        best = int(metrics["score"].argmax())
+        print(f"🔎 Picked candidate {best + 1}/{len(seeds)} for {variant} "
+              f"(score {metrics['score'][best]:.3f}, {self.candidate_steps} steps each)")
+        
+        # The same seed at full steps keeps the winning composition and sharpens it
+        refined = self.run_diffusion(prompt, width, height, self.inference_steps, [seeds[best]], cancel_event, decoder,
+                                     monitor)
+        self.candidate_reports[f"{self.insect_type}_{variant}"] = {
+            "seeds": seeds,
+            "winner": best,
+            "scores": {name: [round(float(value), 4) for value in values] for name, values in metrics.items()},
+            "search_seconds": round(search_seconds, 3),
+            "refine_seconds": round(time.time() - start_time - search_seconds, 3)
+        }
+        return refined[0] if refined else None
+    
+    def generate_with_leonardo(self, prompt: str, width: int = 512, height: int = 512,
+                               timeout: float = None) -> Image.Image:
         """Generate image using Leonardo.AI (150 free credits/day)."""
         try:
             print("🎨 Generating with Leonardo.AI...")
@@ -198,11 +637,12 @@ class BugBuddiesAssetGenerator:
                     'prompt': prompt,
                     'modelId': '6bef9f1b-29cb-40c7-b9df-32b51c1f67d3',  # Pixel Art model
                     'num_images': 1,
-                    'width': 512,
-                    'height': 512,
+                    'width': width,
+                    'height': height,
                     'guidance_scale': 7,
                     'num_inference_steps': 25
-                }
+                },
+                timeout=timeout
             )
             
             if response.status_code != 200:
@@ -212,7 +652,7 @@ class BugBuddiesAssetGenerator:
             result = response.json()
             image_url = result['sdGenerationJob']['generatedImages'][0]['url']
             
-            img_response = requests.get(image_url)
+            img_response = requests.get(image_url, timeout=timeout)
             if img_response.status_code == 200:
                 return Image.open(io.BytesIO(img_response.content))
             
@@ -222,28 +662,46 @@ class BugBuddiesAssetGenerator:
             print(f"❌ Leonardo generation failed: {e}")
             return None
     
-    def generate_with_replicate(self, prompt: str) -> Image.Image:
-        """Generate image using Replicate API (low cost ~$0.01-0.05/image)."""
+    def generate_with_replicate(self, prompt: str, width: int = 512, height: int = 512,
+                                timeout: float = None, cancel_event: threading.Event = None) -> Image.Image:
+        """Generate image using Replicate API (low cost ~$0.01-0.05/image).
+        
+        The prediction is polled rather than awaited, so a cancel or the timeout
+        cancels it on Replicate's side instead of leaving it billing in the background.
+        """
+        prediction = None
         try:
             print("🔥 Generating with Replicate...")
             
             import replicate
             
-            output = replicate.run(
-                "stability-ai/stable-diffusion:27b93a2413e7f36cd83da926f3656280b2931564ff050bf9575f1fdf9bcd7478",
+            client = replicate.Client(api_token=self.replicate_api_key)
+            deadline_at = time.time() + timeout if timeout is not None else None
+            prediction = client.predictions.create(
+                version="27b93a2413e7f36cd83da926f3656280b2931564ff050bf9575f1fdf9bcd7478",
                 input={
                     "prompt": prompt,
-                    "width": 512,
-                    "height": 512,
+                    "width": width,
+                    "height": height,
                     "num_inference_steps": 25,
                     "guidance_scale": 7.5,
                     "num_outputs": 1
                 }
             )
+            while prediction.status not in ("succeeded", "failed", "canceled"):
+                if cancel_event is not None and cancel_event.is_set():
+                    return None
+                if deadline_at is not None and time.time() >= deadline_at:
+                    print(f"⏰ Replicate prediction exceeded {timeout:.0f}s")
+                    return None
+                time.sleep(REPLICATE_POLL_INTERVAL)
+                prediction.reload()
             
+            output = prediction.output if prediction.status == "succeeded" else None
             if output and len(output) > 0:
                 import requests
-                img_response = requests.get(output[0])
+                remaining = max(1.0, deadline_at - time.time()) if deadline_at is not None else None
+                img_response = requests.get(output[0], timeout=remaining)
                 if img_response.status_code == 200:
                     return Image.open(io.BytesIO(img_response.content))
             
@@ -252,55 +710,69 @@ class BugBuddiesAssetGenerator:
         except Exception as e:
             print(f"❌ Replicate generation failed: {e}")
             return None
+        
+        finally:
+            if prediction is not None and prediction.status not in ("succeeded", "failed", "canceled"):
+                try:
+                    prediction.cancel()
+                except Exception as e:
+                    print(f"⚠️  Could not cancel Replicate prediction: {e}")
     
     def generate_programmatic_fallback(self, variant: str) -> Image.Image:
         """Generate a simple programmatic sprite as fallback."""
         try:
             print("🎮 Using programmatic fallback generation...")
-            
-            image = Image.new('RGBA', (512, 512), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(image)
-            
-            if self.insect_type == "beetle":
-                draw.ellipse([200, 220, 312, 292], fill=(139, 69, 19, 255))
-                draw.ellipse([230, 180, 282, 220], fill=(101, 67, 33, 255))
-            elif self.insect_type == "butterfly":
-                draw.ellipse([180, 200, 240, 260], fill=(255, 192, 203, 255))  # Left wing
-                draw.ellipse([272, 200, 332, 260], fill=(255, 192, 203, 255))  # Right wing
-                draw.ellipse([248, 220, 264, 280], fill=(139, 69, 19, 255))
-            elif self.insect_type == "ladybug":
-                draw.ellipse([200, 220, 312, 292], fill=(255, 0, 0, 255))
-                draw.ellipse([220, 235, 235, 250], fill=(0, 0, 0, 255))
-                draw.ellipse([277, 235, 292, 250], fill=(0, 0, 0, 255))
-                draw.ellipse([230, 180, 282, 220], fill=(0, 0, 0, 255))
-            elif self.insect_type == "caterpillar":
-                for i in range(5):
-                    x = 200 + i * 20
-                    draw.ellipse([x, 230, x + 25, 255], fill=(34, 139, 34, 255))
-            else:  # ui_elements
-                draw.ellipse([230, 230, 282, 282], fill=(255, 215, 0, 255))
-            
-            return image
+            return self.generate_programmatic_sprite(self.insect_type, variant)
             
         except Exception as e:
             print(f"❌ Programmatic fallback failed: {e}")
             return None
     
-    def process_to_pixel_art(self, image: Image.Image, variant: str) -> Image.Image:
+    def generate_programmatic_sprite(self, insect_type: str, variant: str) -> Image.Image:
+        """Render a variant with the procedural sprite engine directly at its target size."""
+        return self.sprite_engine.render(insect_type, variant, self.get_target_size(variant))
+    
+    def generate_procedural_variants(self, variants: List[str]) -> Dict[str, bool]:
+        """Render a whole variant set with the procedural engine in one call."""
+        results = {}
+        try:
+            sprites = self.sprite_engine.render_variants(self.insect_type, variants)
+        except Exception as e:
+            print(f"❌ Agent {self.agent_id}: Procedural rendering failed: {e}")
+            return {variant: False for variant in variants}
+        
+        for variant, image in sprites.items():
+            try:
+                results[variant] = self.save_processed_asset(image, variant)
+            except Exception as e:
+                print(f"❌ Agent {self.agent_id}: Failed to save {variant}: {e}")
+                results[variant] = False
+        
+        return results
+    
+    def get_target_size(self, variant: str) -> Tuple[int, int]:
+        """Get the final sprite size for a variant."""
+        return target_size_for(variant)
+    
+    def get_generation_size(self, variant: str) -> Tuple[int, int]:
+        """Get the diffusion render size for a variant, derived from its target size class."""
+        if not self.native_resolution:
+            return (512, 512)
+        
+        target_size = self.get_target_size(variant)
+        # Keep renders on the 64px grid SD latents prefer, never below 256px
+        return tuple(max(256, min(512, (side * self.render_scale) // 64 * 64)) for side in target_size)
+    
+    def process_to_pixel_art(self, image: Image.Image, variant: str, target_size: Tuple[int, int] = None) -> Image.Image:
         """Process the generated image to proper 32x32 pixel art with transparency."""
         
-        if "food" in variant or "heart" in variant or "star" in variant:
-            target_size = (16, 16)
-        elif "sparkle" in variant:
-            target_size = (24, 24)
-        else:
-            target_size = (32, 32)
+        target_size = target_size or self.get_target_size(variant)
         
         if image.mode != 'RGBA':
             image = image.convert('RGBA')
         
         temp_size = (target_size[0] * 4, target_size[1] * 4)
-        image = image.resize(temp_size, Image.Resampling.LANCZOS)
+        image = self.downscale(image, temp_size)
         
         if image.mode == 'RGBA':
             rgb_image = Image.new('RGB', image.size, (255, 255, 255))
@@ -322,6 +794,15 @@ class BugBuddiesAssetGenerator:
         
         return image
     
+    def downscale(self, image: Image.Image, size: Tuple[int, int]) -> Image.Image:
+        """Downscale with an exact box reduction when the render is an integer multiple of the size."""
+        width, height = image.size
+        if width % size[0] == 0 and height % size[1] == 0 and width // size[0] == height // size[1]:
+            factor = width // size[0]
+            # Box averaging over whole cells avoids the LANCZOS ringing that blurs sprite edges
+            return image.reduce(factor) if factor > 1 else image
+        return image.resize(size, Image.Resampling.LANCZOS)
+    
     def make_background_transparent(self, image: Image.Image) -> Image.Image:
         """Make the background transparent by removing similar colors to corners."""
         data = image.getdata()
@@ -354,35 +835,235 @@ class BugBuddiesAssetGenerator:
         image.putdata(new_data)
         return image
     
-    def generate_all_variants(self) -> Dict[str, Any]:
-        """Generate all asset variants for this agent."""
+    def generate_derived_variant(self, variant: str, spec: Dict[str, Any]) -> bool:
+        """Derive a variant from an already generated base sprite by palette remapping."""
+        try:
+            base_variant = spec.get("base", "idle")
+            base_path = os.path.join(self.output_dir, f"{self.insect_type}_{base_variant}.png")
+            if not os.path.exists(base_path):
+                print(f"❌ Agent {self.agent_id}: Base sprite {base_variant} missing for derived {variant}")
+                return False
+            
+            with Image.open(base_path) as base_image:
+                derived_image = remap_palette(base_image, self.colors, spec["colors"])
+            
+            output_path = self.sprite_path(variant)
+            save_image_atomic(derived_image, output_path)
+            self.save_scaled_outputs(derived_image, variant)
+            # The base's large sprite carries detail the 1x sprite lacks, so recolor it directly
+            if self.large_size:
+                large_suffix = f"@{self.large_size}px"
+                with Image.open(self.sprite_path(base_variant, large_suffix)) as base_large:
+                    save_image_atomic(remap_palette(base_large, self.colors, spec["colors"]),
+                                      self.sprite_path(variant, large_suffix))
+            self.journal.record(self.insect_type, variant, output_path, self.derived_variant_spec(variant, spec))
+            
+            print(f"🎨 Agent {self.agent_id}: Derived {variant} from {base_variant} -> {output_path}")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Agent {self.agent_id}: Failed to derive {variant}: {e}")
+            return False
+    
+    def get_generation_method(self) -> str:
+        """Name the strategy generate_base_variants will use on this agent."""
+        if not self.has_ai_backend():
+            return "procedural"
+        method = "tiled" if self.tile_grid else "single"
+        # Synthetic renders must never satisfy a later real run's journal entries
+        return f"stub_{method}" if self.use_stub_backend else method
+    
+    def variant_spec(self, variant: str) -> Dict[str, Any]:
+        """Describe everything an inference variant's output depends on, for the resume journal."""
+        return {
+            **self.raw_spec(variant),
+            "target_size": list(self.get_target_size(variant)),
+            "colors": self.colors,
+            "output_scales": self.output_scales,
+            "large_size": self.large_size
+        }
+    
+    def raw_spec(self, variant: str) -> Dict[str, Any]:
+        """Describe what a raw render depends on; post-processing settings are deliberately excluded."""
+        spec = {
+            "prompt": self.generate_prompt(variant),
+            "render_size": list(self.get_generation_size(variant)),
+            "generation_method": self.get_generation_method()
+        }
+        # Cheaper decoders produce different (lower resolution) raw renders; VAE entries stay valid
+        if self.use_huggingface and self.decoder != "vae":
+            spec["decoder"] = self.decoder
+        if self.use_huggingface and self.early_exit:
+            spec["early_exit"] = {"interval": self.early_exit_interval, "tolerance": self.early_exit_tolerance}
+        return spec
+    
+    def derived_variant_spec(self, variant: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Describe a derived variant's inputs; a regenerated base changes its hash and forces a redo."""
+        base_variant = spec.get("base", "idle")
+        base_path = os.path.join(self.output_dir, f"{self.insect_type}_{base_variant}.png")
+        return {
+            "base": base_variant,
+            "base_sha256": file_sha256(base_path) if os.path.exists(base_path) else None,
+            "source_colors": self.colors,
+            "colors": spec.get("colors", {}),
+            "output_scales": self.output_scales,
+            "large_size": self.large_size
+        }
+    
+    def is_variant_complete(self, variant: str, spec: Dict[str, Any] = None) -> bool:
+        """Check the journal for a finished, unchanged output of a variant."""
+        current_spec = self.derived_variant_spec(variant, spec) if spec is not None else self.variant_spec(variant)
+        return self.journal.completed_entry(self.insect_type, variant, current_spec) is not None
+    
+    def generate_base_variants(self, variants: List[str]) -> Dict[str, bool]:
+        """Generate inference variants with the cheapest strategy available to this agent."""
+        if not self.has_ai_backend() or self.tile_grid:
+            start_time = time.time()
+            if not self.has_ai_backend():
+                outcomes = self.generate_procedural_variants(variants)
+            else:
+                outcomes = self.generate_tiled_assets(variants)
+            # Batched strategies share their renders, so the cost is split evenly
+            per_variant = (time.time() - start_time) / max(1, len(variants))
+            for variant in variants:
+                self.variant_timings[variant] = round(per_variant, 3)
+            return outcomes
+        
+        outcomes = {}
+        for variant in variants:
+            start_time = time.time()
+            outcomes[variant] = self.generate_single_asset(variant)
+            self.variant_timings[variant] = round(time.time() - start_time, 3)
+            time.sleep(self.variant_pause)
+        return outcomes
+    
+    def configure_work_item(self, item: Dict[str, Any]):
+        """Point the generator at one insect-scoped work item from the scheduled matrix."""
+        self.insect_type = item["insect_type"]
+        self.asset_variants = item.get("asset_variants", [])
+        self.derived_variants = item.get("derived_variants") or {}
+        self.colors = item.get("colors") or {}
+        self.base_prompt_templates = self.get_prompt_templates()
+    
+    def generate_variant_set(self) -> Dict[str, Any]:
+        """Generate the inference and derived variants of the current insect."""
+        self.variant_timings = {}
         results = {
             "agent_id": self.agent_id,
             "insect_type": self.insect_type,
             "generated_assets": [],
             "failed_assets": [],
-            "total_variants": len(self.asset_variants)
+            "derived_assets": [],
+            "resumed_assets": [],
+            "reprocessed_assets": [],
+            "total_variants": len(self.asset_variants) + len(self.derived_variants),
+            "generation_method": self.get_generation_method(),
+            "variant_timings": self.variant_timings
         }
         
         print(f"🚀 Agent {self.agent_id} starting generation for {self.insect_type}")
         print(f"📋 Variants to generate: {self.asset_variants}")
         
+        pending = []
         for variant in self.asset_variants:
-            success = self.generate_single_asset(variant)
-            if success:
+            if self.is_variant_complete(variant):
+                results["resumed_assets"].append(variant)
+            else:
+                pending.append(variant)
+        if results["resumed_assets"]:
+            print(f"♻️  Resuming from journal, already complete: {results['resumed_assets']}")
+        
+        reprocessed = self.reprocess_from_raw(pending)
+        results["reprocessed_assets"] = reprocessed
+        if reprocessed:
+            print(f"🔁 Rebuilt from cached raw renders without inference: {reprocessed}")
+            pending = [variant for variant in pending if variant not in reprocessed]
+        
+        outcomes = self.generate_base_variants(pending) if pending else {}
+        outcomes.update({variant: True for variant in reprocessed})
+        for variant in self.asset_variants:
+            if variant in results["resumed_assets"] or outcomes.get(variant):
                 results["generated_assets"].append(variant)
             else:
                 results["failed_assets"].append(variant)
-            
-            time.sleep(2)
+        
+        if self.derived_variants:
+            print(f"🎨 Deriving variants without inference: {list(self.derived_variants)}")
+        
+        for variant, spec in self.derived_variants.items():
+            if self.is_variant_complete(variant, spec):
+                results["generated_assets"].append(variant)
+                results["derived_assets"].append(variant)
+                results["resumed_assets"].append(variant)
+                continue
+            start_time = time.time()
+            if self.generate_derived_variant(variant, spec):
+                results["generated_assets"].append(variant)
+                results["derived_assets"].append(variant)
+            else:
+                results["failed_assets"].append(variant)
+            self.variant_timings[variant] = round(time.time() - start_time, 3)
+        
+        return results
+    
+    def merge_work_item_results(self, shard_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine per-insect results into one agent report with insect-qualified asset names."""
+        insect_types = list(dict.fromkeys(shard["insect_type"] for shard in shard_results))
+        merged = {
+            "agent_id": self.agent_id,
+            "insect_type": "+".join(insect_types),
+            "insect_types": insect_types,
+            "generated_assets": [],
+            "failed_assets": [],
+            "derived_assets": [],
+            "resumed_assets": [],
+            "reprocessed_assets": [],
+            "total_variants": sum(shard["total_variants"] for shard in shard_results),
+            "shards": shard_results
+        }
+        for shard in shard_results:
+            for key in ("generated_assets", "failed_assets", "derived_assets", "resumed_assets", "reprocessed_assets"):
+                merged[key].extend(f"{shard['insect_type']}_{variant}" for variant in shard[key])
+        return merged
+    
+    def generate_all_variants(self) -> Dict[str, Any]:
+        """Generate all asset variants for this agent."""
+        if self.work_items:
+            shard_results = []
+            for item in self.work_items:
+                self.configure_work_item(item)
+                shard_results.append(self.generate_variant_set())
+            results = self.merge_work_item_results(shard_results)
+        else:
+            results = self.generate_variant_set()
+        
+        results["backend_latencies"] = self.backend_executor.latency_report()
+        results["variant_backends"] = self.variant_backends
+        if self.candidate_reports:
+            results["candidate_search"] = self.candidate_reports
+        if self.embedding_cache:
+            results["embedding_cache"] = self.embedding_cache.report()
+        if self.latent_decoder:
+            results["latent_decoder"] = {"mode": self.decoder, "variants": self.variant_decoders,
+                                         **self.latent_decoder.report()}
+        if self.early_exit_reports:
+            results["early_exit"] = {
+                "steps_saved": sum(report["steps_saved"] for report in self.early_exit_reports.values()),
+                "variants": self.early_exit_reports
+            }
+        results["weights_loading"] = self.weights_loading
+        results["process_memory"] = process_memory()
         
         report_path = os.path.join(self.output_dir, "generation_report.json")
-        with open(report_path, "w") as f:
+        with open(f"{report_path}.tmp", "w") as f:
             json.dump(results, f, indent=2)
+        os.replace(f"{report_path}.tmp", report_path)
         
-        success_rate = len(results["generated_assets"]) / results["total_variants"] * 100
+        success_rate = len(results["generated_assets"]) / results["total_variants"] * 100 if results["total_variants"] > 0 else 0
         print(f"🎯 Agent {self.agent_id} completed: {success_rate:.1f}% success rate")
         print(f"✅ Generated: {len(results['generated_assets'])}")
+        if results["resumed_assets"]:
+            print(f"♻️  Resumed from journal: {len(results['resumed_assets'])}")
         print(f"❌ Failed: {len(results['failed_assets'])}")
         
         return results
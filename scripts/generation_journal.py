@@ -0,0 +1,96 @@
+import os
+import json
+import hashlib
+from typing import Dict, Any, Optional
+from PIL import Image
+
+JOURNAL_FILENAME = "generation_journal.jsonl"
+
+
+def file_sha256(path: str) -> str:
+    """Hash a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def spec_digest(spec: Dict[str, Any]) -> str:
+    """Hash a generation spec so changed prompts, colors or sizes invalidate old outputs."""
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def save_image_atomic(image: Image.Image, path: str):
+    """Write a PNG so a crash leaves either the old file or the complete new one, never a torn file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        image.save(f, "PNG")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class GenerationJournal:
+    """Append-only record of completed variants that lets an interrupted agent resume.
+
+    Each line holds one finished output with its hash and the spec it was
+    generated from. A variant counts as complete only if its journal entry
+    matches the current spec and the file on disk still has the recorded hash.
+    """
+
+    def __init__(self, output_dir: str):
+        self.path = os.path.join(output_dir, JOURNAL_FILENAME)
+        self.needs_newline = False
+        self.entries = self.load()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Read completed entries, keeping the latest record per insect/variant."""
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+
+        with open(self.path, "r") as f:
+            for line_number, line in enumerate(f, 1):
+                self.needs_newline = not line.endswith("\n")
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A crash mid-append leaves at most one torn trailing line
+                    print(f"⚠️  Ignoring unreadable journal line {line_number} in {self.path}")
+                    continue
+                entries[f"{entry['insect_type']}/{entry['variant']}"] = entry
+
+        return entries
+
+    def completed_entry(self, insect_type: str, variant: str, spec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get the journal entry for a variant if its output is complete and current."""
+        entry = self.entries.get(f"{insect_type}/{variant}")
+        if not entry or entry.get("spec_digest") != spec_digest(spec):
+            return None
+        output_path = entry.get("output")
+        if not output_path or not os.path.exists(output_path) or file_sha256(output_path) != entry.get("sha256"):
+            return None
+        return entry
+
+    def record(self, insect_type: str, variant: str, output_path: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Append a completed output and force it to disk before moving on."""
+        entry = {
+            "insect_type": insect_type,
+            "variant": variant,
+            "output": output_path,
+            "sha256": file_sha256(output_path),
+            "spec": spec,
+            "spec_digest": spec_digest(spec)
+        }
+        with open(self.path, "a") as f:
+            # Terminate a torn trailing line so it cannot swallow this entry
+            f.write(("\n" if self.needs_newline else "") + json.dumps(entry, sort_keys=True) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.needs_newline = False
+        self.entries[f"{insect_type}/{variant}"] = entry
+        return entry
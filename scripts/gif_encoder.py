@@ -0,0 +1,215 @@
+import os
+import struct
+from typing import Dict, List, Any, Tuple, Sequence, Union
+import numpy as np
+from PIL import Image
+
+# GIF transparency is a single palette index, so alpha is cut at half coverage
+ALPHA_THRESHOLD = 128
+# One palette slot is the transparent index
+MAX_COLORS = 255
+MAX_LZW_CODES = 4096
+
+DISPOSAL_NONE = 1
+DISPOSAL_BACKGROUND = 2
+
+
+def build_palette(frames: List[np.ndarray]) -> Tuple[np.ndarray, Dict[int, int], bool]:
+    """Pick one palette for all frames' opaque colors; quantize only if they exceed MAX_COLORS.
+
+    Returns the (N, 3) palette, a map from packed 0xRRGGBB to palette index, and
+    whether colors had to be merged.
+    """
+    packed = [rgb_keys(frame)[frame[..., 3] >= ALPHA_THRESHOLD] for frame in frames]
+    colors = np.unique(np.concatenate(packed)) if packed else np.zeros(0, dtype=np.uint32)
+    if len(colors) <= MAX_COLORS:
+        palette = np.stack([(colors >> 16) & 0xFF, (colors >> 8) & 0xFF, colors & 0xFF], axis=1).astype(np.uint8)
+        return palette, {int(color): index for index, color in enumerate(colors)}, False
+
+    # Too many colors: median-cut the distinct colors once, then send each to its nearest palette entry
+    unique_rgb = np.stack([(colors >> 16) & 0xFF, (colors >> 8) & 0xFF, colors & 0xFF], axis=1).astype(np.uint8)
+    swatch = Image.fromarray(unique_rgb[None, :, :], "RGB").quantize(MAX_COLORS, method=Image.Quantize.MEDIANCUT)
+    palette = np.array(swatch.getpalette()[:MAX_COLORS * 3], dtype=np.uint8).reshape(-1, 3)
+    distances = ((unique_rgb[:, None, :].astype(np.int32) - palette[None, :, :].astype(np.int32)) ** 2).sum(axis=2)
+    nearest = distances.argmin(axis=1)
+    return palette, {int(color): int(index) for color, index in zip(colors, nearest)}, True
+
+
+def rgb_keys(frame: np.ndarray) -> np.ndarray:
+    """Pack an RGBA frame's color channels into 0xRRGGBB integers."""
+    rgb = frame[..., :3].astype(np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+
+def index_frame(frame: np.ndarray, color_index: Dict[int, int], transparent: int) -> np.ndarray:
+    """Map an RGBA frame to palette indices, with transparent pixels on the transparent index."""
+    keys = rgb_keys(frame)
+    unique, inverse = np.unique(keys, return_inverse=True)
+    lookup = np.array([color_index.get(int(key), transparent) for key in unique], dtype=np.uint8)
+    indices = lookup[inverse.reshape(keys.shape)]
+    indices[frame[..., 3] < ALPHA_THRESHOLD] = transparent
+    return indices
+
+
+def bounding_box(mask: np.ndarray) -> Tuple[int, int, int, int]:
+    """(left, top, right, bottom) of a mask's set pixels; a 1x1 box at the origin if none are set."""
+    rows, cols = np.any(mask, axis=1), np.any(mask, axis=0)
+    if not rows.any():
+        return 0, 0, 1, 1
+    top, bottom = np.argmax(rows), len(rows) - np.argmax(rows[::-1])
+    left, right = np.argmax(cols), len(cols) - np.argmax(cols[::-1])
+    return int(left), int(top), int(right), int(bottom)
+
+
+def union_box(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    """Smallest box covering two boxes."""
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+def lzw_encode(indices: np.ndarray, min_code_size: int) -> bytes:
+    """Compress palette indices with GIF's variable-width LZW and split them into data sub-blocks."""
+    clear_code = 1 << min_code_size
+    end_code = clear_code + 1
+    out = bytearray()
+    bit_buffer = 0
+    bit_count = 0
+
+    def emit(code: int, size: int):
+        nonlocal bit_buffer, bit_count
+        bit_buffer |= code << bit_count
+        bit_count += size
+        while bit_count >= 8:
+            out.append(bit_buffer & 0xFF)
+            bit_buffer >>= 8
+            bit_count -= 8
+
+    pixels = indices.ravel().tolist()
+    code_size = min_code_size + 1
+    table = {}
+    next_code = end_code + 1
+    emit(clear_code, code_size)
+
+    prefix = pixels[0]
+    for pixel in pixels[1:]:
+        code = table.get((prefix, pixel))
+        if code is not None:
+            prefix = code
+            continue
+        emit(prefix, code_size)
+        if next_code < MAX_LZW_CODES:
+            table[(prefix, pixel)] = next_code
+            # Decoders widen codes once the table reaches the current width, one code after us
+            if next_code == 1 << code_size and code_size < 12:
+                code_size += 1
+            next_code += 1
+        else:
+            emit(clear_code, code_size)
+            table = {}
+            code_size = min_code_size + 1
+            next_code = end_code + 1
+        prefix = pixel
+    emit(prefix, code_size)
+    emit(end_code, code_size)
+    if bit_count:
+        out.append(bit_buffer & 0xFF)
+
+    blocks = bytearray([min_code_size])
+    for start in range(0, len(out), 255):
+        chunk = out[start:start + 255]
+        blocks.append(len(chunk))
+        blocks.extend(chunk)
+    blocks.append(0)
+    return bytes(blocks)
+
+
+def encode_gif(frames: Sequence[Image.Image], durations: Union[float, Sequence[float]],
+               loop: bool = True) -> Tuple[bytes, Dict[str, Any]]:
+    """Encode frames as a GIF with one global palette and per-frame delta rectangles.
+
+    Identical consecutive frames are merged into one longer frame. Every later
+    frame stores only the bounding box of pixels that differ from what is on
+    screen, and pixels inside it that did not change are written as the
+    transparent index, so the previous frame shows through and long runs
+    compress well. When a frame has to clear pixels, the previous frame is
+    disposed to background over a rectangle covering them.
+    Durations are in seconds, per frame or one for all.
+    """
+    arrays = [np.asarray(frame.convert("RGBA")) for frame in frames]
+    if not arrays:
+        raise ValueError("A GIF needs at least one frame")
+    height, width = arrays[0].shape[:2]
+    if any(array.shape[:2] != (height, width) for array in arrays):
+        raise ValueError("All GIF frames must have the same size")
+    if isinstance(durations, (int, float)):
+        durations = [durations] * len(arrays)
+
+    palette, color_index, quantized = build_palette(arrays)
+    transparent = len(palette)
+    table_bits = max(1, (transparent).bit_length())
+    min_code_size = max(2, table_bits)
+
+    records = []
+    canvas = np.full((height, width), transparent, dtype=np.uint8)
+    for array, duration in zip(arrays, durations):
+        target = index_frame(array, color_index, transparent)
+        delay = max(0, round(duration * 100))
+        if records and np.array_equal(target, records[-1]["target"]):
+            records[-1]["delay"] += delay
+            continue
+
+        if records:
+            # Transparency in a frame means "keep what is there", so pixels that must turn
+            # transparent are cleared by disposing the previous frame's rectangle
+            must_clear = (target == transparent) & (canvas != transparent)
+            if must_clear.any():
+                previous = records[-1]
+                previous["box"] = union_box(previous["box"], bounding_box(must_clear))
+                previous["disposal"] = DISPOSAL_BACKGROUND
+                left, top, right, bottom = previous["box"]
+                canvas[top:bottom, left:right] = transparent
+
+        box = bounding_box(target != canvas)
+        records.append({"target": target, "before": canvas.copy(), "box": box, "delay": delay,
+                        "disposal": DISPOSAL_NONE})
+        left, top, right, bottom = box
+        canvas[top:bottom, left:right] = target[top:bottom, left:right]
+
+    out = bytearray(b"GIF89a")
+    out += struct.pack("<HHBBB", width, height, 0x80 | 0x70 | (table_bits - 1), transparent, 0)
+    color_table = np.zeros((1 << table_bits, 3), dtype=np.uint8)
+    color_table[:len(palette)] = palette
+    out += color_table.tobytes()
+    if loop:
+        out += b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", 0) + b"\x00"
+
+    stored_pixels = 0
+    for record in records:
+        left, top, right, bottom = record["box"]
+        target = record["target"][top:bottom, left:right]
+        before = record["before"][top:bottom, left:right]
+        pixels = np.where(target == before, transparent, target).astype(np.uint8)
+        stored_pixels += pixels.size
+        out += b"\x21\xf9\x04" + struct.pack("<BHB", (record["disposal"] << 2) | 1, record["delay"], transparent) + b"\x00"
+        out += b"\x2c" + struct.pack("<HHHHB", left, top, right - left, bottom - top, 0)
+        out += lzw_encode(pixels, min_code_size)
+    out += b"\x3b"
+
+    return bytes(out), {
+        "input_frames": len(arrays),
+        "stored_frames": len(records),
+        "palette_colors": len(palette),
+        "quantized": quantized,
+        "stored_pixels": stored_pixels,
+        "full_frame_pixels": width * height * len(arrays),
+        "bytes": len(out)
+    }
+
+
+def write_gif(path: str, frames: Sequence[Image.Image], durations: Union[float, Sequence[float]],
+              loop: bool = True) -> Dict[str, Any]:
+    """Encode frames to a GIF file, replacing it atomically, and return the encoding statistics."""
+    data, stats = encode_gif(frames, durations, loop)
+    with open(f"{path}.tmp", "wb") as f:
+        f.write(data)
+    os.replace(f"{path}.tmp", path)
+    return stats
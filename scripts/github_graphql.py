@@ -0,0 +1,157 @@
+import os
+import requests
+from typing import Callable, Dict, List, Any, Optional
+
+PAGE_SIZE = 50
+
+FIND_PULL_REQUESTS_QUERY = """
+query FindAssetPullRequests($owner: String!, $name: String!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(states: OPEN, first: $first, after: $after, orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { number title headRefName createdAt }
+    }
+  }
+}
+"""
+
+PULL_REQUEST_STATUS_QUERY = """
+query PullRequestStatus($owner: String!, $name: String!, $number: Int!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      number
+      title
+      state
+      merged
+      mergeable
+      mergeStateStatus
+      headRefName
+      headRefOid
+      commits(last: 1) {
+        nodes {
+          commit {
+            statusCheckRollup {
+              contexts(first: $first, after: $after) {
+                pageInfo { hasNextPage endCursor }
+                nodes {
+                  __typename
+                  ... on CheckRun { name status conclusion }
+                  ... on StatusContext { context state }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Commit status states mapped onto the check-run fields PRMonitor reads
+STATUS_CONTEXT_STATES = {
+    "SUCCESS": ("completed", "success"),
+    "FAILURE": ("completed", "failure"),
+    "ERROR": ("completed", "failure"),
+    "PENDING": ("in_progress", None),
+    "EXPECTED": ("queued", None)
+}
+
+# Check run statuses PRMonitor reads; WAITING, PENDING, REQUESTED and any new status are still queued
+CHECK_RUN_STATUSES = {
+    "COMPLETED": "completed",
+    "IN_PROGRESS": "in_progress"
+}
+
+
+def graphql_url_for(api_base: str) -> str:
+    """Derive the GraphQL endpoint from a REST API base (github.com or GitHub Enterprise)."""
+    api_base = api_base.rstrip("/")
+    if api_base.endswith("/api/v3"):
+        return f"{api_base[:-len('/v3')]}/graphql"
+    return f"{api_base}/graphql"
+
+
+def normalize_check(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Express a check run or commit status the way the REST check-runs API does."""
+    if node.get("__typename") == "StatusContext":
+        status, conclusion = STATUS_CONTEXT_STATES.get(node["state"], ("queued", None))
+        return {"name": node["context"], "status": status, "conclusion": conclusion}
+    return {
+        "name": node["name"],
+        "status": CHECK_RUN_STATUSES.get(node["status"], "queued"),
+        "conclusion": node["conclusion"].lower() if node.get("conclusion") else None
+    }
+
+
+class PRStatusClient:
+    """Look up asset PRs and their merge readiness through the GitHub GraphQL API."""
+
+    def __init__(self, token: str, target_repo: str, graphql_url: str = None):
+        self.owner, self.name = target_repo.split("/", 1)
+        api_base = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+        self.graphql_url = graphql_url or os.environ.get("GITHUB_GRAPHQL_URL") or graphql_url_for(api_base)
+        self.headers = {
+            "Authorization": f"bearer {token}",
+            "Accept": "application/vnd.github+json"
+        }
+        self.requests_made = 0
+
+    def query(self, operation: str, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one GraphQL operation and return its data, raising on transport or GraphQL errors."""
+        self.requests_made += 1
+        response = requests.post(self.graphql_url, headers=self.headers, timeout=30, json={
+            "query": query,
+            "operationName": operation,
+            "variables": {"owner": self.owner, "name": self.name, **variables}
+        })
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get("errors"):
+            raise RuntimeError(f"GraphQL {operation} failed: {payload['errors'][0].get('message')}")
+        return payload["data"]
+
+    def find_open_pr(self, match: Callable[[Dict[str, Any]], bool]) -> Optional[Dict[str, Any]]:
+        """Return the newest open PR accepted by match, paging through every open PR if needed."""
+        cursor = None
+        while True:
+            data = self.query("FindAssetPullRequests", FIND_PULL_REQUESTS_QUERY, {"first": PAGE_SIZE, "after": cursor})
+            pulls = data["repository"]["pullRequests"]
+            for pull in pulls["nodes"]:
+                if match(pull):
+                    return pull
+            if not pulls["pageInfo"]["hasNextPage"]:
+                return None
+            cursor = pulls["pageInfo"]["endCursor"]
+
+    def pr_status(self, number: int) -> Dict[str, Any]:
+        """Fetch a PR's identity, mergeability and every check conclusion, usually in one request."""
+        checks: List[Dict[str, Any]] = []
+        cursor = None
+        while True:
+            data = self.query("PullRequestStatus", PULL_REQUEST_STATUS_QUERY,
+                              {"number": int(number), "first": 100, "after": cursor})
+            pull = data["repository"]["pullRequest"]
+            if pull is None:
+                raise RuntimeError(f"PR #{number} not found in {self.owner}/{self.name}")
+            commits = pull["commits"]["nodes"]
+            rollup = commits[0]["commit"]["statusCheckRollup"] if commits else None
+            contexts = rollup["contexts"] if rollup else {"nodes": [], "pageInfo": {"hasNextPage": False}}
+            checks.extend(normalize_check(node) for node in contexts["nodes"])
+            # Only the check list paginates; later pages repeat the small PR fields
+            if not contexts["pageInfo"]["hasNextPage"]:
+                break
+            cursor = contexts["pageInfo"]["endCursor"]
+
+        return {
+            "pr": {
+                "number": pull["number"],
+                "title": pull["title"],
+                "state": pull["state"].lower(),
+                "merged": pull["merged"],
+                "head": {"ref": pull["headRefName"], "sha": pull["headRefOid"]}
+            },
+            "checks": checks,
+            "mergeable": pull["mergeable"] == "MERGEABLE",
+            "mergeable_state": pull["mergeStateStatus"].lower()
+        }
@@ -0,0 +1,92 @@
+import time
+import threading
+from typing import Dict, List, Any
+import torch
+from PIL import Image
+
+DECODERS = ("vae", "tiny", "linear")
+# Distilled SD 1.x autoencoder: a few MB and a fraction of the full VAE's decode time
+TINY_DECODER_ID = "madebyollin/taesd"
+# Per-channel projection of SD 1.x latents onto RGB in [-1, 1]; one pixel per latent cell
+LATENT_RGB_FACTORS = [
+    [0.298, 0.207, 0.208],
+    [0.187, 0.286, 0.173],
+    [-0.158, 0.189, 0.264],
+    [-0.184, -0.271, -0.473]
+]
+# DECODER=auto: the cheapest decoder per sprite size class (largest side in px), full VAE above these
+AUTO_DECODER_SIZES = [(24, "linear"), (32, "tiny")]
+
+
+def choose_decoder(mode: str, sprite_size: int, latent_size: int) -> str:
+    """Pick the decoder for a sprite, given the latent cells its own region of the render spans."""
+    if mode != "auto":
+        return mode
+    decoder = next((name for max_side, name in AUTO_DECODER_SIZES if sprite_size <= max_side), "vae")
+    # The projection has no upsampling, so the latent grid itself must cover the sprite
+    if decoder == "linear" and latent_size < sprite_size:
+        decoder = "tiny"
+    return decoder
+
+
+def to_pil(images: torch.Tensor) -> List[Image.Image]:
+    """Convert a (B, 3, H, W) batch in [-1, 1] to RGB images."""
+    pixels = ((images.float() / 2 + 0.5).clamp(0, 1) * 255).round().to(torch.uint8)
+    return [Image.fromarray(image, "RGB") for image in pixels.permute(0, 2, 3, 1).cpu().numpy()]
+
+
+def linear_decode(latents: torch.Tensor) -> List[Image.Image]:
+    """Project (B, 4, h, w) latents straight to h x w RGB images."""
+    factors = torch.tensor(LATENT_RGB_FACTORS, dtype=torch.float32, device=latents.device)
+    return to_pil(torch.einsum("bchw,cr->brhw", latents.float(), factors))
+
+
+class LatentDecoder:
+    """Decode pipeline latents with the full VAE, the tiny autoencoder or a linear projection."""
+
+    def __init__(self, pipeline, tiny_model_id: str = TINY_DECODER_ID):
+        self.pipeline = pipeline
+        self.tiny_model_id = tiny_model_id
+        self.tiny = None
+        self.tiny_failed = False
+        self.lock = threading.Lock()
+        self.stats = {name: {"images": 0, "seconds": 0.0} for name in DECODERS}
+
+    def resolve(self, decoder: str) -> str:
+        """The decoder that will actually run: the tiny autoencoder falls back to the VAE if it cannot load."""
+        if decoder != "tiny":
+            return decoder
+        with self.lock:
+            if self.tiny is None and not self.tiny_failed:
+                try:
+                    from diffusers import AutoencoderTiny
+                    vae = self.pipeline.vae
+                    self.tiny = AutoencoderTiny.from_pretrained(self.tiny_model_id, torch_dtype=vae.dtype)
+                    self.tiny = self.tiny.to(vae.device).eval().requires_grad_(False)
+                    print(f"✅ Loaded tiny autoencoder {self.tiny_model_id}")
+                except Exception as e:
+                    print(f"⚠️  Tiny autoencoder {self.tiny_model_id} unavailable, decoding with the full VAE: {e}")
+                    self.tiny_failed = True
+        return "tiny" if self.tiny is not None else "vae"
+
+    def decode(self, latents: torch.Tensor, decoder: str = "vae") -> List[Image.Image]:
+        """Decode a (B, 4, h, w) batch of denoised latents to RGB images."""
+        decoder = self.resolve(decoder)
+        start_time = time.time()
+        with torch.no_grad():
+            if decoder == "linear":
+                images = linear_decode(latents)
+            else:
+                vae = self.tiny if decoder == "tiny" else self.pipeline.vae
+                images = to_pil(vae.decode(latents.to(vae.dtype) / vae.config.scaling_factor).sample)
+        self.stats[decoder]["images"] += len(images)
+        self.stats[decoder]["seconds"] += time.time() - start_time
+        return images
+
+    def report(self) -> Dict[str, Any]:
+        """Summarize decoder use for the generation report."""
+        return {
+            "tiny_model": self.tiny_model_id if self.tiny is not None else None,
+            "decoders": {name: {"images": stats["images"], "seconds": round(stats["seconds"], 3)}
+                         for name, stats in self.stats.items() if stats["images"]}
+        }
@@ -0,0 +1,255 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any
+from PIL import Image
+from backend_executor import percentile
+from fake_github_api import start_fake_github
+from asset_bundle import write_bundle
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+INSECT_TYPES = ["beetle", "butterfly", "ladybug", "caterpillar"]
+
+
+def latency_summary(values: List[float]) -> Dict[str, float]:
+    """Summarize per-item latencies of one stage."""
+    if not values:
+        return {}
+    return {
+        "p50_seconds": round(percentile(values, 50), 4),
+        "p90_seconds": round(percentile(values, 90), 4),
+        "max_seconds": round(max(values), 4)
+    }
+
+
+class LoadTest:
+    """Drive the real pipeline scripts at scale against stub backends and a fake GitHub API.
+
+    Every stage runs the same script the workflow runs, in a scratch working
+    directory, so the measured limits are those of the production code paths.
+    """
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="bugbuddies-load-"))
+        self.log_dir = os.path.join(self.workdir, "logs")
+        os.makedirs(self.log_dir, exist_ok=True)
+        self.stages = {}
+        self.github = None
+
+    def base_env(self) -> Dict[str, str]:
+        """Environment shared by every stage: offline backends, no rate-limit pauses, fake GitHub."""
+        env = dict(os.environ)
+        env.update({
+            "USE_STUB_BACKEND": "true",
+            "STUB_LATENCY": self.args.stub_latency,
+            "STUB_FAILURE_RATE": str(self.args.stub_failure_rate),
+            "STUB_BACKENDS": str(self.args.stub_backends),
+            "VARIANT_PAUSE": "0",
+            "TRANSFER_DELAY": "0",
+            "GITHUB_TOKEN": "load-test-token",
+            "GAME_REPO_TOKEN": "load-test-token",
+            "TARGET_REPO": "load-test/bug-buddies",
+            "PYTHONUNBUFFERED": "1"
+        })
+        env.pop("PR_NUMBER", None)
+        if self.github:
+            env["GITHUB_API_URL"] = self.github[2]
+        return env
+
+    def run_script(self, log_name: str, script: str, env: Dict[str, str], args: List[str] = None) -> str:
+        """Run a pipeline script in the scratch directory and return its output; raise if it fails."""
+        completed = subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, script), *(args or [])],
+                                   cwd=self.workdir, env=env, capture_output=True, text=True)
+        with open(os.path.join(self.log_dir, f"{log_name}.log"), "w") as f:
+            f.write(completed.stdout + completed.stderr)
+        if completed.returncode != 0:
+            tail = "\n".join((completed.stdout + completed.stderr).splitlines()[-10:])
+            raise RuntimeError(f"{script} failed with exit code {completed.returncode}:\n{tail}")
+        return completed.stdout
+
+    def record_stage(self, name: str, seconds: float, items: int, unit: str, latencies: List[float] = None,
+                     **extra):
+        """Store throughput and latency of one stage and print a progress line."""
+        self.stages[name] = {
+            "seconds": round(seconds, 3),
+            "items": items,
+            "unit": unit,
+            "throughput_per_second": round(items / seconds, 2) if seconds > 0 else None,
+            **latency_summary(latencies or []),
+            **extra
+        }
+        print(f"✅ {name}: {items} {unit} in {seconds:.2f}s ({self.stages[name]['throughput_per_second']} {unit}/s)")
+
+    def work_items(self, agent_id: int) -> List[Dict[str, Any]]:
+        """Synthesize one agent's work: its variant count spread over the insect types."""
+        items = {}
+        for index in range(self.args.variants):
+            insect_type = INSECT_TYPES[(agent_id + index) % len(INSECT_TYPES)]
+            items.setdefault(insect_type, []).append(f"load_{agent_id:03d}_{index:04d}")
+        return [{"insect_type": insect_type, "asset_variants": variants} for insect_type, variants in items.items()]
+
+    def stage_generate(self):
+        """Run every agent's generator concurrently against the stub backends."""
+        def run_agent(agent_id: int) -> Dict[str, Any]:
+            env = {**self.base_env(), "AGENT_ID": str(agent_id), "WORK_ITEMS": json.dumps(self.work_items(agent_id))}
+            self.run_script(f"generate_agent_{agent_id}", "generate_assets.py", env)
+            with open(os.path.join(self.workdir, f"temp_assets/agent_{agent_id}/generation_report.json"), "r") as f:
+                return json.load(f)
+
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=self.args.jobs) as pool:
+            reports = list(pool.map(run_agent, range(1, self.args.agents + 1)))
+
+        timings = [seconds for report in reports for shard in report.get("shards", [report])
+                   for seconds in shard.get("variant_timings", {}).values()]
+        backends = {}
+        for report in reports:
+            for backend in report.get("variant_backends", {}).values():
+                backends[backend] = backends.get(backend, 0) + 1
+        self.record_stage("generate", time.time() - start_time, len(timings), "variants", timings,
+                          failed=sum(len(report["failed_assets"]) for report in reports), backends=backends)
+
+    def stage_validate(self):
+        """Validate every agent's sprites concurrently."""
+        def run_agent(agent_id: int) -> Dict[str, Any]:
+            env = {**self.base_env(), "AGENT_ID": str(agent_id)}
+            self.run_script(f"validate_agent_{agent_id}", "validate_sprites.py", env)
+            with open(os.path.join(self.workdir, f"temp_assets/agent_{agent_id}/validation_report.json"), "r") as f:
+                return json.load(f)
+
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=self.args.jobs) as pool:
+            reports = list(pool.map(run_agent, range(1, self.args.agents + 1)))
+        self.record_stage("validate", time.time() - start_time, sum(len(report["sprites"]) for report in reports),
+                          "sprites", [report["validation_seconds"] for report in reports])
+
+    def stage_pack(self):
+        """Pack every agent directory into one bundle, as the matrix jobs do before uploading."""
+        start_time = time.time()
+        stats = [write_bundle(os.path.join(self.workdir, f"temp_assets/agent_{agent_id}"),
+                              os.path.join(self.workdir, f"temp_assets/agent_{agent_id}.bbundle"))
+                 for agent_id in range(1, self.args.agents + 1)]
+        self.record_stage("pack", time.time() - start_time, sum(stat["files"] for stat in stats), "files",
+                          bundle_bytes=sum(stat["bundle_bytes"] for stat in stats))
+
+    def stage_aggregate(self):
+        """Aggregate all agent outputs into the asset library, then pad it with extra files if requested."""
+        start_time = time.time()
+        self.run_script("aggregate", "aggregate_assets.py", self.base_env())
+        with open(os.path.join(self.workdir, "assets/manifest.json"), "r") as f:
+            manifest = json.load(f)
+        self.record_stage("aggregate", time.time() - start_time, manifest.get("total_assets", 0), "assets")
+
+        if self.args.extra_files:
+            padding_dir = os.path.join(self.workdir, "assets", "load_test")
+            os.makedirs(padding_dir, exist_ok=True)
+            for index in range(self.args.extra_files):
+                Image.new("RGBA", (32, 32), (index % 256, index // 256 % 256, 128, 255)).save(
+                    os.path.join(padding_dir, f"padding_{index:05d}.png"))
+
+    def stage_transfer(self):
+        """Upload the library to the fake GitHub API and open the asset PR."""
+        _, state, _ = self.github
+        before = state.stats()["total_requests"]
+        start_time = time.time()
+        self.run_script("transfer", "transfer_to_game_repo.py", self.base_env())
+        files = sum(len(files) for _, _, files in os.walk(os.path.join(self.workdir, "assets")))
+        # Server-side service time per upload; the gap to wall time is client and protocol overhead
+        uploads = list(state.request_latencies.get("put_contents", []))
+        self.record_stage("transfer", time.time() - start_time, files, "files", uploads,
+                          requests=state.stats()["total_requests"] - before)
+
+    def stage_merge(self):
+        """Find the asset PR and let the monitor merge it once the fake checks pass."""
+        env = self.base_env()
+        start_time = time.time()
+        output = self.run_script("find_pr", "find_asset_pr.py", env)
+        pr_number = next((line.split("::")[-1] for line in output.splitlines() if "name=pr_number::" in line), "")
+        if not pr_number:
+            raise RuntimeError("find_asset_pr.py did not find the load-test PR")
+        find_seconds = time.time() - start_time
+        self.record_stage("find_pr", find_seconds, 1, "prs")
+
+        start_time = time.time()
+        output = self.run_script("monitor", "monitor_and_merge.py",
+                                 {**env, "PR_NUMBER": pr_number, "CHECK_INTERVAL": "1", "MAX_WAIT_TIME": "120"})
+        self.record_stage("monitor", time.time() - start_time, 1, "prs", merged="Successfully merged" in output)
+
+    def run(self) -> Dict[str, Any]:
+        """Run every stage in pipeline order and write the load report."""
+        print(f"🧪 Load test: {self.args.agents} agents x {self.args.variants} variants, "
+              f"stub latency {self.args.stub_latency}, workdir {self.workdir}")
+        self.github = start_fake_github(latency=self.args.github_latency, check_polls=self.args.check_polls)
+        start_time = time.time()
+        try:
+            self.stage_generate()
+            self.stage_validate()
+            if self.args.bundle:
+                self.stage_pack()
+            self.stage_aggregate()
+            self.stage_transfer()
+            self.stage_merge()
+        finally:
+            self.github[0].shutdown()
+
+        report = {
+            "config": {
+                "agents": self.args.agents,
+                "variants_per_agent": self.args.variants,
+                "extra_files": self.args.extra_files,
+                "bundle": self.args.bundle,
+                "jobs": self.args.jobs,
+                "stub_latency": self.args.stub_latency,
+                "stub_failure_rate": self.args.stub_failure_rate,
+                "stub_backends": self.args.stub_backends,
+                "github_latency": self.args.github_latency
+            },
+            "total_seconds": round(time.time() - start_time, 3),
+            "stages": self.stages,
+            "github_api": self.github[1].stats()
+        }
+        report_path = os.path.join(self.workdir, "load_test_report.json")
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+        print(f"\n{'stage':<10} {'items':>8} {'seconds':>9} {'per sec':>9} {'p50':>8} {'p90':>8}")
+        for name, stage in self.stages.items():
+            print(f"{name:<10} {stage['items']:>8} {stage['seconds']:>9.2f} {stage['throughput_per_second'] or 0:>9.2f} "
+                  f"{stage.get('p50_seconds', 0):>8.3f} {stage.get('p90_seconds', 0):>8.3f}")
+        print(f"📊 Report: {report_path}")
+        return report
+
+
+def main():
+    """Parse load-test options and run the offline pipeline."""
+    parser = argparse.ArgumentParser(description="Load-test the asset pipeline offline with stub backends")
+    parser.add_argument("--agents", type=int, default=5, help="parallel generation agents")
+    parser.add_argument("--variants", type=int, default=20, help="inference variants per agent")
+    parser.add_argument("--extra-files", type=int, default=0, help="synthetic files added to the transfer")
+    parser.add_argument("--bundle", action="store_true", help="aggregate from packed agent bundles")
+    parser.add_argument("--jobs", type=int, default=None, help="agents running at once (default: all)")
+    parser.add_argument("--stub-latency", default="lognormal:0.05:0.5",
+                        help="stub backend latency, e.g. fixed:0.1, uniform:0.05:0.3, lognormal:0.05:0.5")
+    parser.add_argument("--stub-failure-rate", type=float, default=0.0)
+    parser.add_argument("--stub-backends", type=int, default=1, help="stub backends per agent, >1 exercises hedging")
+    parser.add_argument("--github-latency", default="fixed:0", help="fake GitHub per-request latency")
+    parser.add_argument("--check-polls", type=int, default=0, help="check-run polls before the fake CI passes")
+    parser.add_argument("--workdir", default=None, help="scratch directory (default: a new temp directory)")
+    args = parser.parse_args()
+    args.jobs = args.jobs or args.agents
+
+    try:
+        LoadTest(args).run()
+    except Exception as e:
+        print(f"💥 Load test failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
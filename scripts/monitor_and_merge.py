@@ -2,6 +2,7 @@ import os
 import requests
 import time
 import json
+from github_graphql import PRStatusClient
 
 class PRMonitor:
     """Monitor PR status and auto-merge when ready."""
@@ -13,12 +14,15 @@ class PRMonitor:
         self.target_repo = os.environ.get("TARGET_REPO", "magatona/bug-buddies")
         self.max_wait_time = int(os.environ.get("MAX_WAIT_TIME", "1800"))
         self.check_interval = int(os.environ.get("CHECK_INTERVAL", "60"))
+        self.api_base = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
         
         self.headers = {
             "Authorization": f"token {self.game_repo_token}",
             "Accept": "application/vnd.github.v3+json"
         }
         
+        self.status_client = PRStatusClient(self.game_repo_token, self.target_repo)
+        
         if not self.pr_number:
             print("No PR number provided, skipping monitoring")
             return
@@ -26,26 +30,9 @@ class PRMonitor:
         print(f"Monitoring PR #{self.pr_number} in {self.target_repo}")
     
     def get_pr_status(self):
-        """Get current PR status and checks."""
+        """Get current PR status and checks in a single GraphQL round trip."""
         try:
-            pr_url = f"https://api.github.com/repos/{self.target_repo}/pulls/{self.pr_number}"
-            response = requests.get(pr_url, headers=self.headers)
-            response.raise_for_status()
-            
-            pr_data = response.json()
-            
-            checks_url = f"https://api.github.com/repos/{self.target_repo}/commits/{pr_data['head']['sha']}/check-runs"
-            checks_response = requests.get(checks_url, headers=self.headers)
-            checks_response.raise_for_status()
-            
-            checks_data = checks_response.json()
-            
-            return {
-                "pr": pr_data,
-                "checks": checks_data["check_runs"],
-                "mergeable": pr_data.get("mergeable", False),
-                "mergeable_state": pr_data.get("mergeable_state", "unknown")
-            }
+            return self.status_client.pr_status(self.pr_number)
             
         except Exception as e:
             print(f"Error getting PR status: {e}")
@@ -84,7 +71,7 @@ class PRMonitor:
     def merge_pr(self):
         """Merge the PR."""
         try:
-            merge_url = f"https://api.github.com/repos/{self.target_repo}/pulls/{self.pr_number}/merge"
+            merge_url = f"{self.api_base}/repos/{self.target_repo}/pulls/{self.pr_number}/merge"
             merge_data = {
                 "commit_title": f"Merge PR #{self.pr_number}: AI-Generated Bug Buddies Assets",
                 "commit_message": "Automatically merged after successful CI checks",
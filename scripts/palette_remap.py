@@ -0,0 +1,50 @@
+from typing import Dict, List, Tuple
+import numpy as np
+from PIL import Image
+
+# Palette entries further than this (RGB distance) from every anchor keep their color,
+# so outlines, eyes and highlights survive a recolor untouched.
+ANCHOR_RADIUS = 160.0
+
+
+def hex_to_rgb(value: str) -> Tuple[int, int, int]:
+    """Convert a '#RRGGBB' matrix color to an RGB tuple."""
+    value = value.lstrip("#")
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def anchor_colors(colors: Dict[str, str]) -> List[Tuple[int, int, int]]:
+    """Get the primary/secondary anchors of a matrix color assignment in a fixed order."""
+    return [hex_to_rgb(colors[key]) for key in ("primary", "secondary") if key in colors]
+
+
+def remap_palette(image: Image.Image, source_colors: Dict[str, str], target_colors: Dict[str, str]) -> Image.Image:
+    """Recolor a sprite by moving each palette entry with its nearest source anchor.
+
+    Every distinct opaque color is shifted by the offset between its closest
+    source anchor and the matching target anchor, weighted by how close it is
+    to that anchor. The work is done once per palette entry rather than per
+    pixel, and the result is deterministic and pixel-aligned with the input.
+    """
+    sources = np.array(anchor_colors(source_colors), dtype=np.float32)
+    targets = np.array(anchor_colors(target_colors), dtype=np.float32)
+    if len(sources) == 0 or len(sources) != len(targets):
+        raise ValueError("source and target colors must define the same primary/secondary anchors")
+
+    pixels = np.array(image.convert("RGBA"), dtype=np.uint8)
+    flat = pixels.reshape(-1, 4)
+    opaque = flat[:, 3] > 0
+
+    palette, inverse = np.unique(flat[opaque, :3], axis=0, return_inverse=True)
+    if len(palette) == 0:
+        return Image.fromarray(pixels, "RGBA")
+
+    distances = np.linalg.norm(palette[:, None, :].astype(np.float32) - sources[None, :, :], axis=2)
+    nearest = distances.argmin(axis=1)
+    weights = np.clip(1.0 - distances[np.arange(len(palette)), nearest] / ANCHOR_RADIUS, 0.0, 1.0)
+
+    shifted = palette + weights[:, None] * (targets[nearest] - sources[nearest])
+    remapped = np.clip(np.rint(shifted), 0, 255).astype(np.uint8)
+
+    flat[opaque, :3] = remapped[inverse.reshape(-1)]
+    return Image.fromarray(flat.reshape(pixels.shape), "RGBA")
@@ -0,0 +1,174 @@
+import os
+import zlib
+import struct
+from typing import Dict, List, Any, Optional, Tuple, Union, BinaryIO
+import numpy as np
+from PIL import Image
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# PNG color types
+COLOR_TYPE_RGB = 2
+COLOR_TYPE_INDEXED = 3
+COLOR_TYPE_RGBA = 6
+
+FILTER_NAMES = ["none", "sub", "up", "average", "paeth"]
+ZLIB_STRATEGIES = {
+    "default": zlib.Z_DEFAULT_STRATEGY,
+    "filtered": zlib.Z_FILTERED,
+    "huffman": zlib.Z_HUFFMAN_ONLY,
+    "rle": zlib.Z_RLE,
+    "fixed": zlib.Z_FIXED
+}
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte size such as '250000', '512KB' or '2MB'."""
+    value = value.strip().upper()
+    for suffix, factor in (("MB", 1024 * 1024), ("KB", 1024), ("B", 1)):
+        if value.endswith(suffix):
+            return int(float(value[:-len(suffix)]) * factor)
+    return int(value)
+
+
+def png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """Serialize one PNG chunk with its CRC."""
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data) & 0xFFFFFFFF)
+
+
+def to_indexed(pixels: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Map an RGBA array to (palette, index rows) or None if it has more than 256 colors.
+
+    Fully transparent pixels collapse to one entry, and translucent entries are
+    ordered first so the tRNS chunk stays as short as possible.
+    """
+    flat = pixels.reshape(-1, 4).copy()
+    flat[flat[:, 3] == 0] = 0
+    palette, inverse = np.unique(flat, axis=0, return_inverse=True)
+    if len(palette) > 256:
+        return None
+    # Sort by opacity (translucent first), then by color for a deterministic order
+    order = np.lexsort((palette[:, 2], palette[:, 1], palette[:, 0], palette[:, 3] == 255))
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    indices = rank[inverse.reshape(-1)].reshape(pixels.shape[:2]).astype(np.uint8)
+    return palette[order], indices
+
+
+def pack_rows(indices: np.ndarray, bit_depth: int) -> np.ndarray:
+    """Pack palette indices into PNG rows of the given bit depth."""
+    if bit_depth == 8:
+        return indices
+    per_byte = 8 // bit_depth
+    height, width = indices.shape
+    padded_width = -(-width // per_byte) * per_byte
+    padded = np.zeros((height, padded_width), dtype=np.uint8)
+    padded[:, :width] = indices
+    groups = padded.reshape(height, -1, per_byte)
+    shifts = np.arange(per_byte - 1, -1, -1, dtype=np.uint8) * bit_depth
+    return np.bitwise_or.reduce(groups << shifts, axis=2).astype(np.uint8)
+
+
+def filter_rows(raw: np.ndarray, bpp: int) -> List[np.ndarray]:
+    """Apply each PNG filter to every scanline at once; returns one filtered array per filter type."""
+    data = raw.astype(np.int16)
+    left = np.zeros_like(data)
+    left[:, bpp:] = data[:, :-bpp]
+    up = np.zeros_like(data)
+    up[1:] = data[:-1]
+    up_left = np.zeros_like(data)
+    up_left[1:, bpp:] = data[:-1, :-bpp]
+
+    estimate = left + up - up_left
+    distance_left, distance_up, distance_up_left = np.abs(estimate - left), np.abs(estimate - up), np.abs(estimate - up_left)
+    paeth = np.where((distance_left <= distance_up) & (distance_left <= distance_up_left), left,
+                     np.where(distance_up <= distance_up_left, up, up_left))
+
+    return [((data - predictor) & 0xFF).astype(np.uint8)
+            for predictor in (np.zeros_like(data), left, up, (left + up) // 2, paeth)]
+
+
+def scanline_candidates(raw: np.ndarray, bpp: int) -> Dict[str, bytes]:
+    """Build the filtered image stream for each fixed filter plus the per-row minimum-sum heuristic."""
+    filtered = filter_rows(raw, bpp)
+    height = raw.shape[0]
+    candidates = {}
+    for filter_type, rows in enumerate(filtered):
+        tagged = np.hstack([np.full((height, 1), filter_type, dtype=np.uint8), rows])
+        candidates[FILTER_NAMES[filter_type]] = tagged.tobytes()
+
+    # Adaptive: per row, the filter whose output has the smallest sum of absolute signed bytes
+    costs = np.stack([np.abs(rows.astype(np.int8).astype(np.int16)).sum(axis=1) for rows in filtered])
+    choice = costs.argmin(axis=0)
+    adaptive = np.hstack([choice.astype(np.uint8)[:, None],
+                          np.stack(filtered)[choice, np.arange(height)]])
+    candidates["adaptive"] = adaptive.tobytes()
+    return candidates
+
+
+def encode_png(image: Image.Image) -> Tuple[bytes, Dict[str, Any]]:
+    """Encode the smallest PNG for an image across color type, filter and zlib strategy.
+
+    No ancillary chunks (text, time, gamma) are written, so the same pixels
+    always produce the same bytes.
+    """
+    pixels = np.array(image.convert("RGBA"), dtype=np.uint8)
+    height, width = pixels.shape[:2]
+    indexed = to_indexed(pixels)
+
+    if indexed is not None:
+        palette, indices = indexed
+        bit_depth = next(depth for depth in (1, 2, 4, 8) if len(palette) <= 1 << depth)
+        raw, bpp, color_type = pack_rows(indices, bit_depth), 1, COLOR_TYPE_INDEXED
+        extra_chunks = png_chunk(b"PLTE", palette[:, :3].tobytes())
+        translucent = int((palette[:, 3] < 255).sum())
+        if translucent:
+            extra_chunks += png_chunk(b"tRNS", palette[:translucent, 3].tobytes())
+    elif (pixels[:, :, 3] == 255).all():
+        bit_depth, bpp, color_type = 8, 3, COLOR_TYPE_RGB
+        raw, extra_chunks = pixels[:, :, :3].reshape(height, -1), b""
+    else:
+        bit_depth, bpp, color_type = 8, 4, COLOR_TYPE_RGBA
+        raw, extra_chunks = pixels.reshape(height, -1), b""
+
+    best = None
+    for filter_name, stream in scanline_candidates(raw, bpp).items():
+        for strategy_name, strategy in ZLIB_STRATEGIES.items():
+            compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9, strategy)
+            compressed = compressor.compress(stream) + compressor.flush()
+            if best is None or len(compressed) < len(best[0]):
+                best = (compressed, filter_name, strategy_name)
+
+    header = struct.pack(">IIBBBBB", width, height, bit_depth, color_type, 0, 0, 0)
+    data = (PNG_SIGNATURE + png_chunk(b"IHDR", header) + extra_chunks +
+            png_chunk(b"IDAT", best[0]) + png_chunk(b"IEND", b""))
+    return data, {
+        "color_type": {COLOR_TYPE_INDEXED: "indexed", COLOR_TYPE_RGB: "rgb", COLOR_TYPE_RGBA: "rgba"}[color_type],
+        "bit_depth": bit_depth,
+        "palette_size": len(indexed[0]) if indexed is not None else None,
+        "filter": best[1],
+        "zlib_strategy": best[2]
+    }
+
+
+def optimize_png(src_path: Union[str, BinaryIO], dst_path: str, original_bytes: int = None) -> Dict[str, Any]:
+    """Re-encode a PNG at its native size with the smallest lossless encoding and report the savings.
+
+    src_path may also be an open binary file, in which case original_bytes gives its size.
+    """
+    if original_bytes is None:
+        original_bytes = os.path.getsize(src_path)
+    with Image.open(src_path) as img:
+        data, encoding = encode_png(img)
+
+    tmp_path = f"{dst_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, dst_path)
+
+    return {
+        "original_bytes": original_bytes,
+        "optimized_bytes": len(data),
+        "saved_bytes": original_bytes - len(data),
+        **encoding
+    }
@@ -0,0 +1,321 @@
+import os
+import re
+import sys
+import ast
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Any, Callable, Tuple
+from work_scheduler import WorkScheduler
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PIPELINE_CACHE_DIR = ".pipeline_cache"
+TEMP_DIR = "temp_assets"
+
+ENV_REFERENCE = re.compile(r"""os\.environ(?:\.get\(|\[)\s*["']([A-Z0-9_]+)["']""")
+# Set per stage by the orchestrator itself or only meaningful on GitHub Actions
+ORCHESTRATOR_ENV = {"AGENT_ID", "WORK_ITEMS", "INSECT_TYPE", "ASSET_VARIANTS", "DERIVED_VARIANTS",
+                    "ASSET_COLORS", "ANIMATION_TYPES", "GITHUB_OUTPUT", "AGGREGATE_WATCH"}
+# Records which stage key an agent directory was generated for
+STAGE_MARKER = ".pipeline_key"
+
+
+def script_closure(script: str) -> List[str]:
+    """Get a script plus every sibling module it imports, transitively."""
+    closure, pending = [], [os.path.join(SCRIPTS_DIR, script)]
+    while pending:
+        path = pending.pop()
+        if path in closure:
+            continue
+        closure.append(path)
+        with open(path, "r") as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            names = ([alias.name for alias in node.names] if isinstance(node, ast.Import)
+                     else [node.module] if isinstance(node, ast.ImportFrom) and node.module else [])
+            for name in names:
+                candidate = os.path.join(SCRIPTS_DIR, f"{name.split('.')[0]}.py")
+                if os.path.exists(candidate):
+                    pending.append(candidate)
+    return sorted(closure)
+
+
+def referenced_env(scripts: List[str]) -> List[str]:
+    """Collect the environment variables a set of scripts reads."""
+    names = set()
+    for path in scripts:
+        with open(path, "r") as f:
+            names.update(ENV_REFERENCE.findall(f.read()))
+    return sorted(names - ORCHESTRATOR_ENV)
+
+
+def digest_path(path: str, exclude: Tuple[str, ...] = ()) -> str:
+    """Hash a file, or a directory's relative paths and contents; missing paths hash as empty."""
+    digest = hashlib.sha256()
+    if os.path.isfile(path):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    elif os.path.isdir(path):
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename in exclude:
+                    continue
+                file_path = os.path.join(dirpath, filename)
+                digest.update(os.path.relpath(file_path, path).encode("utf-8"))
+                with open(file_path, "rb") as f:
+                    digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def copy_path(src: str, dst: str):
+    """Copy a file or merge a directory into place."""
+    if os.path.isdir(src):
+        shutil.copytree(src, dst, dirs_exist_ok=True)
+    else:
+        os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+        shutil.copy2(src, dst)
+
+
+class PipelineRunner:
+    """Run the asset pipeline as a DAG on one machine, skipping stages whose inputs are unchanged.
+
+    Stages mirror the asset-generation workflow: matrix -> one generate and
+    animate stage per agent (run in parallel) -> cost learning and aggregation
+    -> optional transfer. Each cached stage is keyed by a hash of its scripts
+    (including imported helpers), the environment variables they read and its
+    input files, and its outputs are stored under .pipeline_cache/<stage>/<key>.
+    """
+
+    def __init__(self, jobs: int, agent_count: int = None, animations: bool = True,
+                 transfer: bool = False, force: bool = False, procedural: bool = False):
+        self.jobs = max(1, jobs)
+        self.animations = animations
+        self.transfer = transfer
+        self.force = force
+        self.env = dict(os.environ)
+        self.env.pop("GITHUB_OUTPUT", None)
+        self.env.pop("AGGREGATE_WATCH", None)
+        self.env["ENABLE_ANIMATIONS"] = "true" if animations else "false"
+        if agent_count is not None:
+            self.env["AGENT_COUNT"] = str(agent_count)
+        if procedural:
+            self.env["PROCEDURAL_ONLY"] = "true"
+        self.log_dir = os.path.join(PIPELINE_CACHE_DIR, "logs")
+        os.makedirs(self.log_dir, exist_ok=True)
+        self.stage_results = {}
+
+    def stage_key(self, name: str, scripts: List[str], inputs: Dict[str, Any]) -> str:
+        """Hash everything a stage's output depends on."""
+        closure = sorted({path for script in scripts for path in script_closure(script)})
+        env_names = referenced_env(closure)
+        key_material = {
+            "stage": name.split(":")[0],
+            "scripts": {os.path.basename(path): digest_path(path) for path in closure},
+            # Values are hashed so API keys never end up in the cache metadata
+            "env": {env_name: hashlib.sha256(self.env.get(env_name, "").encode("utf-8")).hexdigest()
+                    for env_name in env_names if env_name in self.env},
+            "inputs": inputs
+        }
+        return hashlib.sha256(json.dumps(key_material, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    def run_cached(self, name: str, key: str, outputs: List[str], action: Callable[[], None],
+                   replace_outputs: bool = False) -> bool:
+        """Restore a stage's outputs from the cache, or run it and cache them. Returns True on a hit.
+
+        Restored directories are merged into place unless replace_outputs is set,
+        since some outputs (assets/ui) share a directory with checked-in files.
+        """
+        cache_dir = os.path.join(PIPELINE_CACHE_DIR, name.replace(":", "_"), key)
+        metadata_path = os.path.join(cache_dir, "stage.json")
+
+        if os.path.exists(metadata_path) and not self.force:
+            for output in outputs:
+                cached = os.path.join(cache_dir, "outputs", output)
+                if os.path.exists(cached):
+                    if replace_outputs and os.path.isdir(output):
+                        shutil.rmtree(output)
+                    copy_path(cached, output)
+            return True
+
+        action()
+
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        for output in outputs:
+            if os.path.exists(output):
+                copy_path(output, os.path.join(cache_dir, "outputs", output))
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(metadata_path, "w") as f:
+            json.dump({"stage": name, "key": key, "outputs": outputs, "created_at": time.time()}, f, indent=2)
+        return False
+
+    def run_script(self, name: str, script: str, env: Dict[str, str] = None, args: List[str] = None) -> str:
+        """Run one pipeline script, logging its output to .pipeline_cache/logs, and return stdout."""
+        log_path = os.path.join(self.log_dir, f"{name.replace(':', '_')}.log")
+        completed = subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, script), *(args or [])],
+                                   env={**self.env, **(env or {})}, capture_output=True, text=True)
+        with open(log_path, "a") as f:
+            f.write(f"$ {script}\n{completed.stdout}{completed.stderr}\n")
+        if completed.returncode != 0:
+            tail = "\n".join((completed.stdout + completed.stderr).strip().splitlines()[-10:])
+            raise RuntimeError(f"{script} exited with {completed.returncode} (log: {log_path})\n{tail}")
+        return completed.stdout
+
+    def stage_matrix(self) -> Dict[str, Any]:
+        """Plan the agent matrix; the learned cost table is an input."""
+        matrix_path = os.path.join(TEMP_DIR, "config", "matrix.json")
+        cost_table = os.path.join(TEMP_DIR, "config", "variant_costs.json")
+        key = self.stage_key("matrix", ["generate_asset_matrix.py"], {"cost_table": digest_path(cost_table)})
+
+        def action():
+            stdout = self.run_script("matrix", "generate_asset_matrix.py")
+            line = next(line for line in stdout.splitlines() if line.startswith("matrix="))
+            with open(matrix_path, "w") as f:
+                f.write(line[len("matrix="):])
+
+        cached = self.run_cached("matrix", key, [matrix_path, os.path.join(TEMP_DIR, "config", "generation_config.json")], action)
+        with open(matrix_path, "r") as f:
+            matrix = json.load(f)
+        return {"cached": cached, "matrix": matrix}
+
+    def stage_agent(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate one agent's variants and animations."""
+        agent_id = entry["agent_id"]
+        name = f"agent:{agent_id}"
+        agent_dir = os.path.join(TEMP_DIR, f"agent_{agent_id}")
+        # Estimates change as costs are learned without changing what the agent produces
+        work_items = [{k: v for k, v in item.items() if k != "estimated_seconds"} for item in entry["work_items"]]
+        key = self.stage_key(name, ["generate_assets.py", "validate_sprites.py", "create_animations.py"],
+                             {"agent_id": agent_id, "work_items": work_items,
+                              "quality_level": entry.get("quality_level")})
+        env = {"AGENT_ID": str(agent_id), "WORK_ITEMS": json.dumps(entry["work_items"]),
+               "QUALITY_LEVEL": entry.get("quality_level", "standard")}
+
+        def action():
+            # Same inputs as an interrupted earlier attempt: keep its files so the journal can resume
+            marker_path = os.path.join(agent_dir, STAGE_MARKER)
+            if not (os.path.exists(marker_path) and open(marker_path).read() == key):
+                shutil.rmtree(agent_dir, ignore_errors=True)
+            os.makedirs(agent_dir, exist_ok=True)
+            with open(marker_path, "w") as f:
+                f.write(key)
+            self.run_script(name, "generate_assets.py", env)
+            self.run_script(name, "validate_sprites.py", env, ["--regenerate"])
+            if self.animations:
+                self.run_script(name, "create_animations.py", env)
+
+        cached = self.run_cached(name, key, [agent_dir], action, replace_outputs=True)
+        return {"cached": cached, "agent_dir": agent_dir}
+
+    def stage_learn_costs(self, agent_names: List[str]) -> Dict[str, Any]:
+        """Fold timings of freshly generated agents into the cost table (never cached)."""
+        reports = [os.path.join(self.stage_results[name]["agent_dir"], "generation_report.json")
+                   for name in agent_names if not self.stage_results[name]["cached"]]
+        if not reports:
+            return {"cached": True}
+        scheduler = WorkScheduler()
+        observations = scheduler.learn_from_reports([path for path in reports if os.path.exists(path)])
+        scheduler.save_cost_table()
+        return {"cached": False, "observations": observations}
+
+    def stage_aggregate(self, agent_names: List[str]) -> Dict[str, Any]:
+        """Aggregate agent outputs into assets/ and the manifest."""
+        inputs = {name: digest_path(self.stage_results[name]["agent_dir"], exclude=(STAGE_MARKER,))
+                  for name in agent_names}
+        inputs["config"] = digest_path(os.path.join(TEMP_DIR, "config", "generation_config.json"))
+        # The manifest revision and delta continue from the previously shipped manifest
+        inputs["previous_manifest"] = digest_path(os.environ.get("PREVIOUS_MANIFEST", ""))
+        key = self.stage_key("aggregate", ["aggregate_assets.py"], inputs)
+        outputs = ["assets/characters", "assets/animations", "assets/ui", "assets/environment",
+                   "assets/manifest.json", "assets/manifest_delta.json", "asset_summary.json"]
+        cached = self.run_cached("aggregate", key, outputs, lambda: self.run_script("aggregate", "aggregate_assets.py"))
+        return {"cached": cached}
+
+    def stage_transfer(self) -> Dict[str, Any]:
+        """Open the game repository PR (never cached: it has external side effects)."""
+        self.run_script("transfer", "transfer_to_game_repo.py")
+        return {"cached": False}
+
+    def run_dag(self, stages: Dict[str, Tuple[List[str], Callable[[], Dict[str, Any]]]]) -> bool:
+        """Run stages as soon as their dependencies succeed, up to self.jobs at a time."""
+        pending = dict(stages)
+        running = {}
+        failed = set()
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while pending or running:
+                for name, (deps, action) in list(pending.items()):
+                    if any(dep in failed for dep in deps):
+                        print(f"⏭️  {name}: skipped, dependency failed")
+                        failed.add(name)
+                        del pending[name]
+                    elif all(dep in self.stage_results for dep in deps):
+                        print(f"▶️  {name}: started")
+                        running[pool.submit(action)] = (name, time.time())
+                        del pending[name]
+
+                if not running:
+                    break
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, started_at = running.pop(future)
+                    try:
+                        self.stage_results[name] = future.result()
+                        status = "cached" if self.stage_results[name].get("cached") else "done"
+                        print(f"✅ {name}: {status} in {time.time() - started_at:.1f}s")
+                    except Exception as e:
+                        print(f"❌ {name}: {e}")
+                        failed.add(name)
+
+        return not failed
+
+    def run(self) -> bool:
+        """Run the whole pipeline."""
+        os.makedirs(os.path.join(TEMP_DIR, "config"), exist_ok=True)
+        if not self.run_dag({"matrix": ([], self.stage_matrix)}):
+            return False
+
+        plan = self.stage_results["matrix"]["matrix"]["include"]
+        planned_dirs = {f"agent_{entry['agent_id']}" for entry in plan}
+        # Outputs of agents from an earlier, larger plan must not reach the aggregator
+        for entry_name in os.listdir(TEMP_DIR):
+            if re.match(r"^agent_\d+$", entry_name) and entry_name not in planned_dirs:
+                shutil.rmtree(os.path.join(TEMP_DIR, entry_name))
+
+        agent_names = [f"agent:{entry['agent_id']}" for entry in plan]
+        stages = {name: (["matrix"], lambda entry=entry: self.stage_agent(entry))
+                  for name, entry in zip(agent_names, plan)}
+        stages["learn_costs"] = (agent_names, lambda: self.stage_learn_costs(agent_names))
+        stages["aggregate"] = (agent_names, lambda: self.stage_aggregate(agent_names))
+        if self.transfer:
+            stages["transfer"] = (["aggregate"], self.stage_transfer)
+
+        return self.run_dag(stages)
+
+
+def main():
+    """Run the asset pipeline locally as a cached DAG."""
+    parser = argparse.ArgumentParser(description="Run the Bug Buddies asset pipeline on this machine")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="stages to run in parallel")
+    parser.add_argument("--agents", type=int, default=None, help="number of agents to plan (AGENT_COUNT)")
+    parser.add_argument("--no-animations", action="store_true", help="skip GIF creation")
+    parser.add_argument("--procedural", action="store_true", help="render with the procedural engine only")
+    parser.add_argument("--transfer", action="store_true", help="open the game repository PR at the end")
+    parser.add_argument("--force", action="store_true", help="ignore cached stage outputs")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    runner = PipelineRunner(jobs=args.jobs, agent_count=args.agents, animations=not args.no_animations,
+                            transfer=args.transfer, force=args.force, procedural=args.procedural)
+    success = runner.run()
+    cached = sum(1 for result in runner.stage_results.values() if result.get("cached"))
+    print(f"{'🎉' if success else '💥'} Pipeline {'completed' if success else 'failed'} in "
+          f"{time.time() - start_time:.1f}s ({cached}/{len(runner.stage_results)} stages cached)")
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
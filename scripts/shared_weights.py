@@ -0,0 +1,150 @@
+import os
+import json
+import mmap
+import struct
+import warnings
+from typing import Dict, Any, Tuple
+import torch
+
+# safetensors dtype tags mapped to torch dtypes
+SAFETENSORS_DTYPES = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool
+}
+
+# Weight files of each pipeline component, in order of preference
+COMPONENT_WEIGHTS = {
+    "unet": ["diffusion_pytorch_model.safetensors"],
+    "vae": ["diffusion_pytorch_model.safetensors"],
+    "text_encoder": ["model.safetensors"]
+}
+
+# Mappings must outlive every tensor viewing them
+_open_mappings = []
+
+
+def read_safetensors_header(path: str) -> Tuple[Dict[str, Any], int]:
+    """Read a safetensors header and return (tensor index, byte offset of the data section)."""
+    with open(path, "rb") as f:
+        header_size = struct.unpack("<Q", f.read(8))[0]
+        header = json.loads(f.read(header_size))
+    return header, 8 + header_size
+
+
+def mmap_state_dict(path: str) -> Dict[str, torch.Tensor]:
+    """Map a safetensors file read-only and return tensors that view the mapping without copying.
+
+    The pages live in the OS page cache, so every process that maps the same
+    file shares one physical copy of the weights.
+    """
+    header, data_offset = read_safetensors_header(path)
+    with open(path, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    _open_mappings.append(mapping)
+
+    state_dict = {}
+    with warnings.catch_warnings():
+        # The mapping is read-only on purpose; inference never writes to weights
+        warnings.filterwarnings("ignore", message=".*not writable.*")
+        for name, info in header.items():
+            if name == "__metadata__":
+                continue
+            dtype = SAFETENSORS_DTYPES[info["dtype"]]
+            start, end = info["data_offsets"]
+            itemsize = torch.tensor([], dtype=dtype).element_size()
+            if end == start:
+                state_dict[name] = torch.empty(info["shape"], dtype=dtype)
+                continue
+            tensor = torch.frombuffer(mapping, dtype=dtype, count=(end - start) // itemsize,
+                                      offset=data_offset + start)
+            state_dict[name] = tensor.reshape(info["shape"])
+
+    return state_dict
+
+
+def resolve_model_path(model_id: str) -> str:
+    """Get a local snapshot directory for a model id, downloading only configs, tokenizer and safetensors."""
+    if os.path.isdir(model_id):
+        return model_id
+    from huggingface_hub import snapshot_download
+    return snapshot_download(model_id, allow_patterns=[
+        "model_index.json", "*/config.json", "*/*.txt", "*/*.json",
+        *[f"{component}/{filename}" for component, filenames in COMPONENT_WEIGHTS.items() for filename in filenames]
+    ])
+
+
+def component_weights_path(model_path: str, component: str) -> str:
+    """Find the safetensors file of a pipeline component."""
+    for filename in COMPONENT_WEIGHTS[component]:
+        path = os.path.join(model_path, component, filename)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"No safetensors weights for {component} in {model_path}")
+
+
+def load_shared_component(module: torch.nn.Module, weights_path: str, component: str) -> torch.nn.Module:
+    """Point an empty-weight module at memory-mapped tensors instead of copying them in."""
+    state_dict = mmap_state_dict(weights_path)
+    missing, unexpected = module.load_state_dict(state_dict, strict=False, assign=True)
+    # Non-persistent buffers (e.g. position ids) are created by the module itself
+    missing = [key for key in missing if not key.endswith("position_ids")]
+    if missing:
+        raise RuntimeError(f"{component} weights are missing {len(missing)} tensors, e.g. {missing[:3]}")
+    if unexpected:
+        print(f"⚠️  Ignoring {len(unexpected)} unexpected tensors in {component} weights")
+    return module.eval().requires_grad_(False)
+
+
+def load_shared_pipeline(model_id: str):
+    """Build a Stable Diffusion pipeline whose UNet, VAE and text encoder share mapped weights."""
+    from accelerate import init_empty_weights
+    import diffusers
+    from diffusers import StableDiffusionPipeline, UNet2DConditionModel, AutoencoderKL
+    from transformers import CLIPTextModel, CLIPTextConfig, CLIPTokenizer
+
+    model_path = resolve_model_path(model_id)
+    with open(os.path.join(model_path, "model_index.json"), "r") as f:
+        scheduler_class = getattr(diffusers, json.load(f)["scheduler"][1])
+
+    with init_empty_weights():
+        unet = UNet2DConditionModel.from_config(UNet2DConditionModel.load_config(model_path, subfolder="unet"))
+        vae = AutoencoderKL.from_config(AutoencoderKL.load_config(model_path, subfolder="vae"))
+        text_encoder = CLIPTextModel(CLIPTextConfig.from_pretrained(model_path, subfolder="text_encoder"))
+
+    unet = load_shared_component(unet, component_weights_path(model_path, "unet"), "unet")
+    vae = load_shared_component(vae, component_weights_path(model_path, "vae"), "vae")
+    text_encoder = load_shared_component(text_encoder, component_weights_path(model_path, "text_encoder"), "text_encoder")
+
+    return StableDiffusionPipeline(
+        vae=vae,
+        text_encoder=text_encoder,
+        tokenizer=CLIPTokenizer.from_pretrained(model_path, subfolder="tokenizer"),
+        unet=unet,
+        scheduler=scheduler_class.from_pretrained(model_path, subfolder="scheduler"),
+        safety_checker=None,
+        feature_extractor=None,
+        requires_safety_checker=False
+    )
+
+
+def process_memory() -> Dict[str, float]:
+    """Report this process's resident memory in MB, split into private and file-backed (shared) pages."""
+    fields = {"VmRSS": "rss_mb", "RssAnon": "rss_anon_mb", "RssFile": "rss_file_mb", "VmHWM": "peak_rss_mb"}
+    memory = {}
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in fields:
+                    memory[fields[key]] = round(int(value.split()[0]) / 1024, 1)
+    except OSError:
+        pass
+    return memory
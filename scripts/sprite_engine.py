@@ -0,0 +1,237 @@
+import os
+import sys
+import time
+from typing import Dict, List, Any, Tuple
+from PIL import Image, ImageDraw
+
+# Shapes are authored on a 32x32 design grid and scaled to the target size at draw time.
+DESIGN_GRID = 32
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+GOLD = (255, 215, 0)
+
+# Each insect is a palette, an ordered list of tagged shapes and a pose table.
+# A pose maps part names to (dx, dy) offsets on the design grid; "scale" grows
+# the whole sprite about its center and "extra" adds shapes for that pose only.
+SHAPE_SPECS: Dict[str, Dict[str, Any]] = {
+    "beetle": {
+        "palette": {"body": (139, 69, 19), "head": (101, 67, 33), "eye": BLACK, "leg": BLACK, "sparkle": GOLD},
+        "shapes": [
+            {"part": "body", "kind": "ellipse", "box": (8, 12, 24, 20), "color": "body"},
+            {"part": "head", "kind": "ellipse", "box": (10, 8, 14, 12), "color": "head"},
+            {"part": "head", "kind": "ellipse", "box": (18, 8, 22, 12), "color": "head"},
+            {"part": "head", "kind": "ellipse", "box": (11, 9, 13, 11), "color": "eye"},
+            {"part": "head", "kind": "ellipse", "box": (19, 9, 21, 11), "color": "eye"},
+            # Legs are drawn over the body, as in the original hand-drawn sprite
+            {"part": "legs_a", "kind": "line", "points": [(8, 14), (6, 16)], "color": "leg"},
+            {"part": "legs_b", "kind": "line", "points": [(24, 14), (26, 16)], "color": "leg"},
+            {"part": "legs_b", "kind": "line", "points": [(8, 16), (6, 18)], "color": "leg"},
+            {"part": "legs_a", "kind": "line", "points": [(24, 16), (26, 18)], "color": "leg"},
+            {"part": "legs_a", "kind": "line", "points": [(8, 18), (6, 20)], "color": "leg"},
+            {"part": "legs_b", "kind": "line", "points": [(24, 18), (26, 20)], "color": "leg"},
+        ],
+        "poses": {
+            "idle": {},
+            "walk_1": {"legs_a": (-1, 0), "legs_b": (1, 0)},
+            "walk_2": {"legs_a": (1, 0), "legs_b": (-1, 0)},
+            "level_2": {"scale": 1.1, "extra": [
+                {"kind": "point", "points": [(5, 8), (27, 10)], "color": "sparkle"},
+            ]},
+            "level_3": {"scale": 1.2, "extra": [
+                {"kind": "line", "points": [(12, 14), (20, 14)], "color": "sparkle"},
+                {"kind": "point", "points": [(5, 8), (27, 10), (16, 5)], "color": "sparkle"},
+            ]},
+        },
+    },
+    "butterfly": {
+        "palette": {"upper_wing": (255, 105, 180), "lower_wing": (255, 182, 193), "body": BLACK},
+        "shapes": [
+            {"part": "upper_wings", "kind": "ellipse", "box": (10, 8, 18, 12), "color": "upper_wing"},
+            {"part": "upper_wings", "kind": "ellipse", "box": (14, 8, 22, 12), "color": "upper_wing"},
+            {"part": "lower_wings", "kind": "ellipse", "box": (12, 16, 16, 20), "color": "lower_wing"},
+            {"part": "lower_wings", "kind": "ellipse", "box": (16, 16, 20, 20), "color": "lower_wing"},
+            {"part": "body", "kind": "line", "points": [(16, 6), (16, 22)], "color": "body", "width": 2},
+            {"part": "body", "kind": "ellipse", "box": (14, 6, 18, 8), "color": "body"},
+        ],
+        "poses": {
+            "idle": {},
+            "fly_1": {"upper_wings": (0, -3), "lower_wings": (0, -1)},
+            "fly_2": {"upper_wings": (0, -1)},
+            "fly_3": {"upper_wings": (0, 2), "lower_wings": (0, 2)},
+            "fly_4": {"upper_wings": (0, -2), "lower_wings": (0, 1)},
+        },
+    },
+    "ladybug": {
+        "palette": {"shell": (255, 0, 0), "spot": BLACK, "head": BLACK, "eye": WHITE, "leg": BLACK, "sparkle": GOLD},
+        "shapes": [
+            # The hand-drawn sprite had no legs; these give the walk poses something to move,
+            # tucked under the shell so only their tips show
+            {"part": "legs_a", "kind": "line", "points": [(11, 16), (9, 19)], "color": "leg"},
+            {"part": "legs_b", "kind": "line", "points": [(21, 16), (23, 19)], "color": "leg"},
+            {"part": "legs_b", "kind": "line", "points": [(13, 19), (12, 22)], "color": "leg"},
+            {"part": "legs_a", "kind": "line", "points": [(19, 19), (20, 22)], "color": "leg"},
+            {"part": "body", "kind": "ellipse", "box": (10, 12, 22, 20), "color": "shell"},
+            {"part": "body", "kind": "ellipse", "box": (13, 14, 15, 16), "color": "spot"},
+            {"part": "body", "kind": "ellipse", "box": (17, 14, 19, 16), "color": "spot"},
+            {"part": "body", "kind": "ellipse", "box": (16, 17, 18, 19), "color": "spot"},
+            {"part": "head", "kind": "ellipse", "box": (12, 8, 20, 12), "color": "head"},
+            {"part": "head", "kind": "ellipse", "box": (14, 9, 16, 11), "color": "eye"},
+            {"part": "head", "kind": "ellipse", "box": (16, 9, 18, 11), "color": "eye"},
+        ],
+        "poses": {
+            "idle": {},
+            "walk_1": {"legs_a": (-1, 0), "legs_b": (1, 0)},
+            "walk_2": {"legs_a": (1, 0), "legs_b": (-1, 0)},
+            "level_2": {"scale": 1.1, "extra": [
+                {"kind": "ellipse", "box": (12, 17, 14, 19), "color": "spot"},
+            ]},
+            "level_3": {"scale": 1.2, "extra": [
+                {"kind": "point", "points": [(14, 15), (18, 15), (17, 18)], "color": "sparkle"},
+            ]},
+        },
+    },
+    "caterpillar": {
+        "palette": {"head": (34, 139, 34), "segment": (50, 205, 50), "eye": BLACK},
+        "shapes": [
+            # Each segment overlaps the one before it, starting from the head
+            {"part": "head", "kind": "ellipse", "box": (4, 12, 12, 20), "color": "head"},
+            {"part": "segment_1", "kind": "ellipse", "box": (9, 13, 15, 19), "color": "segment"},
+            {"part": "segment_2", "kind": "ellipse", "box": (13, 13, 19, 19), "color": "segment"},
+            {"part": "segment_3", "kind": "ellipse", "box": (17, 13, 23, 19), "color": "segment"},
+            {"part": "segment_4", "kind": "ellipse", "box": (21, 13, 27, 19), "color": "segment"},
+            {"part": "head", "kind": "ellipse", "box": (6, 14, 8, 16), "color": "eye"},
+            {"part": "head", "kind": "ellipse", "box": (6, 16, 8, 18), "color": "eye"},
+        ],
+        "poses": {
+            "idle": {},
+            "crawl_1": {"segment_1": (0, -2), "segment_3": (0, -2)},
+            "crawl_2": {"segment_2": (0, -2), "segment_4": (0, -2)},
+            "crawl_3": {"head": (-1, 0), "segment_1": (0, 0), "segment_2": (1, 0), "segment_3": (2, 0), "segment_4": (3, 0)},
+        },
+    },
+    "ui_elements": {
+        "palette": {"gold": GOLD, "orange": (255, 165, 0), "white": WHITE, "red": (220, 20, 60), "pink": (255, 105, 180)},
+        "shapes": [],
+        "poses": {
+            "food_pellet": {"extra": [
+                {"kind": "ellipse", "box": (6, 6, 26, 26), "color": "gold"},
+                {"kind": "ellipse", "box": (11, 11, 21, 21), "color": "orange"},
+            ]},
+            "sparkle_effect": {"extra": [
+                {"kind": "line", "points": [(16, 2), (16, 30)], "color": "white", "width": 3},
+                {"kind": "line", "points": [(2, 16), (30, 16)], "color": "white", "width": 3},
+                {"kind": "line", "points": [(8, 8), (24, 24)], "color": "gold", "width": 2},
+                {"kind": "line", "points": [(8, 24), (24, 8)], "color": "gold", "width": 2},
+            ]},
+            "level_up_effect": {"extra": [
+                {"kind": "polygon", "points": [(16, 2), (28, 16), (21, 16), (21, 30), (11, 30), (11, 16), (4, 16)], "color": "gold"},
+                {"kind": "point", "points": [(4, 4), (28, 4), (4, 28), (28, 28)], "color": "white"},
+            ]},
+            "heart_icon": {"extra": [
+                {"kind": "ellipse", "box": (3, 5, 17, 19), "color": "red"},
+                {"kind": "ellipse", "box": (15, 5, 29, 19), "color": "red"},
+                {"kind": "polygon", "points": [(4, 15), (28, 15), (16, 29)], "color": "red"},
+                {"kind": "ellipse", "box": (7, 8, 11, 12), "color": "pink"},
+            ]},
+            "star_icon": {"extra": [
+                {"kind": "polygon", "points": [(16, 2), (20, 12), (30, 12), (22, 19), (25, 30),
+                                               (16, 23), (7, 30), (10, 19), (2, 12), (12, 12)], "color": "gold"},
+            ]},
+        },
+    },
+}
+
+
+def target_size_for(variant: str) -> Tuple[int, int]:
+    """Get the final sprite size for a variant."""
+    if "food" in variant or "heart" in variant or "star" in variant:
+        return (16, 16)
+    elif "sparkle" in variant:
+        return (24, 24)
+    return (32, 32)
+
+
+class ProceduralSpriteEngine:
+    """Render pixel art sprites directly at target size from per-insect shape specs."""
+
+    def __init__(self, specs: Dict[str, Dict[str, Any]] = None):
+        self.specs = specs or SHAPE_SPECS
+
+    def available_variants(self, insect_type: str) -> List[str]:
+        """List the poses defined for an insect type."""
+        return list(self.specs.get(insect_type, {}).get("poses", {}))
+
+    def render(self, insect_type: str, variant: str, size: Tuple[int, int] = None) -> Image.Image:
+        """Render one variant of an insect at the given size."""
+        spec = self.specs.get(insect_type, self.specs["beetle"])
+        size = size or target_size_for(variant)
+        pose = spec["poses"].get(variant, spec["poses"].get("idle", {}))
+
+        image = Image.new("RGBA", size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+
+        scale_x = size[0] / DESIGN_GRID * pose.get("scale", 1.0)
+        scale_y = size[1] / DESIGN_GRID * pose.get("scale", 1.0)
+        # Scale about the design grid center so grown sprites stay centered
+        origin_x = size[0] / 2 - DESIGN_GRID / 2 * scale_x
+        origin_y = size[1] / 2 - DESIGN_GRID / 2 * scale_y
+
+        def to_pixels(x: float, y: float, offset: Tuple[int, int]) -> Tuple[int, int]:
+            return (round(origin_x + (x + offset[0]) * scale_x), round(origin_y + (y + offset[1]) * scale_y))
+
+        for shape in spec["shapes"] + pose.get("extra", []):
+            offset = pose.get(shape.get("part"), (0, 0))
+            color = spec["palette"][shape["color"]] + (255,)
+
+            if shape["kind"] == "ellipse":
+                left, top, right, bottom = shape["box"]
+                x0, y0 = to_pixels(left, top, offset)
+                x1, y1 = to_pixels(right, bottom, offset)
+                draw.ellipse([x0, y0, x1, y1], fill=color)
+            elif shape["kind"] == "line":
+                width = max(1, round(shape.get("width", 1) * min(scale_x, scale_y)))
+                draw.line([to_pixels(x, y, offset) for x, y in shape["points"]], fill=color, width=width)
+            elif shape["kind"] == "polygon":
+                draw.polygon([to_pixels(x, y, offset) for x, y in shape["points"]], fill=color)
+            elif shape["kind"] == "point":
+                draw.point([to_pixels(x, y, offset) for x, y in shape["points"]], fill=color)
+
+        return image
+
+    def render_variants(self, insect_type: str, variants: List[str]) -> Dict[str, Image.Image]:
+        """Render a whole variant set for one insect, each at its target size."""
+        return {variant: self.render(insect_type, variant) for variant in variants}
+
+    def render_library(self, output_dir: str) -> Dict[str, List[str]]:
+        """Render every pose of every insect into output_dir as <insect>_<variant>.png."""
+        os.makedirs(output_dir, exist_ok=True)
+        written = {}
+
+        for insect_type in self.specs:
+            sprites = self.render_variants(insect_type, self.available_variants(insect_type))
+            written[insect_type] = []
+            for variant, image in sprites.items():
+                filename = f"{insect_type}_{variant}.png"
+                image.save(os.path.join(output_dir, filename), "PNG")
+                written[insect_type].append(filename)
+
+        return written
+
+
+def main():
+    """Regenerate the full procedural sprite library without any model inference."""
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else "temp_assets/procedural"
+
+    start_time = time.time()
+    written = ProceduralSpriteEngine().render_library(output_dir)
+    elapsed = time.time() - start_time
+
+    total = sum(len(files) for files in written.values())
+    print(f"🎮 Rendered {total} procedural sprites to {output_dir} in {elapsed * 1000:.1f} ms")
+    for insect_type, files in written.items():
+        print(f"   - {insect_type}: {len(files)} sprites")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import hashlib
+import random
+import threading
+from typing import Callable, Optional
+import numpy as np
+from PIL import Image, ImageDraw
+
+# Latency distributions, written as "name:param[:param]" with all values in seconds
+LATENCY_DISTRIBUTIONS = {
+    "fixed": lambda rng, seconds: seconds,
+    "uniform": lambda rng, low, high: rng.uniform(low, high),
+    "normal": lambda rng, mean, stddev: rng.gauss(mean, stddev),
+    "exponential": lambda rng, mean: rng.expovariate(1.0 / mean) if mean > 0 else 0.0,
+    # Median and log-space sigma; sigma around 1 gives the long tail real inference APIs show
+    "lognormal": lambda rng, median, sigma: rng.lognormvariate(np.log(median), sigma) if median > 0 else 0.0
+}
+
+
+def parse_latency(spec: str, seed: Optional[int] = None) -> Callable[[], float]:
+    """Build a sampler for a latency spec such as 'fixed:0.5', 'uniform:0.2:1.5' or 'lognormal:1.0:0.8'."""
+    name, *params = (spec or "fixed:0").split(":")
+    if name not in LATENCY_DISTRIBUTIONS:
+        raise ValueError(f"Unknown latency distribution '{name}', expected one of {sorted(LATENCY_DISTRIBUTIONS)}")
+    values = [float(param) for param in params]
+    distribution = LATENCY_DISTRIBUTIONS[name]
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def sample() -> float:
+        with lock:
+            return max(0.0, distribution(rng, *values))
+
+    return sample
+
+
+def synthetic_render(prompt: str, width: int, height: int) -> Image.Image:
+    """Draw a deterministic stand-in for a diffusion render: a colored subject on a white background."""
+    seed = int.from_bytes(hashlib.sha256(f"{prompt}|{width}x{height}".encode()).digest()[:8], "big")
+    rng = np.random.default_rng(seed)
+    image = Image.new("RGB", (width, height), (255, 255, 255))
+    draw = ImageDraw.Draw(image)
+
+    body = tuple(int(channel) for channel in rng.integers(30, 200, size=3))
+    margin_x, margin_y = width * rng.uniform(0.15, 0.3), height * rng.uniform(0.15, 0.3)
+    draw.ellipse([margin_x, margin_y, width - margin_x, height - margin_y], fill=body, outline=(20, 20, 20),
+                 width=max(1, width // 64))
+    for _ in range(int(rng.integers(2, 6))):
+        spot = tuple(int(channel) for channel in rng.integers(0, 255, size=3))
+        cx, cy = rng.uniform(0.35, 0.65) * width, rng.uniform(0.35, 0.65) * height
+        radius = rng.uniform(0.03, 0.08) * min(width, height)
+        draw.ellipse([cx - radius, cy - radius, cx + radius, cy + radius], fill=spot)
+    return image
+
+
+class StubBackend:
+    """Offline image backend with a configurable latency distribution and failure rate, for load runs."""
+
+    def __init__(self, latency: str = "fixed:0", failure_rate: float = 0.0, seed: Optional[int] = None):
+        self.sample_latency = parse_latency(latency, seed)
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def generate(self, prompt: str, width: int, height: int, cancel_event: threading.Event = None,
+                 timeout: float = None) -> Optional[Image.Image]:
+        """Wait out a sampled latency, then return a synthetic render or None for a simulated failure."""
+        delay = self.sample_latency()
+        with self.lock:
+            failed = self.rng.random() < self.failure_rate
+            self.calls += 1
+            call = self.calls
+        if timeout is not None and delay > timeout:
+            delay, failed = timeout, True
+        # Waiting on the cancel event lets a hedged loser stop as soon as the winner returns
+        if (cancel_event or threading.Event()).wait(delay) or failed:
+            return None
+        # Repeated prompts still get distinct images, like resampling a real model
+        return synthetic_render(f"{prompt}#{call}", width, height)
@@ -16,7 +16,7 @@ class GameRepoTransfer:
         if not self.github_token:
             raise ValueError("GITHUB_TOKEN environment variable is required")
         
-        self.api_base = "https://api.github.com"
+        self.api_base = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
         self.headers = {
             "Authorization": f"token {self.game_repo_token}",
             "Accept": "application/vnd.github.v3+json",
@@ -25,6 +25,8 @@ class GameRepoTransfer:
         
         self.assets_dir = "assets"
         self.branch_name = f"devin/{int(time.time())}-generated-assets"
+        # Pause between uploads to stay under the contents API's secondary rate limit
+        self.upload_delay = float(os.environ.get("TRANSFER_DELAY", "0.1"))
         
         print(f"🔄 Initializing transfer to {self.target_repo}")
     
@@ -128,7 +130,7 @@ class GameRepoTransfer:
                 else:
                     transfer_results["failed_uploads"].append(relative_path)
                 
-                time.sleep(0.1)
+                time.sleep(self.upload_delay)
         
         if transfer_results["total_files"] > 0:
             transfer_results["success_rate"] = len(transfer_results["successful_uploads"]) / transfer_results["total_files"] * 100
@@ -0,0 +1,211 @@
+import os
+import sys
+import json
+import time
+from typing import Dict, List, Any, Tuple
+import numpy as np
+from PIL import Image
+
+# Share of opaque pixels outside which a sprite is blank or kept its background
+MIN_COVERAGE = 0.05
+MAX_COVERAGE = 0.95
+# process_to_pixel_art quantizes to 16 colors; more means an unprocessed or noisy render
+MAX_COLORS = 16
+# Bounding box side, as a share of the sprite side, below which the subject is a speck
+MIN_BBOX_FRACTION = 0.25
+# Two frames are near-duplicates when their 64-bit dHashes are this close and almost no pixels differ
+DUPLICATE_HASH_DISTANCE = 4
+DUPLICATE_PIXEL_FRACTION = 0.01
+
+HASH_ROWS, HASH_COLUMNS = 8, 9
+
+
+def load_sprite_batch(paths: List[str]) -> np.ndarray:
+    """Stack same-sized sprites into one (N, H, W, 4) RGBA array."""
+    return np.stack([np.array(Image.open(path).convert("RGBA"), dtype=np.uint8) for path in paths])
+
+
+def compute_metrics(batch: np.ndarray) -> Dict[str, np.ndarray]:
+    """Compute coverage, color count, bounding box and dHash for a batch of sprites at once."""
+    count, height, width = batch.shape[:3]
+    opaque = batch[..., 3] > 0
+
+    coverage = opaque.mean(axis=(1, 2))
+
+    # Count distinct opaque colors per sprite: pack RGB, push transparent pixels to a sentinel, sort and count steps
+    packed = ((batch[..., 0].astype(np.int64) << 16) | (batch[..., 1].astype(np.int64) << 8) | batch[..., 2])
+    packed = np.where(opaque, packed, -1).reshape(count, -1)
+    packed.sort(axis=1)
+    steps = (np.diff(packed, axis=1) != 0) & (packed[:, 1:] >= 0)
+    colors = steps.sum(axis=1) + (packed[:, 0] >= 0)
+
+    rows, columns = opaque.any(axis=2), opaque.any(axis=1)
+    top = np.where(rows.any(axis=1), rows.argmax(axis=1), 0)
+    bottom = np.where(rows.any(axis=1), height - rows[:, ::-1].argmax(axis=1), 0)
+    left = np.where(columns.any(axis=1), columns.argmax(axis=1), 0)
+    right = np.where(columns.any(axis=1), width - columns[:, ::-1].argmax(axis=1), 0)
+
+    # Alpha-weighted luminance sampled on a 8x9 grid; each bit says whether brightness rises to the right
+    luminance = (batch[..., :3].astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32))
+    luminance *= batch[..., 3] / 255.0
+    row_index = ((np.arange(HASH_ROWS) + 0.5) * height / HASH_ROWS).astype(int)
+    column_index = ((np.arange(HASH_COLUMNS) + 0.5) * width / HASH_COLUMNS).astype(int)
+    grid = luminance[:, row_index][:, :, column_index]
+    dhash = np.packbits((grid[:, :, 1:] > grid[:, :, :-1]).reshape(count, -1), axis=1)
+
+    return {
+        "coverage": coverage,
+        "colors": colors,
+        "bbox": np.stack([left, top, right, bottom], axis=1),
+        "dhash": dhash
+    }
+
+
+def hash_distances(hashes: np.ndarray) -> np.ndarray:
+    """Pairwise Hamming distances between packed dHashes."""
+    return np.unpackbits(hashes[:, None, :] ^ hashes[None, :, :], axis=2).sum(axis=2)
+
+
+class SpriteValidator:
+    """Flag blank, background-filled, tiny or duplicated sprites of one agent and regenerate only those."""
+
+    def __init__(self, agent_dir: str):
+        self.agent_dir = agent_dir
+
+    def sprite_paths(self, derived: List[str]) -> Dict[str, Tuple[str, bool]]:
+        """Map sprite names to (path, is_derived) for the 1x sprites of the agent directory."""
+        sprites = {}
+        for file in sorted(os.listdir(self.agent_dir)):
+            # HiDPI renditions are scaled from the 1x sprite and share its verdict
+            if not file.endswith(".png") or "@" in file:
+                continue
+            name = file[:-len(".png")]
+            sprites[name] = (os.path.join(self.agent_dir, file), name in derived)
+        return sprites
+
+    def sprite_issues(self, metrics: Dict[str, np.ndarray], index: int, size: Tuple[int, int]) -> List[str]:
+        """List the quality checks one sprite fails."""
+        issues = []
+        if metrics["coverage"][index] < MIN_COVERAGE:
+            issues.append("nearly_transparent")
+        elif metrics["coverage"][index] > MAX_COVERAGE:
+            issues.append("background_not_removed")
+        if metrics["colors"][index] > MAX_COLORS:
+            issues.append("too_many_colors")
+        left, top, right, bottom = metrics["bbox"][index]
+        if metrics["coverage"][index] > 0 and (right - left < size[0] * MIN_BBOX_FRACTION and
+                                               bottom - top < size[1] * MIN_BBOX_FRACTION):
+            issues.append("subject_too_small")
+        return issues
+
+    def validate(self, derived: List[str] = None) -> Dict[str, Any]:
+        """Check every sprite; duplicates are only searched among inference (non-derived) sprites."""
+        derived = derived or []
+        sprites = self.sprite_paths(derived)
+        results = {"sprites": {}, "flagged": {}, "duplicates": []}
+
+        by_size = {}
+        for name, (path, _) in sprites.items():
+            with Image.open(path) as img:
+                by_size.setdefault(img.size, []).append(name)
+
+        for size, names in by_size.items():
+            batch = load_sprite_batch([sprites[name][0] for name in names])
+            metrics = compute_metrics(batch)
+
+            for index, name in enumerate(names):
+                results["sprites"][name] = {
+                    "coverage": round(float(metrics["coverage"][index]), 4),
+                    "colors": int(metrics["colors"][index]),
+                    "bbox": [int(value) for value in metrics["bbox"][index]],
+                    "dhash": metrics["dhash"][index].tobytes().hex()
+                }
+                issues = self.sprite_issues(metrics, index, size)
+                if issues:
+                    results["flagged"][name] = issues
+
+            # Recolored variants share their base's shape by design, so they never count as duplicates
+            candidates = [index for index, name in enumerate(names) if not sprites[name][1]]
+            if len(candidates) < 2:
+                continue
+            distances = hash_distances(metrics["dhash"][candidates])
+            opaque_pixels = batch[candidates].reshape(len(candidates), -1, 4)
+            for i, j in zip(*np.triu_indices(len(candidates), k=1)):
+                if distances[i, j] > DUPLICATE_HASH_DISTANCE:
+                    continue
+                differing = np.any(opaque_pixels[i] != opaque_pixels[j], axis=1).mean()
+                if differing >= DUPLICATE_PIXEL_FRACTION:
+                    continue
+                first, second = names[candidates[i]], names[candidates[j]]
+                results["duplicates"].append({"sprites": [first, second], "hash_distance": int(distances[i, j]),
+                                              "differing_pixels": round(float(differing), 4)})
+                results["flagged"].setdefault(second, []).append(f"duplicate_of:{first}")
+
+        return results
+
+
+def derived_names(report: Dict[str, Any]) -> List[str]:
+    """Get insect-qualified names of derived variants from a generation report."""
+    shards = report.get("shards") or [report]
+    return [f"{shard['insect_type']}_{variant}" for shard in shards for variant in shard.get("derived_assets", [])]
+
+
+def discard_outputs(agent_dir: str, name: str):
+    """Remove a sprite, its renditions and its raw render so the next run regenerates it from scratch."""
+    for directory in (agent_dir, os.path.join(agent_dir, "raw")):
+        if not os.path.isdir(directory):
+            continue
+        for file in os.listdir(directory):
+            if file == f"{name}.png" or file.startswith(f"{name}@"):
+                os.remove(os.path.join(directory, file))
+
+
+def main():
+    """Validate this agent's sprites; with --regenerate, rerun generation for flagged sprites only."""
+    agent_id = int(os.environ.get("AGENT_ID", "1"))
+    agent_dir = f"temp_assets/agent_{agent_id}"
+    retries = int(os.environ.get("VALIDATION_RETRIES", "2")) if "--regenerate" in sys.argv else 0
+    report_path = os.path.join(agent_dir, "generation_report.json")
+
+    validator = SpriteValidator(agent_dir)
+    regenerated = []
+    start_time = time.time()
+
+    for attempt in range(retries + 1):
+        with open(report_path, "r") as f:
+            generation_report = json.load(f)
+        results = validator.validate(derived_names(generation_report))
+        flagged = results["flagged"]
+        print(f"🔍 Agent {agent_id}: validated {len(results['sprites'])} sprites, {len(flagged)} flagged")
+        for name, issues in flagged.items():
+            print(f"   ⚠️  {name}: {', '.join(issues)}")
+        if not flagged or attempt == retries:
+            break
+
+        print(f"🔁 Regenerating {len(flagged)} flagged sprites (attempt {attempt + 1}/{retries})")
+        for name in flagged:
+            discard_outputs(agent_dir, name)
+        regenerated.extend(flagged)
+
+        # The journal skips every sprite that is still on disk, so only the discarded ones are rendered again
+        from generate_assets import BugBuddiesAssetGenerator
+        BugBuddiesAssetGenerator().generate_all_variants()
+
+    results.update({
+        "agent_id": agent_id,
+        "regenerated": sorted(set(regenerated)),
+        "attempts": attempt + 1,
+        "passed": not results["flagged"],
+        "validation_seconds": round(time.time() - start_time, 3)
+    })
+    with open(os.path.join(agent_dir, "validation_report.json"), "w") as f:
+        json.dump(results, f, indent=2)
+
+    if results["flagged"]:
+        print(f"❌ Agent {agent_id}: {len(results['flagged'])} sprites failed validation")
+        sys.exit(1)
+    print(f"✅ Agent {agent_id}: all sprites passed validation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import os
+import sys
+import json
+import glob
+from typing import Dict, List, Any
+from sprite_engine import target_size_for
+from asset_bundle import AssetBundle, BUNDLE_SUFFIX
+
+# Seconds for one 32px inference variant when no timing history exists yet.
+# Renders scale with pixel count, so smaller size classes are proportionally cheaper.
+DEFAULT_VARIANT_SECONDS = 60.0
+DEFAULT_DERIVED_SECONDS = 0.05
+# Fixed per-variant cost on top of the render itself (rate limiting sleep, saving)
+VARIANT_OVERHEAD_SECONDS = 2.0
+# Weight of the newest observation when folding timing reports into the cost table
+COST_SMOOTHING = 0.5
+
+COST_TABLE_PATH = "temp_assets/config/variant_costs.json"
+
+
+def frame_variants(animation_config: Dict[str, Any], insect_type: str) -> List[str]:
+    """Map an animation's frame filenames back to variant names."""
+    prefix = f"{insect_type}_"
+    return [frame[len(prefix):-len(".png")] for frame in animation_config["frames"] if frame.startswith(prefix)]
+
+
+class WorkScheduler:
+    """Split the variant catalog into N work units of balanced estimated cost."""
+
+    def __init__(self, cost_table_path: str = COST_TABLE_PATH):
+        self.cost_table_path = cost_table_path
+        self.cost_table = self.load_cost_table()
+
+    def load_cost_table(self) -> Dict[str, float]:
+        """Load learned per-variant seconds keyed by 'insect_type/variant'."""
+        if not os.path.exists(self.cost_table_path):
+            return {}
+        try:
+            with open(self.cost_table_path, "r") as f:
+                return json.load(f).get("variant_seconds", {})
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable cost table {self.cost_table_path}: {e}")
+            return {}
+
+    def learn_from_reports(self, report_paths: List[str]) -> int:
+        """Fold variant timings from generation reports, or the reports packed in bundles, into the cost table."""
+        observations = 0
+        for report_path in report_paths:
+            try:
+                report = self.load_report(report_path)
+                if report is None:
+                    continue
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Skipping unreadable report {report_path}: {e}")
+                continue
+
+            variant_backends = report.get("variant_backends", {})
+            for shard in report.get("shards") or [report]:
+                # Procedural and stub runs take milliseconds and would make real renders look free
+                method = shard.get("generation_method") or ""
+                if method == "procedural" or method.startswith("stub_"):
+                    continue
+                insect_type = shard.get("insect_type")
+                for variant, seconds in shard.get("variant_timings", {}).items():
+                    # A programmatic fallback times the failed backends, not a render
+                    if variant_backends.get(f"{insect_type}_{variant}") == "programmatic":
+                        continue
+                    key = f"{insect_type}/{variant}"
+                    previous = self.cost_table.get(key)
+                    self.cost_table[key] = round(seconds if previous is None
+                                                 else COST_SMOOTHING * seconds + (1 - COST_SMOOTHING) * previous, 3)
+                    observations += 1
+
+        return observations
+
+    def load_report(self, report_path: str) -> Dict[str, Any]:
+        """Read a generation report file, or the generation report packed in an agent bundle."""
+        if not report_path.endswith(BUNDLE_SUFFIX):
+            with open(report_path, "r") as f:
+                return json.load(f)
+        with AssetBundle(report_path) as bundle:
+            member = bundle.get("generation_report.json")
+            if member is None:
+                return None
+            with member.open() as f:
+                return json.load(f)
+
+    def save_cost_table(self):
+        """Persist the learned cost table for the next scheduling run."""
+        os.makedirs(os.path.dirname(self.cost_table_path), exist_ok=True)
+        with open(self.cost_table_path, "w") as f:
+            json.dump({"variant_seconds": self.cost_table}, f, indent=2, sort_keys=True)
+
+    def estimate_variant_cost(self, insect_type: str, variant: str, derived: bool = False) -> float:
+        """Estimate seconds for one variant, preferring learned timings over the size-class model."""
+        learned = self.cost_table.get(f"{insect_type}/{variant}")
+        if derived:
+            return learned if learned is not None else DEFAULT_DERIVED_SECONDS
+        if learned is not None:
+            return learned + VARIANT_OVERHEAD_SECONDS
+
+        width, height = target_size_for(variant)
+        return DEFAULT_VARIANT_SECONDS * (width * height) / (32 * 32) + VARIANT_OVERHEAD_SECONDS
+
+    def build_work_items(self, assignment: Dict[str, Any], animation_configs: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Split one insect assignment into the smallest items that can run on different agents.
+
+        Frames of the same animation must be generated on one agent so the GIF
+        can be assembled there, and derived variants must stay with their base.
+        """
+        insect_type = assignment["insect_type"]
+        variants = list(assignment["asset_variants"])
+        derived = assignment.get("derived_variants") or {}
+
+        # Union-find over variants that must be co-located
+        parent = {variant: variant for variant in variants}
+
+        def find(variant: str) -> str:
+            while parent[variant] != variant:
+                parent[variant] = parent[parent[variant]]
+                variant = parent[variant]
+            return variant
+
+        animation_frames = {}
+        for animation_type in assignment.get("animation_types", []):
+            config = animation_configs.get(insect_type, {}).get(animation_type)
+            if not config:
+                continue
+            frames = [frame for frame in frame_variants(config, insect_type) if frame in parent]
+            animation_frames[animation_type] = frames
+            for frame in frames[1:]:
+                parent[find(frame)] = find(frames[0])
+
+        groups = {}
+        for variant in variants:
+            groups.setdefault(find(variant), []).append(variant)
+
+        items = []
+        for members in groups.values():
+            item_derived = {name: spec for name, spec in derived.items() if spec.get("base", "idle") in members}
+            item_animations = [animation_type for animation_type, frames in animation_frames.items()
+                               if frames and frames[0] in members]
+            cost = (sum(self.estimate_variant_cost(insect_type, variant) for variant in members) +
+                    sum(self.estimate_variant_cost(insect_type, name, derived=True) for name in item_derived))
+            items.append({
+                "insect_type": insect_type,
+                "asset_variants": members,
+                "derived_variants": item_derived,
+                "animation_types": item_animations,
+                "colors": assignment.get("colors", {}),
+                "estimated_seconds": round(cost, 2)
+            })
+
+        return items
+
+    def merge_items_by_insect(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Collapse items of the same insect on one unit into a single work item."""
+        merged = {}
+        for item in items:
+            if item["insect_type"] not in merged:
+                merged[item["insect_type"]] = {**item, "asset_variants": list(item["asset_variants"]),
+                                               "derived_variants": dict(item["derived_variants"]),
+                                               "animation_types": list(item["animation_types"])}
+                continue
+            target = merged[item["insect_type"]]
+            target["asset_variants"].extend(item["asset_variants"])
+            target["derived_variants"].update(item["derived_variants"])
+            target["animation_types"].extend(item["animation_types"])
+            target["estimated_seconds"] = round(target["estimated_seconds"] + item["estimated_seconds"], 2)
+        return list(merged.values())
+
+    def plan(self, assignments: List[Dict[str, Any]], animation_configs: Dict[str, Any], agent_count: int) -> List[Dict[str, Any]]:
+        """Assign work items to agent_count units with longest-processing-time-first balancing."""
+        items = [item for assignment in assignments for item in self.build_work_items(assignment, animation_configs)]
+        items.sort(key=lambda item: (-item["estimated_seconds"], item["insect_type"], item["asset_variants"][0]))
+
+        units = [{"work_items": [], "estimated_seconds": 0.0} for _ in range(max(1, agent_count))]
+        for item in items:
+            unit = min(units, key=lambda candidate: candidate["estimated_seconds"])
+            unit["work_items"].append(item)
+            unit["estimated_seconds"] += item["estimated_seconds"]
+
+        plan = []
+        for unit in units:
+            if not unit["work_items"]:
+                continue
+            work_items = self.merge_items_by_insect(unit["work_items"])
+            plan.append({
+                "agent_id": len(plan) + 1,
+                "insect_type": "+".join(item["insect_type"] for item in work_items),
+                "description": ", ".join(f"{item['insect_type']}: {'/'.join(item['asset_variants'])}"
+                                         for item in work_items),
+                "work_items": work_items,
+                "estimated_seconds": round(unit["estimated_seconds"], 2)
+            })
+
+        return plan
+
+
+def main():
+    """Fold generation reports into the cost table: work_scheduler.py [report or bundle glob...]."""
+    patterns = sys.argv[1:] or ["temp_assets/**/generation_report.json", f"temp_assets/*{BUNDLE_SUFFIX}"]
+    scheduler = WorkScheduler()
+    report_paths = sorted({path for pattern in patterns for path in glob.glob(pattern, recursive=True)})
+    observations = scheduler.learn_from_reports(report_paths)
+    scheduler.save_cost_table()
+    print(f"📈 Learned {observations} variant timings into {scheduler.cost_table_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,28 @@
 class AssetManager {
-    constructor() {
+    constructor(options = {}) {
         this.assets = {
             characters: {},
             animations: {},
             ui: {}
         };
         this.manifest = null;
+        // Decoded assets in least- to most-recently-used order (Map keeps insertion order)
         this.loadedAssets = new Map();
         this.loadingPromises = new Map();
         this.fallbackEnabled = true;
         
+        this.memoryBudget = options.memoryBudget ?? 16 * 1024 * 1024;
+        this.assetBytes = new Map();
+        this.pinnedAssets = new Set();
+        this.cacheBytes = 0;
+        this.cacheStats = { hits: 0, misses: 0, evictions: 0, evictedBytes: 0 };
+        
+        this.revision = 0;
+        this.updateInterval = options.updateInterval ?? 60000;
+        this.updateListeners = [];
+        this.updateTimer = null;
+        this.updateCheck = null;
+        
         console.log('🎨 AssetManager initialized');
     }
     
@@ -34,11 +47,8 @@ class AssetManager {
             }
             
             this.manifest = await response.json();
-            console.log(`📋 Loaded manifest with ${this.manifest.total_assets} assets`);
-            
-            this.assets.characters = this.manifest.characters || {};
-            this.assets.animations = this.manifest.animations || {};
-            this.assets.ui = this.manifest.ui_elements || [];
+            console.log(`📋 Loaded manifest revision ${this.manifest.revision || 0} with ${this.manifest.total_assets} assets`);
+            this.useManifest(this.manifest);
             
         } catch (error) {
             console.error('❌ Failed to load asset manifest:', error);
@@ -46,19 +56,184 @@ class AssetManager {
         }
     }
     
+    useManifest(manifest) {
+        this.manifest = manifest;
+        this.revision = manifest.revision || 0;
+        this.assets.characters = manifest.characters || {};
+        this.assets.animations = manifest.animations || {};
+        this.assets.ui = manifest.ui_elements || {};
+        this.assets.environment = manifest.environment || null;
+    }
+    
+    resolveEntry(entries, name) {
+        // Manifest groups are keyed by variant name, so lookups are direct;
+        // fall back to the idle entry and then to any entry of the group.
+        if (!entries) {
+            return null;
+        }
+        return entries[name] || entries.idle || Object.values(entries)[0] || null;
+    }
+    
+    pickScale(entry, displaySize) {
+        // Choose the smallest rendition that covers the on-screen size in device pixels,
+        // so sprites are drawn without runtime upscaling on HiDPI displays
+        if (!displaySize || !entry.scales) {
+            return entry;
+        }
+        const needed = Math.ceil(displaySize * (window.devicePixelRatio || 1));
+        const renditions = [entry, ...Object.values(entry.scales)].sort((a, b) => a.width - b.width);
+        return renditions.find(rendition => rendition.width >= needed) || renditions[renditions.length - 1];
+    }
+    
+    assetUrl(entry) {
+        // The content hash busts stale browser caches when an asset is regenerated
+        return entry.sha256 ? `${entry.path}?v=${entry.sha256.slice(0, 12)}` : entry.path;
+    }
+    
+    getAssetInfo(group, insectType, variant) {
+        const entries = group === 'ui' ? this.assets.ui : this.assets[group]?.[insectType];
+        return this.resolveEntry(entries, group === 'ui' ? insectType : variant);
+    }
+    
+    decodedBytes(asset) {
+        // Decoded pixels are RGBA; animations keep every frame in memory
+        const image = asset.image || asset;
+        const width = image.naturalWidth || image.width || 0;
+        const height = image.naturalHeight || image.height || 0;
+        return width * height * 4 * (asset.frames || 1);
+    }
+    
+    async decodeImage(url) {
+        // createImageBitmap decodes off the main thread and hands back draw-ready pixels
+        if (typeof createImageBitmap === 'function') {
+            const response = await fetch(url);
+            if (!response.ok) {
+                throw new Error(`Failed to load image: ${url} (${response.status})`);
+            }
+            return createImageBitmap(await response.blob());
+        }
+        const img = new Image();
+        img.src = url;
+        await img.decode();
+        return img;
+    }
+    
+    cacheAsset(key, asset) {
+        const bytes = this.decodedBytes(asset);
+        this.loadedAssets.set(key, asset);
+        this.assetBytes.set(key, bytes);
+        this.cacheBytes += bytes;
+        this.evictToBudget(key);
+    }
+    
+    evictToBudget(keepKey) {
+        for (const key of this.loadedAssets.keys()) {
+            if (this.cacheBytes <= this.memoryBudget) {
+                break;
+            }
+            if (key === keepKey || this.isPinned(key)) {
+                continue;
+            }
+            this.cacheStats.evictedBytes += this.evictAsset(key);
+            this.cacheStats.evictions++;
+        }
+    }
+    
+    evictAsset(key) {
+        const bytes = this.assetBytes.get(key) || 0;
+        this.closeAsset(this.detachAsset(key));
+        return bytes;
+    }
+    
+    detachAsset(key) {
+        const asset = this.loadedAssets.get(key);
+        this.cacheBytes -= this.assetBytes.get(key) || 0;
+        this.loadedAssets.delete(key);
+        this.assetBytes.delete(key);
+        return asset;
+    }
+    
+    closeAsset(asset) {
+        // Closing frees the decoded pixels now instead of whenever the GC runs;
+        // a closed bitmap reports width 0, which is how holders notice and reload
+        const image = asset?.image || asset;
+        if (image && typeof image.close === 'function') {
+            image.close();
+        }
+    }
+    
+    isPinned(key) {
+        // Character pins cover every rendition of a variant, so the key's trailing width is dropped
+        return this.pinnedAssets.has(key) || this.pinnedAssets.has(key.slice(0, key.lastIndexOf('_') + 1));
+    }
+    
+    touchAsset(key) {
+        // Holders draw cached bitmaps every frame without asking again, so they report use here
+        const asset = this.loadedAssets.get(key);
+        if (asset === undefined) {
+            return false;
+        }
+        // Re-insert to mark the entry most recently used
+        this.loadedAssets.delete(key);
+        this.loadedAssets.set(key, asset);
+        return true;
+    }
+    
+    async cachedLoad(key, load) {
+        if (this.touchAsset(key)) {
+            this.cacheStats.hits++;
+            return this.loadedAssets.get(key);
+        }
+        
+        if (this.loadingPromises.has(key)) {
+            return this.loadingPromises.get(key);
+        }
+        
+        this.cacheStats.misses++;
+        const revision = this.revision;
+        const loadPromise = load();
+        this.loadingPromises.set(key, loadPromise);
+        
+        try {
+            const asset = await loadPromise;
+            // An update landed mid-load, so this may be the old revision's asset: hand it out uncached
+            if (revision === this.revision) {
+                this.cacheAsset(key, asset);
+            }
+            return asset;
+        } finally {
+            if (this.loadingPromises.get(key) === loadPromise) {
+                this.loadingPromises.delete(key);
+            }
+        }
+    }
+    
+    characterPinKey(insectType, variant) {
+        return `character_${insectType}_${variant}_`;
+    }
+    
+    characterAssetKey(insectType, variant, displaySize) {
+        const entry = this.resolveEntry(this.assets.characters[insectType], variant);
+        const rendition = entry ? this.pickScale(entry, displaySize) : null;
+        return `${this.characterPinKey(insectType, variant)}${rendition ? rendition.width : 0}`;
+    }
+    
     async preloadCriticalAssets() {
         const criticalAssets = [
-            { type: 'character', insect: 'beetle', variant: 'idle' },
-            { type: 'character', insect: 'butterfly', variant: 'idle' },
-            { type: 'character', insect: 'ladybug', variant: 'idle' },
-            { type: 'character', insect: 'caterpillar', variant: 'idle' }
+            { type: 'character', insect: 'beetle', variant: 'idle', size: 32 },
+            { type: 'character', insect: 'butterfly', variant: 'idle', size: 32 },
+            { type: 'character', insect: 'ladybug', variant: 'idle', size: 32 },
+            { type: 'character', insect: 'caterpillar', variant: 'idle', size: 32 }
         ];
         
         console.log('🔄 Preloading critical assets...');
         
         const preloadPromises = criticalAssets.map(async (asset) => {
+            // Critical sprites are drawn all the time, so eviction never touches them; insects grow
+            // as they level up, so the pin covers whichever rendition their size asks for
+            this.pinnedAssets.add(this.characterPinKey(asset.insect, asset.variant));
             try {
-                await this.getCharacterAsset(asset.insect, asset.variant);
+                await this.getCharacterAsset(asset.insect, asset.variant, asset.size);
             } catch (error) {
                 console.warn(`⚠️ Failed to preload ${asset.insect} ${asset.variant}:`, error);
             }
@@ -68,59 +243,24 @@ class AssetManager {
         console.log('✅ Critical assets preloaded');
     }
     
-    async getCharacterAsset(insectType, variant = 'idle') {
-        const assetKey = `character_${insectType}_${variant}`;
-        
-        if (this.loadedAssets.has(assetKey)) {
-            return this.loadedAssets.get(assetKey);
-        }
-        
-        if (this.loadingPromises.has(assetKey)) {
-            return this.loadingPromises.get(assetKey);
-        }
+    async getCharacterAsset(insectType, variant = 'idle', displaySize = null) {
+        const entry = this.resolveEntry(this.assets.characters[insectType], variant);
+        const rendition = entry ? this.pickScale(entry, displaySize) : null;
+        const assetKey = this.characterAssetKey(insectType, variant, displaySize);
         
-        const loadPromise = this.loadCharacterAsset(insectType, variant);
-        this.loadingPromises.set(assetKey, loadPromise);
-        
-        try {
-            const asset = await loadPromise;
-            this.loadedAssets.set(assetKey, asset);
-            this.loadingPromises.delete(assetKey);
-            return asset;
-        } catch (error) {
-            this.loadingPromises.delete(assetKey);
-            throw error;
-        }
+        return this.cachedLoad(assetKey, () => this.loadCharacterAsset(insectType, variant, rendition));
     }
     
-    async loadCharacterAsset(insectType, variant) {
+    async loadCharacterAsset(insectType, variant, entry) {
         try {
-            const characterAssets = this.assets.characters[insectType];
-            if (!characterAssets || characterAssets.length === 0) {
+            if (!entry) {
                 throw new Error(`No assets found for ${insectType}`);
             }
             
-            let assetFile = characterAssets.find(file => file.includes(variant));
-            if (!assetFile) {
-                assetFile = characterAssets.find(file => file.includes('idle'));
-                if (!assetFile) {
-                    assetFile = characterAssets[0];
-                }
-            }
-            
-            const assetPath = `assets/characters/${insectType}/${assetFile}`;
-            
-            return new Promise((resolve, reject) => {
-                const img = new Image();
-                img.onload = () => {
-                    console.log(`✅ Loaded character asset: ${assetPath}`);
-                    resolve(img);
-                };
-                img.onerror = () => {
-                    reject(new Error(`Failed to load image: ${assetPath}`));
-                };
-                img.src = assetPath;
-            });
+            const assetPath = this.assetUrl(entry);
+            const bitmap = await this.decodeImage(assetPath);
+            console.log(`✅ Loaded character asset: ${assetPath}`);
+            return bitmap;
             
         } catch (error) {
             console.error(`❌ Failed to load character asset ${insectType}/${variant}:`, error);
@@ -130,46 +270,19 @@ class AssetManager {
     
     async getAnimation(insectType, animationType = 'idle') {
         const animationKey = `animation_${insectType}_${animationType}`;
-        
-        if (this.loadedAssets.has(animationKey)) {
-            return this.loadedAssets.get(animationKey);
-        }
-        
-        if (this.loadingPromises.has(animationKey)) {
-            return this.loadingPromises.get(animationKey);
-        }
-        
-        const loadPromise = this.loadAnimation(insectType, animationType);
-        this.loadingPromises.set(animationKey, loadPromise);
-        
-        try {
-            const animation = await loadPromise;
-            this.loadedAssets.set(animationKey, animation);
-            this.loadingPromises.delete(animationKey);
-            return animation;
-        } catch (error) {
-            this.loadingPromises.delete(animationKey);
-            throw error;
-        }
+        return this.cachedLoad(animationKey, () => this.loadAnimation(insectType, animationType));
     }
     
     async loadAnimation(insectType, animationType) {
         try {
-            const animationAssets = this.assets.animations[insectType];
-            if (!animationAssets || animationAssets.length === 0) {
+            const entry = this.resolveEntry(this.assets.animations[insectType], animationType);
+            if (!entry) {
                 throw new Error(`No animations found for ${insectType}`);
             }
             
-            let animationFile = animationAssets.find(file => file.includes(animationType));
-            if (!animationFile) {
-                animationFile = animationAssets.find(file => file.includes('idle'));
-                if (!animationFile) {
-                    animationFile = animationAssets[0];
-                }
-            }
-            
-            const animationPath = `assets/animations/${insectType}/${animationFile}`;
+            const animationPath = this.assetUrl(entry);
             
+            // GIFs stay <img> elements: an ImageBitmap would keep only the first frame
             return new Promise((resolve, reject) => {
                 const img = new Image();
                 img.onload = () => {
@@ -177,7 +290,8 @@ class AssetManager {
                     resolve({
                         image: img,
                         path: animationPath,
-                        type: animationType
+                        type: animationType,
+                        frames: entry.frames
                     });
                 };
                 img.onerror = () => {
@@ -195,43 +309,231 @@ class AssetManager {
     async getUIAsset(elementName) {
         const assetKey = `ui_${elementName}`;
         
-        if (this.loadedAssets.has(assetKey)) {
-            return this.loadedAssets.get(assetKey);
-        }
-        
         try {
-            const uiFile = this.assets.ui.find(file => file.includes(elementName));
-            if (!uiFile) {
-                throw new Error(`UI asset not found: ${elementName}`);
-            }
-            
-            const assetPath = `assets/ui/${uiFile}`;
-            
-            const asset = await new Promise((resolve, reject) => {
-                const img = new Image();
-                img.onload = () => resolve(img);
-                img.onerror = () => reject(new Error(`Failed to load UI asset: ${assetPath}`));
-                img.src = assetPath;
+            return await this.cachedLoad(assetKey, async () => {
+                const entry = this.assets.ui[elementName];
+                if (!entry) {
+                    throw new Error(`UI asset not found: ${elementName}`);
+                }
+                
+                const assetPath = this.assetUrl(entry);
+                const bitmap = await this.decodeImage(assetPath);
+                console.log(`🎮 Loaded UI asset: ${assetPath}`);
+                return bitmap;
             });
             
-            this.loadedAssets.set(assetKey, asset);
-            console.log(`🎮 Loaded UI asset: ${assetPath}`);
-            return asset;
-            
         } catch (error) {
             console.error(`❌ Failed to load UI asset ${elementName}:`, error);
             throw error;
         }
     }
     
+    getEnvironmentLayout() {
+        return this.assets.environment;
+    }
+    
+    async getEnvironmentStrip() {
+        const layout = this.assets.environment;
+        if (!layout?.strip) {
+            throw new Error('No environment strip in manifest');
+        }
+        // The game keeps redrawing from the strip on resize, so it is never evicted
+        this.pinnedAssets.add('environment_strip');
+        return this.cachedLoad('environment_strip', async () => {
+            const assetPath = this.assetUrl(layout.strip);
+            const bitmap = await this.decodeImage(assetPath);
+            console.log(`🌿 Loaded environment strip: ${assetPath}`);
+            return bitmap;
+        });
+    }
+    
+    onUpdate(listener) {
+        this.updateListeners.push(listener);
+    }
+    
+    watchForUpdates(interval = this.updateInterval) {
+        if (this.updateTimer || !(interval > 0)) {
+            return;
+        }
+        this.updateTimer = setInterval(() => this.checkForUpdates(), interval);
+    }
+    
+    stopWatchingForUpdates() {
+        clearInterval(this.updateTimer);
+        this.updateTimer = null;
+    }
+    
+    async fetchJson(url) {
+        // Polled files change in place, so always ask the server rather than the HTTP cache
+        const response = await fetch(url, { cache: 'no-store' });
+        if (response.status === 404) {
+            return null;
+        }
+        if (!response.ok) {
+            throw new Error(`Failed to load ${url}: ${response.status}`);
+        }
+        return response.json();
+    }
+    
+    checkForUpdates() {
+        if (!this.updateCheck) {
+            this.updateCheck = this.runUpdateCheck().finally(() => {
+                this.updateCheck = null;
+            });
+        }
+        return this.updateCheck;
+    }
+    
+    async runUpdateCheck() {
+        if (!this.manifest) {
+            return null;
+        }
+        
+        try {
+            const delta = await this.fetchJson('assets/manifest_delta.json');
+            if (!delta || !(delta.revision > this.revision)) {
+                return null;
+            }
+            if (delta.from_revision === this.revision) {
+                return await this.applyDelta(delta);
+            }
+            
+            // Revisions were missed, so the delta does not start from ours: diff the full manifest instead
+            const manifest = await this.fetchJson('assets/manifest.json');
+            if (!manifest || !(manifest.revision > this.revision)) {
+                return null;
+            }
+            return await this.applyDelta(this.diffManifests(this.manifest, manifest), manifest);
+        } catch (error) {
+            console.warn('⚠️ Asset update check failed:', error);
+            return null;
+        }
+    }
+    
+    manifestRecords(manifest) {
+        // Same flattening as manifest_records in scripts/aggregate_assets.py
+        const records = new Map();
+        for (const group of ['characters', 'animations']) {
+            for (const [insectType, variants] of Object.entries(manifest?.[group] || {})) {
+                for (const [variant, entry] of Object.entries(variants)) {
+                    records.set(`${group}/${insectType}/${variant}`, { group, path: [insectType, variant], entry });
+                }
+            }
+        }
+        for (const [name, entry] of Object.entries(manifest?.ui_elements || {})) {
+            records.set(`ui_elements/${name}`, { group: 'ui_elements', path: [name], entry });
+        }
+        if (manifest?.environment) {
+            records.set('environment', { group: 'environment', path: [], entry: manifest.environment });
+        }
+        return records;
+    }
+    
+    entryHashes(entry) {
+        const file = entry.strip || entry;
+        const scales = Object.keys(entry.scales || {}).sort().map(scale => entry.scales[scale].sha256);
+        return [file.sha256, ...scales].join('|');
+    }
+    
+    diffManifests(previous, next) {
+        const before = this.manifestRecords(previous);
+        const after = this.manifestRecords(next);
+        const delta = { from_revision: previous?.revision || 0, revision: next.revision || 0, added: [], changed: [], removed: [] };
+        for (const [key, record] of after) {
+            if (!before.has(key)) {
+                delta.added.push({ key, ...record });
+            } else if (this.entryHashes(before.get(key).entry) !== this.entryHashes(record.entry)) {
+                delta.changed.push({ key, ...record });
+            }
+        }
+        for (const [key, record] of before) {
+            if (!after.has(key)) {
+                delta.removed.push({ key, group: record.group, path: record.path });
+            }
+        }
+        return delta;
+    }
+    
+    setManifestEntry(record, entry) {
+        if (record.group === 'environment') {
+            this.manifest.environment = entry;
+            return;
+        }
+        const group = this.manifest[record.group] ??= {};
+        const [name, variant] = record.path;
+        if (record.path.length === 1) {
+            if (entry) {
+                group[name] = entry;
+            } else {
+                delete group[name];
+            }
+            return;
+        }
+        if (entry) {
+            (group[name] ??= {})[variant] = entry;
+        } else if (group[name]) {
+            delete group[name][variant];
+            if (Object.keys(group[name]).length === 0) {
+                delete group[name];
+            }
+        }
+    }
+    
+    cacheKeyPrefix(record) {
+        // Variant lookups fall back to other entries of the insect, so any change to it invalidates all of them
+        switch (record.group) {
+            case 'characters':
+                return `character_${record.path[0]}_`;
+            case 'animations':
+                return `animation_${record.path[0]}_`;
+            case 'ui_elements':
+                return `ui_${record.path[0]}`;
+            default:
+                return 'environment_strip';
+        }
+    }
+    
+    async applyDelta(delta, manifest = null) {
+        const records = [...delta.added, ...delta.changed, ...delta.removed];
+        if (manifest) {
+            this.useManifest(manifest);
+        } else {
+            records.forEach(record => this.setManifestEntry(record, record.entry || null));
+            this.manifest.revision = delta.revision;
+            this.manifest.total_assets = [...this.manifestRecords(this.manifest).values()]
+                .filter(record => record.group !== 'environment').length;
+            this.useManifest(this.manifest);
+        }
+        
+        // Take stale assets out of the cache but keep their pixels until holders have swapped
+        const prefixes = new Set(records.map(record => this.cacheKeyPrefix(record)));
+        const isStale = key => [...prefixes].some(prefix => prefix.endsWith('_') ? key.startsWith(prefix) : key === prefix);
+        const retired = [...this.loadedAssets.keys()].filter(isStale).map(key => this.detachAsset(key));
+        [...this.loadingPromises.keys()].filter(isStale).forEach(key => this.loadingPromises.delete(key));
+        
+        const update = {
+            revision: this.revision,
+            added: delta.added,
+            changed: delta.changed,
+            removed: delta.removed,
+            insectTypes: new Set(records.filter(record => record.group === 'characters' || record.group === 'animations')
+                .map(record => record.path[0])),
+            uiElements: new Set(records.filter(record => record.group === 'ui_elements').map(record => record.path[0])),
+            environment: records.some(record => record.group === 'environment')
+        };
+        console.log(`🔄 Applying manifest revision ${update.revision}: +${delta.added.length} ~${delta.changed.length} -${delta.removed.length}`);
+        
+        await Promise.allSettled(this.updateListeners.map(listener => listener(update)));
+        retired.forEach(asset => this.closeAsset(asset));
+        return update;
+    }
+    
     isAssetAvailable(insectType, variant = 'idle') {
-        return this.assets.characters[insectType] && 
-               this.assets.characters[insectType].length > 0;
+        return this.resolveEntry(this.assets.characters[insectType], variant) !== null;
     }
     
     isAnimationAvailable(insectType, animationType = 'idle') {
-        return this.assets.animations[insectType] && 
-               this.assets.animations[insectType].length > 0;
+        return this.resolveEntry(this.assets.animations[insectType], animationType) !== null;
     }
     
     getAvailableCharacters() {
@@ -239,11 +541,13 @@ class AssetManager {
     }
     
     getAvailableAnimations(insectType) {
-        return this.assets.animations[insectType] || [];
+        return Object.keys(this.assets.animations[insectType] || {});
     }
     
     clearCache() {
-        this.loadedAssets.clear();
+        for (const key of [...this.loadedAssets.keys()]) {
+            this.evictAsset(key);
+        }
         this.loadingPromises.clear();
         console.log('🧹 Asset cache cleared');
     }
@@ -251,8 +555,17 @@ class AssetManager {
     getStats() {
         return {
             manifestLoaded: !!this.manifest,
+            revision: this.revision,
             totalAssets: this.manifest?.total_assets || 0,
             loadedAssets: this.loadedAssets.size,
+            cacheBytes: this.cacheBytes,
+            memoryBudget: this.memoryBudget,
+            pinnedAssets: this.pinnedAssets.size,
+            cacheHits: this.cacheStats.hits,
+            cacheMisses: this.cacheStats.misses,
+            cacheHitRate: this.cacheStats.hits / Math.max(1, this.cacheStats.hits + this.cacheStats.misses),
+            evictions: this.cacheStats.evictions,
+            evictedBytes: this.cacheStats.evictedBytes,
             availableCharacters: Object.keys(this.assets.characters).length,
             availableAnimations: Object.keys(this.assets.animations).length,
             fallbackEnabled: this.fallbackEnabled
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Test agent output indexing and manifest revisions in the asset aggregator."""
+
+import os
+import sys
+import json
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from asset_bundle import write_bundle
+
+
+def write_agent(root, agent_id, files):
+    """Write an agent output directory and pack it next to it as temp_assets/agent_N.bbundle."""
+    agent_dir = os.path.join(root, "packing", f"agent_{agent_id}")
+    for name, data in files.items():
+        path = os.path.join(agent_dir, *name.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+    os.makedirs(os.path.join(root, "temp_assets"), exist_ok=True)
+    write_bundle(agent_dir, os.path.join(root, "temp_assets", f"agent_{agent_id}.bbundle"))
+
+
+def make_aggregator(tmp_path, monkeypatch, **env):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("PREVIOUS_MANIFEST", raising=False)
+    monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    from aggregate_assets import AssetAggregator
+    return AssetAggregator()
+
+
+def test_bundles_are_indexed_once_per_file(tmp_path, monkeypatch):
+    """Rescans reuse an open bundle until the file is replaced, and the run closes every bundle it opened."""
+    report = {"generation_report.json": json.dumps({"insect_type": "beetle"}).encode()}
+    write_agent(str(tmp_path), 1, report)
+    aggregator = make_aggregator(tmp_path, monkeypatch)
+
+    first = aggregator.scan_agent_outputs()[1]
+    # No animation report yet, so watch mode would keep polling this agent
+    assert not aggregator.is_agent_complete(first)
+    assert aggregator.scan_agent_outputs()[1] is first
+
+    write_agent(str(tmp_path), 1, {**report, "animations/animation_report.json": b"{}"})
+    os.utime(tmp_path / "temp_assets" / "agent_1.bbundle", ns=(0, 0))
+    replaced = aggregator.scan_agent_outputs()[1]
+    assert replaced is not first and first["bundle"].map.closed
+    assert aggregator.is_agent_complete(replaced)
+
+    aggregator.close_bundles()
+    assert replaced["bundle"].map.closed
+    assert aggregator.bundle_indexes == {}
+
+
+def entry(sha, scales=None):
+    """A manifest entry with only the fields the delta compares."""
+    described = {"path": f"assets/{sha}.png", "sha256": sha}
+    if scales:
+        described["scales"] = {scale: {"sha256": scaled} for scale, scaled in scales.items()}
+    return described
+
+
+def collection(characters=None, animations=None, ui_elements=None):
+    return {"characters": characters or {}, "animations": animations or {}, "ui_elements": ui_elements or {},
+            "environment": None}
+
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_manifest_delta_lists_added_changed_and_removed():
+    """Entries are keyed by group and name; a changed HiDPI rendition alone marks its entry changed."""
+    from aggregate_assets import manifest_delta
+
+    previous = {"characters": {"beetle": {"idle": entry("a", {"2x": "a2"}), "walk_1": entry("b")}},
+                "ui_elements": {"heart_icon": entry("h")}}
+    current = {"characters": {"beetle": {"idle": entry("a", {"2x": "a2-new"}), "walk_2": entry("c")}},
+               "ui_elements": {"heart_icon": entry("h")}}
+
+    delta = manifest_delta(previous, current)
+
+    assert [record["key"] for record in delta["added"]] == ["characters/beetle/walk_2"]
+    assert [record["key"] for record in delta["changed"]] == ["characters/beetle/idle"]
+    assert delta["changed"][0]["path"] == ["beetle", "idle"] and delta["changed"][0]["entry"]["scales"]
+    assert delta["removed"] == [{"key": "characters/beetle/walk_1", "group": "characters", "path": ["beetle", "walk_1"],
+                                 "sha256": "b"}]
+    assert manifest_delta(current, current) == {"added": [], "changed": [], "removed": []}
+    assert [record["key"] for record in manifest_delta(None, current)["added"]] == [
+        "characters/beetle/idle", "characters/beetle/walk_2", "ui_elements/heart_icon"]
+
+
+def test_revision_moves_only_when_content_changes(tmp_path, monkeypatch):
+    """Each run continues from the shipped manifest, bumping the revision once and only for real changes."""
+    aggregator = make_aggregator(tmp_path, monkeypatch)
+    first = collection(characters={"beetle": {"idle": entry("a")}})
+    aggregator.generate_manifest(first)
+    assert read_json("assets/manifest.json")["revision"] == 1
+    delta = read_json("assets/manifest_delta.json")
+    assert (delta["from_revision"], delta["revision"], len(delta["added"])) == (0, 1, 1)
+
+    # A rerun over the same assets keeps the revision and publishes an empty delta
+    rerun = make_aggregator(tmp_path, monkeypatch)
+    rerun.generate_manifest(first)
+    assert read_json("assets/manifest.json")["revision"] == 1
+    assert read_json("assets/manifest_delta.json")["added"] == []
+
+    # Watch mode writes several times per run; every write diffs against the shipped revision 1
+    watcher = make_aggregator(tmp_path, monkeypatch)
+    watcher.generate_manifest(collection(characters={"beetle": {"idle": entry("a"), "walk_1": entry("b")}}))
+    watcher.generate_manifest(collection(characters={"beetle": {"idle": entry("a2"), "walk_1": entry("b")},
+                                                     "ladybug": {"idle": entry("l")}}))
+    manifest, delta = read_json("assets/manifest.json"), read_json("assets/manifest_delta.json")
+    assert manifest["revision"] == 2 and manifest["total_assets"] == 3
+    assert (delta["from_revision"], delta["revision"]) == (1, 2)
+    assert [record["key"] for record in delta["added"]] == ["characters/beetle/walk_1", "characters/ladybug/idle"]
+    assert [record["key"] for record in delta["changed"]] == ["characters/beetle/idle"]
+    assert watcher.delta_summary == {"revision": 2, "from_revision": 1, "added": 2, "changed": 1, "removed": 0}
+
+
+def test_previous_manifest_can_come_from_elsewhere(tmp_path, monkeypatch):
+    """PREVIOUS_MANIFEST points the revision base at the manifest the game repository ships."""
+    shipped = tmp_path / "shipped_manifest.json"
+    shipped.write_text(json.dumps({"revision": 7, "characters": {"beetle": {"idle": entry("a")}}}))
+    aggregator = make_aggregator(tmp_path, monkeypatch, PREVIOUS_MANIFEST=str(shipped))
+    aggregator.generate_manifest(collection())
+    delta = read_json("assets/manifest_delta.json")
+    assert (delta["from_revision"], delta["revision"]) == (7, 8)
+    assert [record["key"] for record in delta["removed"]] == ["characters/beetle/idle"]
+
+
+def test_same_inputs_write_identical_manifests(tmp_path, monkeypatch):
+    """SOURCE_DATE_EPOCH pins generated_at; without it an unchanged revision keeps its first timestamp."""
+    assets = collection(characters={"beetle": {"idle": entry("a")}})
+    pinned = make_aggregator(tmp_path, monkeypatch, SOURCE_DATE_EPOCH="1700000000")
+    pinned.generate_manifest(assets)
+    first = (tmp_path / "assets" / "manifest.json").read_bytes()
+    assert read_json("assets/manifest.json")["generated_at"] == "2023-11-14T22:13:20"
+
+    monkeypatch.delenv("SOURCE_DATE_EPOCH")
+    rerun = make_aggregator(tmp_path, monkeypatch)
+    rerun.generate_manifest(assets)
+    assert (tmp_path / "assets" / "manifest.json").read_bytes() == first
+    assert read_json("assets/manifest_delta.json")["generated_at"] == "2023-11-14T22:13:20"
+
+    changed = make_aggregator(tmp_path, monkeypatch)
+    changed.generate_manifest(collection(characters={"beetle": {"idle": entry("b")}}))
+    assert read_json("assets/manifest.json")["generated_at"] != "2023-11-14T22:13:20"
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Test packing, listing, verifying and unpacking agent output bundles."""
+
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+sys.path.append('scripts')
+
+from asset_bundle import AssetBundle, BUNDLE_HEADER, BUNDLE_MAGIC, BUNDLE_VERSION, write_bundle
+
+FILES = {
+    "beetle_idle.png": b"\x89PNG idle sprite",
+    "ui_heart_icon.png": b"\x89PNG heart",
+    "generation_report.json": json.dumps({"insect_type": "beetle"}).encode(),
+    "animations/beetle_walk.gif": b"GIF89a walk cycle",
+    "animations/animation_report.json": b"{}",
+    "raw/beetle_idle.png": b"full size render"
+}
+
+
+def make_agent_dir(root):
+    """Write a small agent output directory."""
+    agent_dir = os.path.join(root, "agent_1")
+    for name, data in FILES.items():
+        path = os.path.join(agent_dir, *name.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+    return agent_dir
+
+
+def write_raw_bundle(path, entries, payload, magic=BUNDLE_MAGIC):
+    """Write a bundle with a hand-made index, as a damaged or crafted file would look."""
+    index = json.dumps({"entries": entries}).encode()
+    with open(path, "wb") as f:
+        f.write(BUNDLE_HEADER.pack(magic, BUNDLE_VERSION, len(index)) + index + payload)
+
+
+def test_round_trip(tmp_path):
+    """Packed members list, verify and unpack to the original bytes; raw renders stay out."""
+    agent_dir = make_agent_dir(str(tmp_path))
+    bundle_path = str(tmp_path / "agent_1.bbundle")
+    stats = write_bundle(agent_dir, bundle_path)
+    assert stats["files"] == len(FILES) - 1
+
+    with AssetBundle(bundle_path) as bundle:
+        assert sorted(bundle.members) == sorted(name for name in FILES if not name.startswith("raw/"))
+        assert bundle.verify() == []
+        assert [member.name for member in bundle.of_kind("sprite")] == ["beetle_idle.png"]
+        assert [member.name for member in bundle.of_kind("ui")] == ["ui_heart_icon.png"]
+        assert [member.name for member in bundle.of_kind("animation")] == ["animations/beetle_walk.gif"]
+        with bundle.get("generation_report.json").open() as f:
+            assert json.load(f) == {"insect_type": "beetle"}
+
+    script = os.path.join("scripts", "asset_bundle.py")
+    listing = subprocess.run([sys.executable, script, "list", bundle_path], capture_output=True, text=True, check=True)
+    assert "animations/beetle_walk.gif" in listing.stdout
+
+    out_dir = str(tmp_path / "unpacked")
+    subprocess.run([sys.executable, script, "unpack", bundle_path, out_dir], capture_output=True, check=True)
+    for name, data in FILES.items():
+        path = os.path.join(out_dir, *name.split("/"))
+        if name.startswith("raw/"):
+            assert not os.path.exists(path)
+        else:
+            with open(path, "rb") as f:
+                assert f.read() == data
+
+
+def test_verify_reports_corrupt_members(tmp_path):
+    """A payload changed after packing fails verification by name."""
+    bundle_path = str(tmp_path / "agent_1.bbundle")
+    write_bundle(make_agent_dir(str(tmp_path)), bundle_path)
+    with AssetBundle(bundle_path) as bundle:
+        offset = bundle.get("beetle_idle.png").offset
+    with open(bundle_path, "r+b") as f:
+        f.seek(offset)
+        f.write(b"X")
+
+    with AssetBundle(bundle_path) as bundle:
+        assert bundle.verify() == ["beetle_idle.png"]
+
+
+def test_truncated_bundle_is_rejected(tmp_path):
+    """Files cut short in the header or inside a payload do not open."""
+    bundle_path = str(tmp_path / "agent_1.bbundle")
+    write_bundle(make_agent_dir(str(tmp_path)), bundle_path)
+    with open(bundle_path, "rb") as f:
+        data = f.read()
+
+    for length in (BUNDLE_HEADER.size - 1, len(data) - 1):
+        truncated_path = str(tmp_path / f"truncated_{length}.bbundle")
+        with open(truncated_path, "wb") as f:
+            f.write(data[:length])
+        with pytest.raises(ValueError):
+            AssetBundle(truncated_path)
+
+
+def test_bad_magic_is_rejected(tmp_path):
+    """Files that are not bundles do not open."""
+    bundle_path = str(tmp_path / "not_a_bundle.bbundle")
+    write_raw_bundle(bundle_path, [], b"", magic=b"NOTABUND")
+    with pytest.raises(ValueError, match="not an asset bundle"):
+        AssetBundle(bundle_path)
+
+
+@pytest.mark.parametrize("name", ["../escape.png", "animations/../../escape.png", "/tmp/escape.png",
+                                  "C:/escape.png", "..\\escape.png", ""])
+def test_unsafe_member_names_are_rejected(tmp_path, name):
+    """Index names that would extract outside the target directory do not open."""
+    bundle_path = str(tmp_path / "crafted.bbundle")
+    write_raw_bundle(bundle_path, [{"name": name, "kind": "other", "offset": 0, "length": 0, "sha256": ""}], b"")
+    with pytest.raises(ValueError, match="unsafe member name"):
+        AssetBundle(bundle_path)
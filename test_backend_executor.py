@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Test hedged backend racing, cancellation and the programmatic fallback."""
+
+import os
+import sys
+import time
+import threading
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from backend_executor import BackendExecutor
+from stub_backend import StubBackend
+
+# A 0.6s deadline makes the first hedge fire after 0.3s (half the deadline)
+DEADLINE = 0.6
+HEDGE_DELAY = DEADLINE / 2
+
+
+def stub(name, latency, failure_rate=0.0, calls=None):
+    """A stub backend that records when it started and whether it was told to stop."""
+    backend = StubBackend(latency=latency, failure_rate=failure_rate, seed=0)
+
+    def call(cancel_event, timeout):
+        record = {"started": time.time(), "cancel_event": cancel_event}
+        if calls is not None:
+            calls[name] = record
+        return backend.generate(name, 8, 8, cancel_event, timeout)
+
+    return name, call
+
+
+def test_hedge_fires_after_delay_and_cancels_the_loser():
+    """A slow primary gets a secondary after the hedge delay; the first result wins and the primary stops."""
+    calls = {}
+    executor = BackendExecutor(deadline=DEADLINE)
+    started = time.time()
+    image, name = executor.run([stub("slow", "fixed:5", calls=calls), stub("fast", "fixed:0.05", calls=calls)])
+    elapsed = time.time() - started
+
+    assert name == "fast" and image is not None
+    assert calls["fast"]["started"] - started >= HEDGE_DELAY - 0.05
+    assert elapsed < 1.0
+    assert calls["slow"]["cancel_event"].wait(1.0)
+    stats = executor.latency_report()
+    assert stats["fast"]["hedges"] == 1
+    assert stats["slow"]["cancelled"] == 1
+    assert stats["fast"]["successes"] == 1
+
+
+def test_first_success_wins_even_when_hedged():
+    """A primary that finishes before the hedged secondary still wins the race."""
+    calls = {}
+    executor = BackendExecutor(deadline=DEADLINE)
+    image, name = executor.run([stub("primary", "fixed:0.4", calls=calls), stub("secondary", "fixed:5", calls=calls)])
+
+    assert name == "primary" and image is not None
+    assert "secondary" in calls
+    assert calls["secondary"]["cancel_event"].wait(1.0)
+    assert executor.latency_report()["secondary"]["cancelled"] == 1
+
+
+def test_failure_hands_over_without_waiting_for_the_hedge():
+    """A failed primary launches the next backend immediately."""
+    calls = {}
+    executor = BackendExecutor(deadline=DEADLINE)
+    started = time.time()
+    image, name = executor.run([stub("broken", "fixed:0", failure_rate=1.0, calls=calls),
+                                stub("working", "fixed:0", calls=calls)])
+
+    assert name == "working" and image is not None
+    assert calls["working"]["started"] - started < HEDGE_DELAY
+    assert executor.latency_report()["broken"]["failures"] == 1
+    assert executor.latency_report()["working"]["hedges"] == 0
+
+
+def test_exceptions_count_as_failures():
+    """A raising backend hands over like a failed one."""
+    def explode(cancel_event, timeout):
+        raise RuntimeError("boom")
+
+    executor = BackendExecutor(deadline=DEADLINE)
+    image, name = executor.run([("exploding", explode), stub("working", "fixed:0")])
+    assert name == "working" and image is not None
+    assert executor.latency_report()["exploding"]["failures"] == 1
+
+
+def test_deadline_gives_up_when_nothing_finishes():
+    """Past the deadline no result is returned and the running call is cancelled."""
+    calls = {}
+    executor = BackendExecutor(deadline=0.2, hedge_percentile=None)
+    started = time.time()
+    result = executor.run([stub("stuck", "fixed:5", calls=calls)])
+
+    assert result == (None, None)
+    assert time.time() - started < 1.0
+    assert calls["stuck"]["cancel_event"].wait(1.0)
+    assert executor.latency_report()["stuck"]["timeouts"] == 1
+
+
+def test_programmatic_fallback_when_every_backend_fails(tmp_path, monkeypatch):
+    """The generator falls back to the procedural sprite when all stub backends fail."""
+    monkeypatch.chdir(tmp_path)
+    for key, value in {"AGENT_ID": "7", "INSECT_TYPE": "beetle", "ASSET_VARIANTS": '["idle"]',
+                       "USE_STUB_BACKEND": "true", "STUB_BACKENDS": "2", "STUB_FAILURE_RATE": "1",
+                       "VARIANT_DEADLINE": str(DEADLINE), "PROCEDURAL_ONLY": "false"}.items():
+        monkeypatch.setenv(key, value)
+    from generate_assets import BugBuddiesAssetGenerator
+
+    generator = BugBuddiesAssetGenerator()
+    image = generator.render_with_backends("a beetle", 256, 256, "idle")
+
+    assert image is not None and image.size == generator.get_target_size("idle")
+    assert generator.variant_backends["beetle_idle"] == "programmatic"
+    report = generator.backend_executor.latency_report()
+    assert report["stub_1"]["failures"] == 1 and report["stub_2"]["failures"] == 1
+
+
+def test_fallback_sheet_renders_each_variant(tmp_path, monkeypatch):
+    """A sheet whose backends all fail draws every variant procedurally instead of cropping one fallback sprite."""
+    monkeypatch.chdir(tmp_path)
+    for key, value in {"AGENT_ID": "7", "INSECT_TYPE": "beetle", "ASSET_VARIANTS": '["idle", "walk_1"]',
+                       "USE_STUB_BACKEND": "true", "STUB_BACKENDS": "1", "STUB_FAILURE_RATE": "1",
+                       "VARIANT_DEADLINE": str(DEADLINE), "PROCEDURAL_ONLY": "false",
+                       "TILED_GENERATION": "2x1"}.items():
+        monkeypatch.setenv(key, value)
+    from generate_assets import BugBuddiesAssetGenerator
+    from PIL import Image
+
+    generator = BugBuddiesAssetGenerator()
+    variants = ["idle", "walk_1"]
+    assert generator.generate_sprite_sheet(variants) == {"idle": True, "walk_1": True}
+
+    for variant in variants:
+        assert generator.variant_backends[f"beetle_{variant}"] == "programmatic"
+        expected = generator.generate_programmatic_sprite("beetle", variant)
+        with Image.open(generator.sprite_path(variant)) as saved:
+            assert saved.size == expected.size
+            assert saved.convert("RGBA").tobytes() == expected.tobytes()
+
+
+def make_generator(tmp_path, monkeypatch, **env):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("USE_STUB_BACKEND", raising=False)
+    for key, value in {"AGENT_ID": "7", "INSECT_TYPE": "beetle", "ASSET_VARIANTS": '["idle"]',
+                       "PROCEDURAL_ONLY": "false", "USE_HUGGINGFACE": "false", **env}.items():
+        monkeypatch.setenv(key, value)
+    from generate_assets import BugBuddiesAssetGenerator
+    return BugBuddiesAssetGenerator()
+
+
+def test_deadline_grows_with_candidate_search(tmp_path, monkeypatch):
+    """Searching K candidates at CANDIDATE_STEPS adds their steps to the time a variant may take."""
+    searching = make_generator(tmp_path, monkeypatch, VARIANT_DEADLINE="300", CANDIDATE_SEARCH="4",
+                               CANDIDATE_STEPS="4")
+    assert searching.backend_executor.deadline == 300 * (15 + 4 * 4) / 15
+    single = make_generator(tmp_path, monkeypatch, VARIANT_DEADLINE="300", CANDIDATE_SEARCH="1")
+    assert single.backend_executor.deadline == 300
+
+
+class FakePrediction:
+    """A Replicate prediction that never finishes and records whether it was cancelled."""
+
+    def __init__(self):
+        self.status = "processing"
+        self.output = None
+        self.reloads = 0
+        self.cancelled = False
+
+    def reload(self):
+        self.reloads += 1
+
+    def cancel(self):
+        self.cancelled = True
+        self.status = "canceled"
+
+
+def fake_replicate(monkeypatch, prediction):
+    import types
+
+    client = types.SimpleNamespace(predictions=types.SimpleNamespace(create=lambda version, input: prediction))
+    monkeypatch.setitem(sys.modules, "replicate", types.SimpleNamespace(Client=lambda api_token: client))
+    monkeypatch.setattr("generate_assets.REPLICATE_POLL_INTERVAL", 0.01)
+
+
+def test_replicate_stops_and_cancels_at_the_deadline(tmp_path, monkeypatch):
+    """The executor's remaining time reaches the Replicate call, which cancels its prediction when it runs out."""
+    generator = make_generator(tmp_path, monkeypatch, REPLICATE_API_KEY="key", VARIANT_DEADLINE="0.2")
+    prediction = FakePrediction()
+    fake_replicate(monkeypatch, prediction)
+
+    started = time.time()
+    image = generator.render_with_backends("a beetle", 256, 256, "idle")
+
+    assert generator.variant_backends["beetle_idle"] == "programmatic" and image is not None
+    assert time.time() - started < 2
+    # The abandoned call notices on its next poll, in the background
+    while not prediction.cancelled and time.time() - started < 2:
+        time.sleep(0.01)
+    assert prediction.cancelled and prediction.reloads > 0
+    assert generator.backend_executor.latency_report()["replicate"]["timeouts"] == 1
+
+
+def test_replicate_cancels_when_told_to_stop(tmp_path, monkeypatch):
+    generator = make_generator(tmp_path, monkeypatch, REPLICATE_API_KEY="key")
+    prediction = FakePrediction()
+    fake_replicate(monkeypatch, prediction)
+    cancel_event = threading.Event()
+    cancel_event.set()
+
+    (name, call), = generator.get_backends("a beetle", 256, 256)
+    assert name == "replicate"
+    assert call(cancel_event, 60.0) is None
+    assert prediction.cancelled and prediction.reloads == 0
+
+    # Called directly, the timeout it is handed still bounds the wait
+    prediction = FakePrediction()
+    fake_replicate(monkeypatch, prediction)
+    assert call(threading.Event(), 0.05) is None
+    assert prediction.cancelled and prediction.reloads > 0
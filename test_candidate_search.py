@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Test candidate scoring and the generator's search-then-refine loop."""
+
+import os
+import sys
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from candidate_scoring import score_candidates
+
+COLORS = {"primary": "#8B4513", "secondary": "#654321"}
+
+
+def sprite(box, color=(139, 69, 19), size=32):
+    """A transparent sprite with one flat rectangle."""
+    pixels = np.zeros((size, size, 4), dtype=np.uint8)
+    left, top, right, bottom = box
+    pixels[top:bottom, left:right] = color + (255,)
+    return pixels
+
+
+def test_coverage_prefers_a_well_framed_subject():
+    """The subject closest to the ideal share of the frame scores highest on coverage."""
+    batch = np.stack([sprite((14, 14, 18, 18)), sprite((6, 6, 26, 26)), sprite((0, 0, 32, 32))])
+    coverage = score_candidates(batch)["coverage"]
+    assert coverage.argmax() == 1
+    assert coverage[2] < coverage[1] and coverage[0] < coverage[1]
+
+
+def test_palette_fit_counts_only_when_colors_are_given():
+    """On-palette subjects win with matrix colors; without them palette_fit does not weigh in."""
+    batch = np.stack([sprite((6, 6, 26, 26)), sprite((6, 6, 26, 26), color=(0, 0, 255))])
+    with_colors = score_candidates(batch, COLORS)
+    assert list(with_colors["palette_fit"]) == [1.0, 0.0]
+    assert with_colors["score"][0] > with_colors["score"][1]
+
+    without_colors = score_candidates(batch)
+    assert list(without_colors["palette_fit"]) == [0.0, 0.0]
+    assert without_colors["score"][0] == without_colors["score"][1]
+
+
+def test_crispness_prefers_hard_edges_over_ramps():
+    """Hard two-tone edges score as crisp; a soft gradient of the same extent does not."""
+    crisp = sprite((6, 6, 26, 26))
+    crisp[6:26, 16:26, :3] = (0, 0, 0)
+    soft = sprite((6, 6, 26, 26))
+    soft[6:26, 6:26, :3] = np.linspace(40, 200, 20, dtype=np.uint8)[None, :, None]
+    crispness = score_candidates(np.stack([crisp, soft]))["crispness"]
+    assert crispness[0] == 1.0
+    assert crispness[1] == 0.0
+
+
+def render(subject_box, size=(256, 256), background=(200, 230, 255)):
+    """A fake render: a brown subject on a flat background, as a diffusion backend would return."""
+    image = Image.new("RGB", size, background)
+    if subject_box:
+        ImageDraw.Draw(image).rectangle(subject_box, fill=(139, 69, 19), outline=(0, 0, 0), width=8)
+    return image
+
+
+def test_search_refines_the_best_scoring_seed(tmp_path, monkeypatch):
+    """K low-step candidates are scored as sprites and only the winning seed is rendered at full steps."""
+    monkeypatch.chdir(tmp_path)
+    for key, value in {"AGENT_ID": "6", "INSECT_TYPE": "beetle", "ASSET_VARIANTS": '["idle"]',
+                       "PROCEDURAL_ONLY": "true", "CANDIDATE_SEARCH": "3", "CANDIDATE_STEPS": "4",
+                       "ASSET_COLORS": '{"primary": "#8B4513", "secondary": "#654321"}'}.items():
+        monkeypatch.setenv(key, value)
+    from generate_assets import BugBuddiesAssetGenerator
+
+    generator = BugBuddiesAssetGenerator()
+    calls = []
+    # An empty frame, a speck, and a well-framed subject
+    candidates = [render(None), render((120, 120, 136, 136)), render((48, 48, 208, 208))]
+
+    def fake_run_diffusion(prompt, width, height, steps, seeds=None, cancel_event=None, decoder="vae", monitor=None):
+        calls.append({"steps": steps, "seeds": list(seeds), "monitor": monitor})
+        return candidates[:len(seeds)] if len(seeds) > 1 else [render((48, 48, 208, 208), background=(255, 255, 255))]
+
+    generator.run_diffusion = fake_run_diffusion
+    result = generator.search_candidates("a beetle", 256, 256, "idle", monitor="monitor")
+
+    assert [call["steps"] for call in calls] == [4, generator.inference_steps]
+    assert len(calls[0]["seeds"]) == 3 and calls[0]["monitor"] is None
+    report = generator.candidate_reports["beetle_idle"]
+    assert report["winner"] == 2
+    assert calls[1]["seeds"] == [calls[0]["seeds"][2]] and calls[1]["monitor"] == "monitor"
+    assert report["seeds"] == calls[0]["seeds"]
+    assert set(report["scores"]) >= {"score", "coverage", "palette_fit", "crispness"}
+    assert result.size == (256, 256)
+
+
+def test_search_gives_up_when_cancelled(tmp_path, monkeypatch):
+    """No candidates (a cancelled batch) means no refine pass and no result."""
+    monkeypatch.chdir(tmp_path)
+    for key, value in {"AGENT_ID": "6", "INSECT_TYPE": "beetle", "ASSET_VARIANTS": '["idle"]',
+                       "PROCEDURAL_ONLY": "true", "CANDIDATE_SEARCH": "2"}.items():
+        monkeypatch.setenv(key, value)
+    from generate_assets import BugBuddiesAssetGenerator
+
+    generator = BugBuddiesAssetGenerator()
+    calls = []
+    generator.run_diffusion = lambda *args, **kwargs: calls.append(args) or None
+    assert generator.search_candidates("a beetle", 256, 256, "idle") is None
+    assert len(calls) == 1 and generator.candidate_reports == {}
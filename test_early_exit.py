@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Test the early exit convergence monitor and what a stopped diffusion run decodes."""
+
+import os
+import sys
+import types
+
+import numpy as np
+import torch
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from early_exit import EarlyExitMonitor, preview_sprites
+from latent_decoder import LatentDecoder, linear_decode
+
+STEPS = 20
+LATENT_SIZE = 32
+
+
+class FakeScheduler:
+    """Each step's x0 prediction settles on a clean latent while the sample keeps full-strength noise."""
+
+    def __init__(self, seed=0):
+        generator = torch.Generator("cpu").manual_seed(seed)
+        self.clean = torch.randn(1, 4, LATENT_SIZE, LATENT_SIZE, generator=generator) * 2
+        self.noise = torch.randn(1, 4, LATENT_SIZE, LATENT_SIZE, generator=generator)
+
+    def step(self, model_output, timestep, sample, return_dict=True):
+        x0 = self.clean + 0.5 ** (timestep + 1) * self.noise
+        prev_sample = x0 + self.noise
+        if not return_dict:
+            return prev_sample, x0
+        return types.SimpleNamespace(prev_sample=prev_sample, pred_original_sample=x0)
+
+
+class FakePipeline:
+    """The denoising loop of a diffusers pipeline: scheduler step, step-end callback, interrupt flag."""
+
+    def __init__(self):
+        self.scheduler = FakeScheduler()
+        self.vae = None
+        self.steps_run = 0
+
+    def __call__(self, num_inference_steps, callback_on_step_end, **kwargs):
+        self._interrupt = False
+        latents = torch.zeros(1, 4, LATENT_SIZE, LATENT_SIZE)
+        for step in range(num_inference_steps):
+            if self._interrupt:
+                continue
+            latents = self.scheduler.step(torch.zeros_like(latents), step, latents, return_dict=False)[0]
+            self.steps_run += 1
+            latents = callback_on_step_end(self, step, step, {"latents": latents}).pop("latents", latents)
+        return types.SimpleNamespace(images=latents)
+
+
+class RecordingMonitor(EarlyExitMonitor):
+    """Remembers the latents of its last check."""
+
+    def check(self, step, latents):
+        self.last_latents = latents
+        return super().check(step, latents)
+
+
+def make_generator(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for key, value in {"AGENT_ID": "1", "INSECT_TYPE": "beetle", "ASSET_VARIANTS": '["idle"]',
+                       "PROCEDURAL_ONLY": "true", "EARLY_EXIT": "true"}.items():
+        monkeypatch.setenv(key, value)
+    from generate_assets import BugBuddiesAssetGenerator
+
+    generator = BugBuddiesAssetGenerator()
+    generator.pipeline = FakePipeline()
+    generator.latent_decoder = LatentDecoder(generator.pipeline)
+    return generator
+
+
+def test_stopped_run_decodes_the_previewed_prediction(tmp_path, monkeypatch):
+    """An early stop decodes the predicted clean latents the monitor compared, not the noisy sample."""
+    generator = make_generator(tmp_path, monkeypatch)
+    pipeline = generator.pipeline
+    monitor = RecordingMonitor((LATENT_SIZE, LATENT_SIZE), STEPS)
+
+    images = generator.run_diffusion("a beetle", 256, 256, STEPS, decoder="linear", monitor=monitor)
+
+    assert monitor.stopped_at is not None and monitor.stopped_at < STEPS
+    assert pipeline.steps_run == monitor.stopped_at
+    compared = monitor.last_latents
+    assert torch.equal(compared, pipeline.scheduler.clean + 0.5 ** monitor.stopped_at * pipeline.scheduler.noise)
+    assert np.array_equal(preview_sprites(compared, monitor.preview_size), monitor.previous)
+    assert images[0].tobytes() == linear_decode(compared)[0].tobytes()
+    assert images[0].tobytes() != linear_decode(compared + pipeline.scheduler.noise)[0].tobytes()
+    # The scheduler's own step is back in place for the next run
+    assert "step" not in vars(pipeline.scheduler)
+
+
+def settling_latents(step, batch=1, settle_at=6, seed=1):
+    """Latents whose noise shrinks each step and is gone from step settle_at on."""
+    generator = torch.Generator("cpu").manual_seed(seed)
+    clean = torch.randn(batch, 4, 8, 8, generator=generator) * 3
+    noise = torch.randn(batch, 4, 8, 8, generator=generator) * 3
+    return clean + (0.0 if step >= settle_at else 1.0 / (step + 1)) * noise
+
+
+def first_stop(monitor, steps, **kwargs):
+    """Run the monitor over settling latents and return the step it stopped after, if any."""
+    for step in range(steps):
+        if monitor.check(step, settling_latents(step, **kwargs)):
+            return step
+    return None
+
+
+def test_preview_keys_out_the_corner_background():
+    """Previews are posterized codes at sprite size, with the dominant corner color marked transparent."""
+    latents = torch.zeros(2, 4, 8, 8)
+    latents[:, 0, 2:6, 2:6] = 3.0
+    sprites = preview_sprites(latents, (4, 4))
+    assert sprites.shape == (2, 4, 4)
+    assert (sprites[:, 0, 0] == -1).all() and (sprites[:, 1:3, 1:3] != -1).all()
+
+
+def test_monitor_checks_on_the_interval_and_never_at_the_last_step():
+    monitor = EarlyExitMonitor((8, 8), steps=6, interval=2, tolerance=1.0, stable_checks=1)
+    # Previews after steps 1 and 3; the second is within tolerance and stops the run there
+    assert first_stop(monitor, 6) == 3 and monitor.stopped_at == 4
+    assert monitor.report() == {"steps": 6, "steps_run": 4, "steps_saved": 2, "changes": monitor.changes}
+    assert len(monitor.changes) == 1
+
+    # Even a settled run is not stopped after its last step
+    late = EarlyExitMonitor((8, 8), steps=4, interval=1, tolerance=1.0, stable_checks=1)
+    assert [late.check(step, settling_latents(step)) for step in range(4)] == [False, True, True, False]
+    assert not EarlyExitMonitor((8, 8), steps=2, interval=1, tolerance=1.0, stable_checks=0).check(1, settling_latents(1))
+
+
+def test_monitor_needs_consecutive_stable_checks():
+    """A change above tolerance resets the count; the run stops only after stable_checks quiet previews."""
+    monitor = EarlyExitMonitor((8, 8), steps=20, interval=1, tolerance=0.0, stable_checks=2)
+    # Step 6 is the first clean preview; steps 7 and 8 are the two quiet checks
+    assert first_stop(monitor, 20) == 8 and monitor.stopped_at == 9
+    assert monitor.changes[-2:] == [0.0, 0.0] and max(monitor.changes[:-2]) > 0.0
+
+
+def test_least_settled_image_of_a_batch_decides():
+    """A batch stops only when every image in it has settled."""
+    monitor = EarlyExitMonitor((8, 8), steps=20, interval=1, tolerance=0.0, stable_checks=1)
+    # The second image is first clean at step 9 and quiet at step 10
+    for step in range(20):
+        latents = torch.cat([settling_latents(step, settle_at=2, seed=1), settling_latents(step, settle_at=9, seed=2)])
+        if monitor.check(step, latents):
+            break
+    assert monitor.stopped_at == 11
+
+
+def test_full_run_reports_no_savings():
+    monitor = EarlyExitMonitor((8, 8), steps=4, interval=2)
+    assert not any(monitor.check(step, torch.randn(1, 4, 8, 8)) for step in range(4))
+    assert monitor.report() == {"steps": 4, "steps_run": 4, "steps_saved": 0, "changes": []}
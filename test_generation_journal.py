@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Test the resume journal: spec digests, torn lines, and resuming or reprocessing generator runs."""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from generation_journal import GenerationJournal, JOURNAL_FILENAME, spec_digest
+
+SPEC = {"prompt": "a beetle", "render_size": [512, 512], "colors": {"primary": "#8B4513"}}
+
+
+def write_output(path, data=b"sprite"):
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def make_generator(tmp_path, monkeypatch, **env):
+    monkeypatch.chdir(tmp_path)
+    settings = {"AGENT_ID": "3", "INSECT_TYPE": "beetle", "ASSET_VARIANTS": '["idle", "walk_1"]',
+                "PROCEDURAL_ONLY": "true", "USE_STUB_BACKEND": "false", "VARIANT_PAUSE": "0",
+                "HIDPI_SCALES": "1,2"}
+    settings.update(env)
+    for key, value in settings.items():
+        monkeypatch.setenv(key, value)
+    from generate_assets import BugBuddiesAssetGenerator
+    return BugBuddiesAssetGenerator()
+
+
+def test_spec_digest_ignores_key_order():
+    assert spec_digest({"a": 1, "b": [2, 3]}) == spec_digest({"b": [2, 3], "a": 1})
+    assert spec_digest({"a": 1}) != spec_digest({"a": 2})
+
+
+def test_entry_is_complete_only_while_spec_and_file_match(tmp_path):
+    """A changed spec or an output rewritten after journaling makes the variant incomplete."""
+    journal = GenerationJournal(str(tmp_path))
+    output = write_output(str(tmp_path / "beetle_idle.png"))
+    journal.record("beetle", "idle", output, SPEC)
+
+    assert journal.completed_entry("beetle", "idle", dict(SPEC))["output"] == output
+    assert journal.completed_entry("beetle", "idle", {**SPEC, "prompt": "a shiny beetle"}) is None
+    assert journal.completed_entry("beetle", "walk_1", SPEC) is None
+
+    write_output(output, b"edited sprite")
+    assert journal.completed_entry("beetle", "idle", SPEC) is None
+    os.remove(output)
+    assert journal.completed_entry("beetle", "idle", SPEC) is None
+
+
+def test_torn_trailing_line_is_skipped_and_terminated(tmp_path):
+    """A crash mid-append loses only the torn line; the next record starts on a fresh line."""
+    output = write_output(str(tmp_path / "beetle_idle.png"))
+    GenerationJournal(str(tmp_path)).record("beetle", "idle", output, SPEC)
+    with open(tmp_path / JOURNAL_FILENAME, "a") as f:
+        f.write('{"insect_type": "beetle", "vari')
+
+    journal = GenerationJournal(str(tmp_path))
+    assert list(journal.entries) == ["beetle/idle"]
+    journal.record("beetle", "walk_1", write_output(str(tmp_path / "beetle_walk_1.png")), SPEC)
+
+    reloaded = GenerationJournal(str(tmp_path))
+    assert sorted(reloaded.entries) == ["beetle/idle", "beetle/walk_1"]
+    assert reloaded.completed_entry("beetle", "walk_1", SPEC) is not None
+
+
+def test_latest_record_wins(tmp_path):
+    output = write_output(str(tmp_path / "beetle_idle.png"))
+    journal = GenerationJournal(str(tmp_path))
+    journal.record("beetle", "idle", output, SPEC)
+    journal.record("beetle", "idle", output, {**SPEC, "render_size": [256, 256]})
+
+    reloaded = GenerationJournal(str(tmp_path))
+    assert reloaded.completed_entry("beetle", "idle", SPEC) is None
+    assert reloaded.completed_entry("beetle", "idle", {**SPEC, "render_size": [256, 256]}) is not None
+
+
+def test_rerun_resumes_finished_variants(tmp_path, monkeypatch):
+    """A second run with the same settings skips every journaled variant; new colors redo them."""
+    first = make_generator(tmp_path, monkeypatch).generate_variant_set()
+    assert first["generated_assets"] == ["idle", "walk_1"] and first["resumed_assets"] == []
+
+    second = make_generator(tmp_path, monkeypatch).generate_variant_set()
+    assert second["resumed_assets"] == ["idle", "walk_1"]
+    assert second["generated_assets"] == ["idle", "walk_1"]
+
+    recolored = make_generator(tmp_path, monkeypatch, ASSET_COLORS='{"primary": "#000000"}').generate_variant_set()
+    assert recolored["resumed_assets"] == []
+
+
+def test_post_processing_change_reuses_raw_renders(tmp_path, monkeypatch):
+    """New output sizes rebuild sprites from the journaled raw renders without calling a backend again."""
+    stub = {"PROCEDURAL_ONLY": "false", "USE_STUB_BACKEND": "true", "STUB_BACKENDS": "1",
+            "STUB_FAILURE_RATE": "0", "ASSET_VARIANTS": '["idle"]'}
+    first = make_generator(tmp_path, monkeypatch, **stub).generate_variant_set()
+    assert first["generated_assets"] == ["idle"]
+    assert os.path.exists(os.path.join("temp_assets", "agent_3", "raw", "beetle_idle.png"))
+
+    generator = make_generator(tmp_path, monkeypatch, HIDPI_SCALES="1,2,3", **stub)
+    second = generator.generate_variant_set()
+    assert second["resumed_assets"] == []
+    assert second["reprocessed_assets"] == ["idle"]
+    assert generator.backend_executor.latency_report() == {}
+    assert os.path.exists(generator.sprite_path("idle", "@3x"))
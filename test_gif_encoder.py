@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Test that the delta-frame GIF encoder decodes losslessly with PIL."""
+
+import io
+import sys
+
+import numpy as np
+from PIL import Image
+
+sys.path.append('scripts')
+
+from gif_encoder import encode_gif, DISPOSAL_BACKGROUND, DISPOSAL_NONE
+
+
+def decode_frames(data):
+    """Decode every frame of a GIF into RGBA arrays, with per-frame durations in ms."""
+    frames, durations = [], []
+    with Image.open(io.BytesIO(data)) as image:
+        for index in range(image.n_frames):
+            image.seek(index)
+            frames.append(normalize(np.asarray(image.convert("RGBA"))))
+            durations.append(image.info.get("duration"))
+    return frames, durations
+
+
+def normalize(frame):
+    """Collapse alpha to fully opaque or fully transparent black, as GIF stores it."""
+    frame = frame.copy()
+    transparent = frame[..., 3] < 128
+    frame[transparent] = 0
+    frame[~transparent, 3] = 255
+    return frame
+
+
+def disposal_methods(data):
+    """Disposal method of each frame, read from its graphic control extension."""
+    methods, position = [], data.find(b"\x21\xf9\x04")
+    while position != -1:
+        methods.append((data[position + 3] >> 2) & 0x07)
+        position = data.find(b"\x21\xf9\x04", position + 1)
+    return methods
+
+
+def sprite_frame(size, box, color):
+    """A transparent frame with one opaque rectangle."""
+    frame = np.zeros((size, size, 4), dtype=np.uint8)
+    left, top, right, bottom = box
+    frame[top:bottom, left:right] = color + (255,)
+    return frame
+
+
+def assert_round_trip(frames, data):
+    decoded, _ = decode_frames(data)
+    assert len(decoded) == len(frames)
+    for index, (expected, actual) in enumerate(zip(frames, decoded)):
+        assert np.array_equal(normalize(expected), actual), f"frame {index} differs"
+
+
+def test_moving_sprite_round_trips():
+    """Delta frames rebuild every frame exactly, storing less than full frames."""
+    frames = [sprite_frame(32, (4 + step * 3, 10, 12 + step * 3, 18), (139, 69, 19)) for step in range(4)]
+    for frame in frames:
+        frame[12:14, 6:30] = (0, 0, 0, 255)
+    data, stats = encode_gif([Image.fromarray(frame, "RGBA") for frame in frames], 0.1)
+    assert_round_trip(frames, data)
+    assert stats["stored_frames"] == 4
+    assert stats["stored_pixels"] < stats["full_frame_pixels"]
+    assert not stats["quantized"]
+
+
+def test_unchanged_pixels_use_the_transparent_index():
+    """A small change stores only its bounding box, with unchanged pixels left transparent."""
+    first = sprite_frame(16, (2, 2, 14, 14), (255, 0, 0))
+    second = first.copy()
+    second[7:9, 7:9] = (0, 0, 255, 255)
+    data, stats = encode_gif([Image.fromarray(first, "RGBA"), Image.fromarray(second, "RGBA")], 0.1)
+    assert_round_trip([first, second], data)
+    assert stats["stored_pixels"] == 12 * 12 + 2 * 2
+
+
+def test_disposal_clears_pixels_that_turn_transparent():
+    """Pixels that become transparent are cleared by disposing the previous frame to background."""
+    frames = [sprite_frame(16, (0, 0, 16, 16), (0, 128, 0)), sprite_frame(16, (4, 4, 8, 8), (0, 128, 0)),
+              sprite_frame(16, (10, 10, 14, 14), (255, 215, 0))]
+    data, _ = encode_gif([Image.fromarray(frame, "RGBA") for frame in frames], 0.1)
+    assert_round_trip(frames, data)
+    assert disposal_methods(data) == [DISPOSAL_BACKGROUND, DISPOSAL_BACKGROUND, DISPOSAL_NONE]
+
+
+def test_identical_frames_are_merged():
+    """Consecutive duplicates become one frame showing for their combined duration."""
+    still = sprite_frame(8, (2, 2, 6, 6), (255, 255, 255))
+    moved = sprite_frame(8, (3, 2, 7, 6), (255, 255, 255))
+    data, stats = encode_gif([Image.fromarray(frame, "RGBA") for frame in (still, still, still, moved)],
+                             [0.1, 0.1, 0.2, 0.1])
+    decoded, durations = decode_frames(data)
+    assert stats["stored_frames"] == 2
+    assert durations == [400, 100]
+    assert np.array_equal(decoded[0], normalize(still))
+    assert np.array_equal(decoded[1], normalize(moved))
+
+
+def test_large_palette_round_trips_through_lzw_table_resets():
+    """A 255-color noisy frame fills the 4096-code LZW table several times and still decodes exactly."""
+    rng = np.random.default_rng(0)
+    palette = rng.integers(0, 256, size=(255, 3)).astype(np.uint8)
+    rgb = palette[rng.integers(0, 255, size=(120, 120))]
+    opaque = np.full((120, 120), 255, np.uint8)
+    frames = [np.dstack([rgb, opaque]), np.dstack([rgb[::-1], opaque])]
+    data, stats = encode_gif([Image.fromarray(frame, "RGBA") for frame in frames], 0.1)
+    assert_round_trip(frames, data)
+    assert not stats["quantized"]
+
+
+def test_more_than_255_colors_are_quantized_keeping_transparency():
+    """Over-budget colors are merged, but the opaque silhouette is kept exactly."""
+    rng = np.random.default_rng(1)
+    frame = np.dstack([rng.integers(0, 256, size=(24, 24, 3)), np.full((24, 24), 255)]).astype(np.uint8)
+    frame[:6] = 0
+    data, stats = encode_gif([Image.fromarray(frame, "RGBA")], 0.1)
+    decoded, _ = decode_frames(data)
+    assert stats["quantized"]
+    assert stats["palette_colors"] <= 255
+    assert np.array_equal(decoded[0][..., 3], normalize(frame)[..., 3])
+
+
+def test_loop_extension():
+    """Looping animations carry the NETSCAPE2.0 extension; one-shot ones do not."""
+    frame = Image.fromarray(sprite_frame(4, (0, 0, 2, 2), (1, 2, 3)), "RGBA")
+    looping, _ = encode_gif([frame], 0.1, loop=True)
+    once, _ = encode_gif([frame], 0.1, loop=False)
+    assert b"NETSCAPE2.0" in looping
+    assert b"NETSCAPE2.0" not in once
+    with Image.open(io.BytesIO(looping)) as image:
+        assert image.info.get("loop") == 0
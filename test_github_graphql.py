@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Test the GraphQL PR status client against the fake GitHub API."""
+
+import os
+import sys
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from fake_github_api import start_fake_github
+from github_graphql import PAGE_SIZE, PRStatusClient, graphql_url_for, normalize_check
+
+REPO = "octo/bug-buddies"
+
+
+@pytest.fixture
+def github():
+    server, state, url = start_fake_github(check_polls=1)
+    yield state, url
+    server.shutdown()
+    server.server_close()
+
+
+def open_pull(url, branch, title):
+    """Create a branch and open a PR from it through the fake REST API."""
+    base = requests.get(f"{url}/repos/{REPO}/git/refs/heads/main", timeout=5).json()["object"]["sha"]
+    requests.post(f"{url}/repos/{REPO}/git/refs", json={"ref": f"refs/heads/{branch}", "sha": base}, timeout=5)
+    response = requests.post(f"{url}/repos/{REPO}/pulls", timeout=5,
+                             json={"title": title, "head": branch, "base": "main"})
+    return response.json()
+
+
+def test_graphql_url_for_github_and_enterprise():
+    assert graphql_url_for("https://api.github.com") == "https://api.github.com/graphql"
+    assert graphql_url_for("https://ghe.example.com/api/v3/") == "https://ghe.example.com/api/graphql"
+
+
+def test_find_open_pr_pages_until_a_match(github):
+    """The newest matching PR is returned; a match past the first page costs one more request."""
+    state, url = github
+    open_pull(url, "generated-assets-1", "AI-Generated Assets")
+    for index in range(PAGE_SIZE):
+        open_pull(url, f"feature-{index}", f"Feature {index}")
+    client = PRStatusClient("token", REPO, graphql_url=f"{url}/graphql")
+
+    pull = client.find_open_pr(lambda pull: "generated-assets" in pull["headRefName"])
+    assert pull["number"] == 1 and pull["title"] == "AI-Generated Assets"
+    assert client.requests_made == 2
+
+    assert client.find_open_pr(lambda pull: pull["headRefName"] == "feature-49")["number"] == PAGE_SIZE + 1
+    assert client.requests_made == 3
+    assert client.find_open_pr(lambda pull: False) is None
+
+
+def test_pr_status_reports_checks_and_mergeability_in_one_request(github):
+    """A PR's identity, mergeability and check runs come back in REST shape; checks finish on a later poll."""
+    state, url = github
+    created = open_pull(url, "generated-assets-2", "AI-Generated Assets")
+    client = PRStatusClient("token", REPO, graphql_url=f"{url}/graphql")
+
+    first = client.pr_status(created["number"])
+    assert first["pr"] == {"number": 1, "title": "AI-Generated Assets", "state": "open", "merged": False,
+                           "head": {"ref": "generated-assets-2", "sha": created["head"]["sha"]}}
+    assert first["mergeable"] and first["mergeable_state"] == "clean"
+    assert first["checks"] == [{"name": "build", "status": "in_progress", "conclusion": None}]
+    assert client.requests_made == 1
+
+    second = client.pr_status(created["number"])
+    assert second["checks"] == [{"name": "build", "status": "completed", "conclusion": "success"}]
+    assert client.requests_made == 2
+    assert state.stats()["endpoints"]["graphql:PullRequestStatus"]["requests"] == 2
+
+
+def test_missing_pr_and_graphql_errors_raise(github):
+    _, url = github
+    client = PRStatusClient("token", REPO, graphql_url=f"{url}/graphql")
+    with pytest.raises(RuntimeError, match="not found"):
+        client.pr_status(42)
+    with pytest.raises(RuntimeError, match="Unsupported operation"):
+        client.query("DeleteEverything", "query { viewer { login } }", {})
+
+
+def test_graphql_url_follows_github_api_url(monkeypatch):
+    monkeypatch.delenv("GITHUB_GRAPHQL_URL", raising=False)
+    monkeypatch.setenv("GITHUB_API_URL", "http://127.0.0.1:8765")
+    assert PRStatusClient("token", REPO).graphql_url == "http://127.0.0.1:8765/graphql"
+
+
+@pytest.mark.parametrize("state,expected", [("SUCCESS", ("completed", "success")), ("FAILURE", ("completed", "failure")),
+                                            ("ERROR", ("completed", "failure")), ("PENDING", ("in_progress", None)),
+                                            ("EXPECTED", ("queued", None))])
+def test_status_contexts_read_like_check_runs(state, expected):
+    check = normalize_check({"__typename": "StatusContext", "context": "ci/legacy", "state": state})
+    assert (check["status"], check["conclusion"]) == expected
+    assert check["name"] == "ci/legacy"
+
+
+@pytest.mark.parametrize("status,expected", [("COMPLETED", "completed"), ("IN_PROGRESS", "in_progress"),
+                                             ("QUEUED", "queued"), ("WAITING", "queued"), ("PENDING", "queued"),
+                                             ("REQUESTED", "queued")])
+def test_unfinished_check_runs_read_as_pending(status, expected):
+    """Every check run status short of COMPLETED is one PRMonitor waits on."""
+    check = normalize_check({"__typename": "CheckRun", "name": "build", "status": status, "conclusion": None})
+    assert check == {"name": "build", "status": expected, "conclusion": None}
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Test latent decoder selection and decoding."""
+
+import os
+import sys
+import types
+
+import pytest
+import torch
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from latent_decoder import LATENT_RGB_FACTORS, LatentDecoder, choose_decoder, linear_decode, to_pil
+
+
+@pytest.mark.parametrize("sprite_size,latent_size,expected", [
+    (16, 32, "linear"), (24, 32, "linear"), (24, 16, "tiny"), (32, 64, "tiny"), (48, 64, "vae"), (128, 64, "vae")
+])
+def test_auto_picks_the_cheapest_decoder_that_covers_the_sprite(sprite_size, latent_size, expected):
+    assert choose_decoder("auto", sprite_size, latent_size) == expected
+
+
+def test_explicit_modes_are_kept():
+    for mode in ("vae", "tiny", "linear"):
+        assert choose_decoder(mode, 128, 8) == mode
+
+
+def test_linear_decode_projects_each_latent_cell_to_one_pixel():
+    """A latent with one active channel decodes to that channel's RGB factors, one pixel per cell."""
+    latents = torch.zeros(2, 4, 3, 5)
+    latents[1, 0] = 1.0
+    images = linear_decode(latents)
+    assert [image.size for image in images] == [(5, 3), (5, 3)]
+    assert images[0].getpixel((0, 0)) == (128, 128, 128)
+    expected = tuple(round((factor / 2 + 0.5) * 255) for factor in LATENT_RGB_FACTORS[0])
+    assert images[1].getpixel((4, 2)) == expected
+
+
+def test_to_pil_clamps_out_of_range_values():
+    images = to_pil(torch.tensor([[[[-2.0, 2.0]]] * 3]))
+    assert [images[0].getpixel((x, 0)) for x in range(2)] == [(0, 0, 0), (255, 255, 255)]
+
+
+class FakeVAE:
+    """Decodes to a flat gray image 8x the latent size and counts its calls."""
+
+    dtype = torch.float32
+    device = "cpu"
+    config = types.SimpleNamespace(scaling_factor=0.5)
+
+    def __init__(self):
+        self.calls = []
+
+    def decode(self, latents):
+        self.calls.append(latents)
+        batch, _, height, width = latents.shape
+        return types.SimpleNamespace(sample=torch.zeros(batch, 3, height * 8, width * 8))
+
+
+def test_tiny_falls_back_to_the_vae_when_unavailable(monkeypatch):
+    """An unloadable tiny autoencoder is tried once; tiny requests then decode with the full VAE."""
+    monkeypatch.setitem(sys.modules, "diffusers", None)
+    vae = FakeVAE()
+    decoder = LatentDecoder(types.SimpleNamespace(vae=vae), tiny_model_id="missing/taesd")
+
+    assert decoder.resolve("tiny") == "vae"
+    assert decoder.tiny_failed
+    images = decoder.decode(torch.ones(2, 4, 4, 4), "tiny")
+    decoder.decode(torch.ones(1, 4, 4, 4), "linear")
+
+    assert [image.size for image in images] == [(32, 32), (32, 32)]
+    # Latents are unscaled by the VAE's scaling factor before decoding
+    assert torch.equal(vae.calls[0], torch.full((2, 4, 4, 4), 2.0))
+    report = decoder.report()
+    assert report["tiny_model"] is None
+    assert {name: stats["images"] for name, stats in report["decoders"].items()} == {"vae": 2, "linear": 1}
+    assert decoder.resolve("tiny") == "vae" and len(vae.calls) == 1
+
+
+def test_generator_picks_decoders_per_size_class(tmp_path, monkeypatch):
+    """DECODER=auto gives small sprites the linear decoder and large ones the VAE."""
+    monkeypatch.chdir(tmp_path)
+    for key, value in {"AGENT_ID": "1", "INSECT_TYPE": "beetle", "ASSET_VARIANTS": '["idle"]',
+                       "PROCEDURAL_ONLY": "true", "DECODER": "auto", "HIDPI_LARGE_SIZE": "0"}.items():
+        monkeypatch.setenv(key, value)
+    from generate_assets import BugBuddiesAssetGenerator
+
+    generator = BugBuddiesAssetGenerator()
+    assert generator.decoder_for("food_pellet", (256, 256)) == "linear"
+    # A 64px cell spans only 8 latent cells, too few for a 16px sprite's pixels
+    assert generator.decoder_for("food_pellet", (64, 64)) == "tiny"
+    assert generator.decoder_for("idle", (256, 256)) == "tiny"
+    # The large sprite is cut from the same render, so it decides the size class
+    generator.large_size = 64
+    assert generator.decoder_for("food_pellet", (512, 512)) == "vae"
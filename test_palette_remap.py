@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Test palette remapping and the derived variants built from it."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from palette_remap import ANCHOR_RADIUS, hex_to_rgb, remap_palette
+
+SOURCE = {"primary": "#8B4513", "secondary": "#654321"}
+TARGET = {"primary": "#A0522D", "secondary": "#3A1F0B"}
+
+
+def sprite(colors):
+    """A 1-pixel-high RGBA strip of the given colors."""
+    return Image.fromarray(np.array([colors], dtype=np.uint8), "RGBA")
+
+
+def test_anchor_colors_move_exactly_to_their_targets():
+    image = sprite([hex_to_rgb(SOURCE["primary"]) + (255,), hex_to_rgb(SOURCE["secondary"]) + (255,)])
+    pixels = np.array(remap_palette(image, SOURCE, TARGET))
+    assert tuple(pixels[0, 0]) == hex_to_rgb(TARGET["primary"]) + (255,)
+    assert tuple(pixels[0, 1]) == hex_to_rgb(TARGET["secondary"]) + (255,)
+
+
+def test_far_colors_and_transparency_are_kept():
+    """Outlines and highlights far from every anchor, and transparent pixels, come through unchanged."""
+    colors = [(255, 255, 255, 255), (0, 0, 255, 255), (12, 34, 56, 0)]
+    assert np.array_equal(np.array(remap_palette(sprite(colors), SOURCE, TARGET)), np.array(colors, np.uint8)[None])
+
+
+def test_shift_fades_with_distance_from_the_anchor():
+    """A shade near the primary moves by a fraction of the anchor's offset, scaled by its distance."""
+    primary = np.array(hex_to_rgb(SOURCE["primary"]), np.float32)
+    shade = primary + (0, 0, 40)
+    pixels = np.array(remap_palette(sprite([tuple(shade.astype(int)) + (255,)]), SOURCE, TARGET), np.float32)
+    weight = 1 - 40 / ANCHOR_RADIUS
+    expected = np.rint(shade + weight * (np.array(hex_to_rgb(TARGET["primary"])) - primary))
+    assert np.array_equal(pixels[0, 0, :3], expected)
+
+
+def test_same_colors_share_one_mapping_and_alignment_is_kept():
+    """Every pixel of one color maps to the same new color, so the sprite stays pixel-aligned."""
+    rng = np.random.default_rng(0)
+    palette = np.array([hex_to_rgb(SOURCE["primary"]) + (255,), (0, 0, 0, 255), (0, 0, 0, 0)], np.uint8)
+    indices = rng.integers(0, len(palette), size=(16, 16))
+    result = np.array(remap_palette(Image.fromarray(palette[indices], "RGBA"), SOURCE, TARGET))
+    for index in range(len(palette)):
+        assert len(np.unique(result[indices == index], axis=0)) == 1
+    assert np.array_equal(result[..., 3], palette[indices][..., 3])
+
+
+def test_mismatched_anchors_are_rejected():
+    with pytest.raises(ValueError):
+        remap_palette(sprite([(0, 0, 0, 255)]), SOURCE, {"primary": "#000000"})
+    with pytest.raises(ValueError):
+        remap_palette(sprite([(0, 0, 0, 255)]), {}, {})
+
+
+def test_derived_variant_is_recolored_from_its_base(tmp_path, monkeypatch):
+    """A derived variant is the base sprite recolored, with its scaled outputs and a journal entry."""
+    monkeypatch.chdir(tmp_path)
+    for key, value in {"AGENT_ID": "2", "INSECT_TYPE": "beetle", "ASSET_VARIANTS": '["idle"]',
+                       "PROCEDURAL_ONLY": "true", "VARIANT_PAUSE": "0", "HIDPI_SCALES": "1,2",
+                       "ASSET_COLORS": '{"primary": "#8B4513", "secondary": "#654321"}',
+                       "DERIVED_VARIANTS": '{"level_2": {"base": "idle", "colors": '
+                                           '{"primary": "#A0522D", "secondary": "#3A1F0B"}}}'}.items():
+        monkeypatch.setenv(key, value)
+    from generate_assets import BugBuddiesAssetGenerator
+
+    generator = BugBuddiesAssetGenerator()
+    results = generator.generate_variant_set()
+    assert results["generated_assets"] == ["idle", "level_2"]
+    assert results["derived_assets"] == ["level_2"]
+
+    with Image.open(generator.sprite_path("idle")) as base, Image.open(generator.sprite_path("level_2")) as derived:
+        expected = np.array(remap_palette(base, SOURCE, TARGET))
+        assert np.array_equal(np.array(derived.convert("RGBA")), expected)
+    with Image.open(generator.sprite_path("level_2", "@2x")) as scaled:
+        assert scaled.size == (64, 64)
+
+    # Unchanged base and colors: the derived variant resumes from the journal
+    assert generator.is_variant_complete("level_2", generator.derived_variants["level_2"])
+    changed = {"base": "idle", "colors": {"primary": "#000000", "secondary": "#111111"}}
+    assert not generator.is_variant_complete("level_2", changed)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Test that the PNG optimizer's output decodes to the same pixels with PIL."""
+
+import io
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.append('scripts')
+
+from png_optimizer import encode_png, optimize_png
+
+
+def decode(data):
+    """Decode PNG bytes to an RGBA array."""
+    with Image.open(io.BytesIO(data)) as image:
+        return np.array(image.convert("RGBA"))
+
+
+def clear_transparent(pixels):
+    """Fully transparent pixels carry no color, so the encoder may store any."""
+    pixels = pixels.copy()
+    pixels[pixels[..., 3] == 0] = 0
+    return pixels
+
+
+def palette_image(colors, width=13, height=7, seed=0):
+    """An RGBA image using exactly the given colors, at a width that leaves partial bytes per row."""
+    rng = np.random.default_rng(seed)
+    height = max(height, -(-len(colors) // width))
+    indices = np.arange(width * height) % len(colors)
+    rng.shuffle(indices)
+    return np.array(colors, dtype=np.uint8)[indices.reshape(height, width)]
+
+
+def distinct_colors(count, alpha=255, seed=0):
+    """count distinct random RGBA colors with one alpha."""
+    rng = np.random.default_rng(seed)
+    rgb = rng.choice(1 << 24, size=count, replace=False)
+    return [((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF, alpha) for value in rgb]
+
+
+@pytest.mark.parametrize("count,bit_depth", [(2, 1), (4, 2), (16, 4), (256, 8)])
+def test_palette_bit_depths_round_trip(count, bit_depth):
+    """Opaque images pack into the smallest palette bit depth and decode exactly."""
+    pixels = palette_image(distinct_colors(count))
+    data, stats = encode_png(Image.fromarray(pixels, "RGBA"))
+    assert stats["color_type"] == "indexed"
+    assert stats["bit_depth"] == bit_depth
+    assert stats["palette_size"] == count
+    assert b"tRNS" not in data
+    assert np.array_equal(decode(data), pixels)
+
+
+@pytest.mark.parametrize("count", [2, 4, 16, 200])
+def test_palette_transparency_round_trips(count):
+    """Transparent and translucent palette entries survive through the tRNS chunk."""
+    colors = distinct_colors(count - 2) + [(0, 0, 0, 0), (255, 0, 0, 128)]
+    pixels = palette_image(colors, seed=count)
+    data, stats = encode_png(Image.fromarray(pixels, "RGBA"))
+    assert stats["color_type"] == "indexed"
+    assert stats["palette_size"] == count
+    assert b"tRNS" in data
+    assert np.array_equal(decode(data), pixels)
+
+
+def test_transparent_pixels_collapse_to_one_entry():
+    """Fully transparent pixels of any color share one palette slot."""
+    pixels = np.zeros((4, 4, 4), dtype=np.uint8)
+    pixels[..., :3] = np.arange(16, dtype=np.uint8).reshape(4, 4, 1)
+    pixels[0, 0] = (10, 20, 30, 255)
+    data, stats = encode_png(Image.fromarray(pixels, "RGBA"))
+    assert stats["palette_size"] == 2
+    assert stats["bit_depth"] == 1
+    assert np.array_equal(decode(data), clear_transparent(pixels))
+
+
+def test_truecolor_fallbacks_round_trip():
+    """Images over 256 colors are stored as RGB when opaque and RGBA otherwise."""
+    rng = np.random.default_rng(3)
+    pixels = np.dstack([rng.integers(0, 256, size=(20, 20, 3)), np.full((20, 20), 255)]).astype(np.uint8)
+    data, stats = encode_png(Image.fromarray(pixels, "RGBA"))
+    assert (stats["color_type"], stats["bit_depth"]) == ("rgb", 8)
+    assert np.array_equal(decode(data), pixels)
+
+    pixels[::3, ::2, 3] = rng.integers(0, 255, size=pixels[::3, ::2, 3].shape)
+    data, stats = encode_png(Image.fromarray(pixels, "RGBA"))
+    assert stats["color_type"] == "rgba"
+    assert np.array_equal(decode(data), pixels)
+
+
+def test_encoding_is_deterministic():
+    """The same pixels always produce the same bytes."""
+    image = Image.fromarray(palette_image(distinct_colors(16)), "RGBA")
+    assert encode_png(image)[0] == encode_png(image.copy())[0]
+
+
+def test_optimize_png_from_path_and_file(tmp_path):
+    """optimize_png reads a path or an open file and writes the same pixels either way."""
+    pixels = palette_image(distinct_colors(4, seed=5), width=32, height=32)
+    src_path = str(tmp_path / "sprite.png")
+    Image.fromarray(pixels, "RGBA").save(src_path)
+
+    stats = optimize_png(src_path, str(tmp_path / "from_path.png"))
+    assert stats["optimized_bytes"] + stats["saved_bytes"] == stats["original_bytes"]
+    with open(src_path, "rb") as src:
+        file_stats = optimize_png(src, str(tmp_path / "from_file.png"), original_bytes=stats["original_bytes"])
+    assert file_stats == stats
+
+    for name in ("from_path.png", "from_file.png"):
+        with open(tmp_path / name, "rb") as f:
+            assert np.array_equal(decode(f.read()), pixels)
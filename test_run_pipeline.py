@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Test stage keys and output caching in the local pipeline runner."""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from run_pipeline import STAGE_MARKER, PipelineRunner, referenced_env, script_closure
+
+GENERATE_SCRIPTS = ["generate_assets.py"]
+ENTRY = {"agent_id": 1, "quality_level": "standard",
+         "work_items": [{"insect": "beetle", "variant": "idle", "estimated_seconds": 40.0}]}
+
+
+def make_runner(tmp_path, monkeypatch, **kwargs):
+    monkeypatch.chdir(tmp_path)
+    return PipelineRunner(jobs=2, **kwargs)
+
+
+def test_closure_follows_sibling_imports_and_reads_their_env():
+    """Helpers a script imports are part of its key, and so are the variables they read."""
+    closure = [os.path.basename(path) for path in script_closure("generate_assets.py")]
+    assert {"generate_assets.py", "backend_executor.py", "sprite_engine.py", "early_exit.py"} <= set(closure)
+    assert "aggregate_assets.py" not in closure
+
+    env = referenced_env(script_closure("generate_assets.py"))
+    assert {"PROCEDURAL_ONLY", "VARIANT_DEADLINE", "DECODER"} <= set(env)
+    # Set per stage by the orchestrator, so the stage inputs cover them instead
+    assert "AGENT_ID" not in env and "WORK_ITEMS" not in env
+
+
+def test_stage_key_tracks_read_env_and_inputs(tmp_path, monkeypatch):
+    runner = make_runner(tmp_path, monkeypatch)
+    runner.env.pop("DECODER", None)
+    base = runner.stage_key("agent:1", GENERATE_SCRIPTS, {"agent_id": 1})
+    assert runner.stage_key("agent:2", GENERATE_SCRIPTS, {"agent_id": 1}) == base
+
+    runner.env["NOT_READ_BY_ANY_SCRIPT"] = "x"
+    runner.env["AGENT_ID"] = "9"
+    assert runner.stage_key("agent:1", GENERATE_SCRIPTS, {"agent_id": 1}) == base
+
+    runner.env["DECODER"] = "linear"
+    changed = runner.stage_key("agent:1", GENERATE_SCRIPTS, {"agent_id": 1})
+    assert changed != base
+    assert runner.stage_key("agent:1", GENERATE_SCRIPTS, {"agent_id": 2}) != changed
+
+
+def test_run_cached_restores_outputs_without_running(tmp_path, monkeypatch):
+    """A hit restores the cached outputs; replace_outputs drops files a rerun would not have produced."""
+    runner = make_runner(tmp_path, monkeypatch)
+    calls = []
+
+    def action():
+        calls.append(1)
+        os.makedirs("out", exist_ok=True)
+        with open(os.path.join("out", "sprite.png"), "w") as f:
+            f.write("rendered")
+
+    assert not runner.run_cached("stage", "k1", ["out"], action, replace_outputs=True)
+    with open(os.path.join("out", "stale.png"), "w") as f:
+        f.write("left over")
+    os.remove(os.path.join("out", "sprite.png"))
+
+    assert runner.run_cached("stage", "k1", ["out"], action, replace_outputs=True)
+    assert calls == [1] and sorted(os.listdir("out")) == ["sprite.png"]
+
+    # A different key misses, and --force reruns even a known key
+    assert not runner.run_cached("stage", "k2", ["out"], action)
+    runner.force = True
+    assert not runner.run_cached("stage", "k1", ["out"], action)
+    assert len(calls) == 3
+
+
+def test_agent_stage_ignores_estimates_and_resumes_interrupted_runs(tmp_path, monkeypatch):
+    """Learned estimates do not invalidate an agent; a rerun with the same key keeps partial output."""
+    runner = make_runner(tmp_path, monkeypatch, animations=False)
+    ran, kept = [], []
+
+    def run_script(name, script, env=None, args=None):
+        ran.append(script)
+        kept.append(os.path.exists(os.path.join("temp_assets", f"agent_{env['AGENT_ID']}", "partial.png")))
+        return ""
+
+    monkeypatch.setattr(runner, "run_script", run_script)
+    first = runner.stage_agent(ENTRY)
+    assert not first["cached"] and ran == ["generate_assets.py", "validate_sprites.py"]
+
+    relearned = {**ENTRY, "work_items": [{**ENTRY["work_items"][0], "estimated_seconds": 75.0}]}
+    assert runner.stage_agent(relearned)["cached"] and len(ran) == 2
+
+    # An interrupted attempt left its marker and a rendered variant behind; --force resumes from them
+    with open(os.path.join(first["agent_dir"], "partial.png"), "w") as f:
+        f.write("rendered")
+    runner.force = True
+    runner.stage_agent(ENTRY)
+    assert len(ran) == 4 and kept[2:] == [True, True]
+
+    # Different work starts from an empty directory
+    with open(os.path.join(first["agent_dir"], "partial.png"), "w") as f:
+        f.write("rendered")
+    with open(os.path.join(first["agent_dir"], STAGE_MARKER), "w") as f:
+        f.write("another key")
+    kept.clear()
+    runner.stage_agent(ENTRY)
+    assert kept == [False, False]
+
+
+def test_dag_skips_dependents_of_failed_stages(tmp_path, monkeypatch):
+    runner = make_runner(tmp_path, monkeypatch)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    succeeded = runner.run_dag({
+        "matrix": ([], lambda: {"cached": True}),
+        "agent:1": (["matrix"], fail),
+        "agent:2": (["matrix"], lambda: {"cached": False}),
+        "aggregate": (["agent:1", "agent:2"], lambda: {"cached": False})
+    })
+    assert not succeeded
+    assert sorted(runner.stage_results) == ["agent:2", "matrix"]
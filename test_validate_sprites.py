@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Test sprite quality checks and the validator's regeneration of flagged sprites."""
+
+import os
+import sys
+import json
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+import validate_sprites
+from validate_sprites import SpriteValidator, derived_names
+
+
+def save(agent_dir, name, pixels):
+    Image.fromarray(pixels, "RGBA").save(os.path.join(agent_dir, f"{name}.png"))
+
+
+def body(size=32, box=(8, 8, 24, 24), color=(139, 69, 19)):
+    """A transparent sprite with one opaque rectangle and an outline-colored row."""
+    pixels = np.zeros((size, size, 4), dtype=np.uint8)
+    left, top, right, bottom = box
+    pixels[top:bottom, left:right] = color + (255,)
+    pixels[top, left:right] = (0, 0, 0, 255)
+    return pixels
+
+
+def test_quality_checks_flag_each_failure(tmp_path):
+    """Blank, background-filled and noisy sprites are flagged; a clean one passes."""
+    agent_dir = str(tmp_path)
+    noisy = body()
+    noisy[8:24, 8:24, :3] = np.random.default_rng(0).integers(0, 256, size=(16, 16, 3))
+    for name, pixels in {"beetle_idle": body(), "beetle_blank": np.zeros((32, 32, 4), np.uint8),
+                         "beetle_filled": body(box=(0, 0, 32, 32)), "beetle_noisy": noisy}.items():
+        save(agent_dir, name, pixels)
+
+    flagged = SpriteValidator(agent_dir).validate()["flagged"]
+
+    assert "beetle_idle" not in flagged
+    assert flagged["beetle_blank"] == ["nearly_transparent"]
+    assert flagged["beetle_filled"] == ["background_not_removed"]
+    assert flagged["beetle_noisy"] == ["too_many_colors"]
+
+
+def test_tiny_subject_is_flagged(tmp_path):
+    """A subject covering enough pixels but squeezed into a small box is flagged."""
+    pixels = np.zeros((64, 64, 4), dtype=np.uint8)
+    # 15x15 on a 64px sprite: above the coverage minimum, below a quarter of the side
+    pixels[30:45, 30:45] = (255, 0, 0, 255)
+    save(str(tmp_path), "ladybug_idle", pixels)
+    assert SpriteValidator(str(tmp_path)).validate()["flagged"] == {"ladybug_idle": ["subject_too_small"]}
+
+
+def test_duplicates_skip_derived_variants_and_renditions(tmp_path):
+    """Identical inference sprites are duplicates; recolored derived variants and @-renditions are not checked."""
+    agent_dir = str(tmp_path)
+    save(agent_dir, "beetle_walk_1", body())
+    save(agent_dir, "beetle_walk_2", body())
+    save(agent_dir, "beetle_level_2", body())
+    save(agent_dir, "beetle_walk_1@2x", np.zeros((64, 64, 4), np.uint8))
+    save(agent_dir, "beetle_attack", body(box=(4, 10, 28, 22)))
+
+    results = SpriteValidator(agent_dir).validate(derived=["beetle_level_2"])
+
+    assert [duplicate["sprites"] for duplicate in results["duplicates"]] == [["beetle_walk_1", "beetle_walk_2"]]
+    assert results["flagged"] == {"beetle_walk_2": ["duplicate_of:beetle_walk_1"]}
+    assert "beetle_walk_1@2x" not in results["sprites"]
+
+
+def test_derived_names_read_every_shard():
+    report = {"shards": [{"insect_type": "beetle", "derived_assets": ["level_2"]},
+                         {"insect_type": "ladybug", "derived_assets": ["level_2", "level_3"]}]}
+    assert derived_names(report) == ["beetle_level_2", "ladybug_level_2", "ladybug_level_3"]
+    assert derived_names({"insect_type": "beetle"}) == []
+
+
+def test_regenerate_reruns_only_flagged_sprites(tmp_path, monkeypatch):
+    """A sprite blanked after generation is discarded and regenerated; the other sprites resume untouched."""
+    monkeypatch.chdir(tmp_path)
+    for key, value in {"AGENT_ID": "4", "INSECT_TYPE": "beetle", "ASSET_VARIANTS": '["idle", "walk_1"]',
+                       "PROCEDURAL_ONLY": "true", "VARIANT_PAUSE": "0", "HIDPI_SCALES": "1,2",
+                       "VALIDATION_RETRIES": "1"}.items():
+        monkeypatch.setenv(key, value)
+    from generate_assets import BugBuddiesAssetGenerator
+
+    BugBuddiesAssetGenerator().generate_all_variants()
+    agent_dir = os.path.join("temp_assets", "agent_4")
+    walk_mtime = os.path.getmtime(os.path.join(agent_dir, "beetle_walk_1.png"))
+    save(agent_dir, "beetle_idle", np.zeros((32, 32, 4), np.uint8))
+
+    monkeypatch.setattr(sys, "argv", ["validate_sprites.py", "--regenerate"])
+    validate_sprites.main()
+
+    with open(os.path.join(agent_dir, "validation_report.json")) as f:
+        report = json.load(f)
+    assert report["passed"] and report["attempts"] == 2
+    assert report["regenerated"] == ["beetle_idle"]
+    assert os.path.getmtime(os.path.join(agent_dir, "beetle_walk_1.png")) == walk_mtime
+    with open(os.path.join(agent_dir, "generation_report.json")) as f:
+        assert json.load(f)["resumed_assets"] == ["walk_1"]
+
+
+def test_flagged_sprite_fails_without_regenerate(tmp_path, monkeypatch):
+    """Without --regenerate a flagged sprite is reported once and the validator exits non-zero."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AGENT_ID", "5")
+    agent_dir = os.path.join("temp_assets", "agent_5")
+    os.makedirs(agent_dir)
+    save(agent_dir, "beetle_idle", np.zeros((32, 32, 4), np.uint8))
+    with open(os.path.join(agent_dir, "generation_report.json"), "w") as f:
+        json.dump({"insect_type": "beetle"}, f)
+
+    monkeypatch.setattr(sys, "argv", ["validate_sprites.py"])
+    with pytest.raises(SystemExit):
+        validate_sprites.main()
+    with open(os.path.join(agent_dir, "validation_report.json")) as f:
+        report = json.load(f)
+    assert report["attempts"] == 1 and report["regenerated"] == []
+    assert report["flagged"] == {"beetle_idle": ["nearly_transparent"]}
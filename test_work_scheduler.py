@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Test cost learning, co-location grouping and balancing in the work scheduler."""
+
+import sys
+import json
+
+sys.path.append('scripts')
+
+from work_scheduler import WorkScheduler
+
+WALK = {"frames": ["beetle_walk_1.png", "beetle_idle.png", "beetle_walk_2.png", "beetle_idle.png"]}
+FLY = {"frames": ["butterfly_fly_1.png", "butterfly_fly_2.png"]}
+ANIMATIONS = {"beetle": {"walk": WALK}, "butterfly": {"fly": FLY}}
+
+
+def make_scheduler(tmp_path, costs=None):
+    scheduler = WorkScheduler(str(tmp_path / "variant_costs.json"))
+    scheduler.cost_table = dict(costs or {})
+    return scheduler
+
+
+def write_report(tmp_path, name, report):
+    path = str(tmp_path / name)
+    with open(path, "w") as f:
+        json.dump(report, f)
+    return path
+
+
+def test_learning_skips_synthetic_and_fallback_timings(tmp_path):
+    """Only real renders teach the cost table; procedural, stub and fallback timings are ignored."""
+    scheduler = make_scheduler(tmp_path, {"beetle/idle": 40.0})
+    reports = [
+        write_report(tmp_path, "real.json", {
+            "generation_method": "single", "insect_type": "beetle",
+            "variant_timings": {"idle": 60.0, "walk_1": 90.0},
+            "variant_backends": {"beetle_idle": "huggingface", "beetle_walk_1": "programmatic"}
+        }),
+        write_report(tmp_path, "procedural.json", {"generation_method": "procedural", "insect_type": "beetle",
+                                                   "variant_timings": {"idle": 0.01}}),
+        write_report(tmp_path, "stub.json", {"generation_method": "stub_tiled", "insect_type": "beetle",
+                                             "variant_timings": {"walk_2": 0.2}})
+    ]
+
+    assert scheduler.learn_from_reports(reports) == 1
+    assert scheduler.cost_table == {"beetle/idle": 50.0}
+
+
+def test_learning_reads_shards_and_survives_bad_reports(tmp_path):
+    """Multi-item reports are read per shard; unreadable files are skipped."""
+    scheduler = make_scheduler(tmp_path)
+    report = write_report(tmp_path, "agent.json", {
+        "variant_backends": {"beetle_idle": "replicate", "ladybug_idle": "programmatic"},
+        "shards": [
+            {"generation_method": "tiled", "insect_type": "beetle", "variant_timings": {"idle": 12.5}},
+            {"generation_method": "tiled", "insect_type": "ladybug", "variant_timings": {"idle": 300.0}}
+        ]
+    })
+    broken = str(tmp_path / "broken.json")
+    with open(broken, "w") as f:
+        f.write("{")
+
+    assert scheduler.learn_from_reports([broken, report]) == 1
+    assert scheduler.cost_table == {"beetle/idle": 12.5}
+
+
+def test_animation_frames_and_derived_variants_stay_together(tmp_path):
+    """Frames of one animation form one item, derived variants follow their base, the rest split off."""
+    scheduler = make_scheduler(tmp_path)
+    assignment = {
+        "insect_type": "beetle",
+        "asset_variants": ["idle", "walk_1", "walk_2", "attack", "large"],
+        "derived_variants": {"level_2": {"base": "idle"}, "level_3": {"base": "attack"}},
+        "animation_types": ["walk", "missing"],
+        "colors": {"primary": "#8B4513"}
+    }
+
+    items = scheduler.build_work_items(assignment, ANIMATIONS)
+    by_first = {item["asset_variants"][0]: item for item in items}
+
+    assert sorted(sorted(item["asset_variants"]) for item in items) == [["attack"], ["idle", "walk_1", "walk_2"],
+                                                                         ["large"]]
+    assert by_first["idle"]["animation_types"] == ["walk"]
+    assert list(by_first["idle"]["derived_variants"]) == ["level_2"]
+    assert list(by_first["attack"]["derived_variants"]) == ["level_3"]
+    assert by_first["large"]["derived_variants"] == {} and by_first["large"]["animation_types"] == []
+    assert all(item["colors"] == {"primary": "#8B4513"} for item in items)
+
+
+def test_plan_balances_longest_items_first(tmp_path):
+    """Largest items are placed first on the least loaded unit, and each unit merges items per insect."""
+    costs = {"beetle/idle": 50, "beetle/walk_1": 50, "beetle/walk_2": 50, "beetle/attack": 80,
+             "butterfly/fly_1": 30, "butterfly/fly_2": 30, "butterfly/idle": 60}
+    scheduler = make_scheduler(tmp_path, costs)
+    assignments = [
+        {"insect_type": "beetle", "asset_variants": ["idle", "walk_1", "walk_2", "attack"], "animation_types": ["walk"]},
+        {"insect_type": "butterfly", "asset_variants": ["fly_1", "fly_2", "idle"], "animation_types": ["fly"]}
+    ]
+
+    plan = scheduler.plan(assignments, ANIMATIONS, agent_count=3)
+
+    # Items with per-variant overhead: beetle walk group 156, beetle attack 82, butterfly fly group 64, idle 62
+    loads = sorted(unit["estimated_seconds"] for unit in plan)
+    assert loads == [82.0, 126.0, 156.0]
+    assert [unit["agent_id"] for unit in plan] == [1, 2, 3]
+    walk_unit = next(unit for unit in plan if unit["estimated_seconds"] == 156.0)
+    assert walk_unit["insect_type"] == "beetle"
+    assert sorted(walk_unit["work_items"][0]["asset_variants"]) == ["idle", "walk_1", "walk_2"]
+    shared_unit = next(unit for unit in plan if unit["estimated_seconds"] == 126.0)
+    assert [item["insect_type"] for item in shared_unit["work_items"]] == ["butterfly"]
+    assert sorted(shared_unit["work_items"][0]["asset_variants"]) == ["fly_1", "fly_2", "idle"]
+    assert shared_unit["work_items"][0]["estimated_seconds"] == 126.0
+
+
+def test_plan_skips_empty_units(tmp_path):
+    """More agents than items leaves no empty units in the plan."""
+    scheduler = make_scheduler(tmp_path)
+    plan = scheduler.plan([{"insect_type": "beetle", "asset_variants": ["idle"]}], {}, agent_count=4)
+    assert len(plan) == 1
+    assert plan[0]["description"] == "beetle: idle"